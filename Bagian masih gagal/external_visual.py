@@ -1,12 +1,28 @@
+import os
+
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from src.trend_analysis import (
-    save_trend_yearly_final,
-    load_trend_yearly
+from src.title_matcher import TitleMatcher
+from src.trend_analysis import load_trend_yearly
+from src.trend_worker import ACTIVE_STATUSES, get_sync_worker, job_id_for
+
+SYNC_POLL_SECONDS = 3
+
+_auto_refresh = components.declare_component(
+    "auto_refresh",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "auto_refresh")
 )
 
+
+# rerun setelah `seconds` detik dipicu dari browser, jadi render tidak
+# tertahan sleep dan sesi lain tetap dilayani
+def auto_refresh(seconds, key):
+    count = st.session_state.get(key, 0)
+    _auto_refresh(interval=int(seconds * 1000), count=count, key=key, default=count)
+
 # =====================================================
 # VISUALISASI EKSTERNAL (GOOGLE TRENDS)
 # =====================================================
@@ -14,7 +30,9 @@ def show_external_visual(
     df_filtered,
     years,
     keywords,
-    fetch_trend_func
+    fetch_trend_func=None,
+    engine=None,
+    filters=None
 ):
     st.subheader("🌐 Analisis Eksternal (Google Trends)")
 
@@ -42,7 +60,7 @@ def show_external_visual(
     # =================================================
     # LOAD DATA TREN (TANPA AUTO SYNC)
     # =================================================
-    trend_df = load_trend_yearly()
+    trend_df = load_trend_yearly(years=years)
 
     # Pastikan struktur kolom aman
     required_cols = {
@@ -58,32 +76,80 @@ def show_external_visual(
         missing_cols = required_cols - set(trend_df.columns)
         if missing_cols:
             st.error(
-                f"❌ File trend_yearly.csv rusak / tidak sesuai.\n"
+                f"❌ Data tren tersimpan rusak / tidak sesuai.\n"
                 f"Kolom hilang: {missing_cols}"
             )
             st.stop()
 
     # =================================================
-    # SINKRONISASI (HANYA JIKA DIPERLUKAN)
+    # SINKRONISASI LATAR BELAKANG (HANYA JIKA DIPERLUKAN)
     # =================================================
-    need_sync_years = []
+    # Halaman langsung dirender dengan data yang sudah ada; job yang
+    # sama dipakai bersama oleh semua sesi dan hasilnya muncul bertahap.
+    # Kebutuhan sinkron dihitung per pasangan (keyword, tahun), sedangkan
+    # status job selalu dibaca ulang (juga setelah semua tahun terisi
+    # sebagian) agar progres dan kegagalan job terakhir tetap tampil.
+    existing = (
+        set(zip(trend_df["keyword"], trend_df["year"].astype(int)))
+        if not trend_df.empty else set()
+    )
+    missing = [(kw, y) for y in years for kw in keywords if (kw, y) not in existing]
 
-    if trend_df.empty:
-        need_sync_years = years
+    worker = get_sync_worker()
+    state_key = f"trend_sync_job:{job_id_for(keywords, years)}"
+
+    if missing:
+        # job memakai seluruh keyword × tahun; pasangan yang sudah ada
+        # dilewati oleh sinkronisasi inkremental
+        job = worker.submit(keywords, years, fetch_trend_func)
+        st.session_state[state_key] = job["job_id"]
     else:
-        existing_years = trend_df["year"].unique().tolist()
-        need_sync_years = [y for y in years if y not in existing_years]
-
-    if need_sync_years:
-        with st.spinner(f"📡 Sinkronisasi Google Trends {need_sync_years}..."):
-            trend_df = save_trend_yearly_final(
-                keywords=keywords,
-                years=need_sync_years,
-                fetch_trend_func=fetch_trend_func
+        job = worker.status(st.session_state.get(state_key, job_id_for(keywords, years)))
+
+    syncing = job is not None and job["status"] in ACTIVE_STATUSES
+    if syncing:
+        progress = job["done"] / job["total"] if job["total"] else 0.0
+        st.progress(
+            progress,
+            text=(
+                f"📡 Sinkronisasi Google Trends {job['years']} berjalan di latar "
+                f"belakang ({job['done']}/{job['total'] or '?'} batch)..."
             )
+        )
+    elif job is not None and job["failures"]:
+        st.warning(f"⚠️ Sebagian sinkronisasi gagal: {job['summary']}")
+        with st.expander("Detail kegagalan"):
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "tahun": f["year"],
+                        "keyword": ", ".join(f["keywords"]),
+                        "percobaan": f["attempts"],
+                        "error": f["error"],
+                    }
+                    for f in job["failures"]
+                ]),
+                use_container_width=True
+            )
+    elif job is not None and job["status"] == "failed":
+        st.warning(f"⚠️ Sinkronisasi gagal: {job['summary']}")
+
+    _render_trend(df_filtered, years, trend_df, syncing)
+
+    if engine is not None and not trend_df.empty:
+        _render_alignment(engine, trend_df[trend_df["year"].isin(years)], filters)
 
+    # muat ulang berkala selama job berjalan untuk mengambil hasil baru
+    if syncing:
+        auto_refresh(SYNC_POLL_SECONDS, key=f"{state_key}:refresh")
+
+
+def _render_trend(df_filtered, years, trend_df, syncing):
     if trend_df.empty:
-        st.warning("⚠️ Data Google Trends belum tersedia.")
+        if syncing:
+            st.info("⏳ Data Google Trends sedang diambil, grafik akan muncul otomatis.")
+        else:
+            st.warning("⚠️ Data Google Trends belum tersedia.")
         return
 
     # =================================================
@@ -118,21 +184,19 @@ def show_external_visual(
     # =================================================
     st.subheader("📊 Kecocokan Judul vs Tren Global")
 
-    # hitung rasio mention judul
-    judul_count = (
-        df_filtered["judul"]
-        .str.lower()
-        .str.contains("|".join(keywords), regex=True)
-        .mean() * 100
-    )
-
     scatter_df = (
         df_year
         .groupby("keyword", as_index=False)
         .agg(google_total_score=("google_sum", "sum"))
     )
 
-    scatter_df["judul_mention_ratio"] = judul_count
+    # rasio mention per keyword, semua keyword dicocokkan sekali jalan
+    mentions = TitleMatcher(scatter_df["keyword"]).mention_table(df_filtered)
+    scatter_df["judul_mention_ratio"] = (
+        scatter_df["keyword"]
+        .map(mentions.set_index("keyword")["rasio_judul"])
+        .fillna(0.0)
+    )
 
     fig, ax = plt.subplots()
     ax.scatter(
@@ -167,3 +231,43 @@ def show_external_visual(
     ax.grid(True)
 
     st.pyplot(fig)
+
+
+# =====================================================
+# KESELARASAN JUDUL vs TREN (COSINE TF-IDF)
+# =====================================================
+def _render_alignment(engine, trend_df, filters):
+    if trend_df.empty:
+        return
+
+    st.subheader("🎯 Keselarasan Judul dengan Tren")
+    st.caption(
+        "Skor = cosine TF-IDF judul terhadap keyword tren terdekat, "
+        "dibobot skor Google Trends keyword tersebut di tahun judul."
+    )
+
+    alignment = engine.trend_alignment(trend_df, filters)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig, ax = plt.subplots()
+        ax.plot(
+            alignment.by_year["tahun"],
+            alignment.by_year["skor_selaras"],
+            marker="o"
+        )
+        ax.set_xlabel("Tahun")
+        ax.set_ylabel("Rata-rata Skor Keselarasan")
+        ax.grid(True)
+        st.pyplot(fig)
+
+    with col2:
+        st.dataframe(
+            alignment.by_province,
+            use_container_width=True,
+            hide_index=True
+        )
+
+    with st.expander("Keyword tren terdekat per judul"):
+        st.dataframe(alignment.best, use_container_width=True, hide_index=True)
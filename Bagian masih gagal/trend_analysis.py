@@ -1,84 +1,133 @@
+import logging
 import pandas as pd
 import os
+import threading
 from datetime import datetime
 from pytrends.request import TrendReq
 
+from src.trend_cache import RawTrendCache, TrendCacheMiss, YearTrendFetcher
+from src.trend_store import TrendStore
+from src.trend_sync import TrendSyncEngine
 
-def get_trend(keyword, year):
-    pytrends = TrendReq(hl="id-ID", tz=360)
+logger = logging.getLogger(__name__)
 
-    start = f"{year}-01-01"
-    end = f"{year}-12-01"
 
-    pytrends.build_payload(
-        [keyword],
-        timeframe=f"{start} {end}",
-        geo="ID"
+# satu TrendReq per thread worker (sesi HTTP & cookie dipakai ulang)
+_local = threading.local()
+
+
+def _client(hl="id-ID"):
+    clients = _local.__dict__.setdefault("pytrends", {})
+    if hl not in clients:
+        clients[hl] = TrendReq(hl=hl, tz=360)
+    return clients[hl]
+
+
+def fetch_interest_over_time(keywords, timeframe, geo="ID", hl="id-ID"):
+    pytrends = _client(hl)
+    pytrends.build_payload(list(keywords), timeframe=timeframe, geo=geo)
+    return pytrends.interest_over_time()
+
+
+# ==============================
+# CACHE MENTAH (RECORD / REPLAY)
+# ==============================
+# TREND_CACHE_MODE=replay membuat semua fetch hanya dari cache,
+# untuk pengujian dan deployment offline.
+TREND_CACHE_DIR = "data/trends/raw"
+
+trend_cache = RawTrendCache(
+    TREND_CACHE_DIR,
+    ttl=float(os.environ.get("TREND_CACHE_TTL", 7 * 24 * 3600)),
+    mode=os.environ.get("TREND_CACHE_MODE", "record")
+)
+
+
+def make_trend_fetcher(cache=None, geo="ID", hl="id-ID"):
+    return YearTrendFetcher(
+        fetch_interest_over_time,
+        cache or trend_cache,
+        geo=geo,
+        hl=hl
     )
 
-    df = pytrends.interest_over_time()
 
-    if df.empty:
-        return df
+# keywords boleh satu string atau list ≤ 5 istilah (satu payload)
+def get_trend(keywords, year):
+    if isinstance(keywords, str):
+        keywords = [keywords]
 
-    return df.drop(columns=["isPartial"], errors="ignore")
+    return make_trend_fetcher()(keywords, year)
 
 # ==============================
 # SAVE TREND PER TAHUN (FINAL)
 # ==============================
+# Pasangan (keyword, tahun) yang sudah ada dilewati; sisanya diambil
+# paralel oleh TrendSyncEngine (batch 5 keyword, rate limit, retry) lalu
+# di-upsert ke TrendStore dalam satu transaksi.
+# fetch_trend_func(keywords, year) menerima list keyword.
+TREND_DB_PATH = "data/trends/trend_yearly.sqlite"
+LEGACY_CSV_PATH = "data/trends/trend_yearly.csv"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_trend_store(path=TREND_DB_PATH):
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = TrendStore(path, legacy_csv=LEGACY_CSV_PATH)
+        return _stores[path]
+
+
+def sync_trend_yearly(
+    keywords,
+    years,
+    fetch_trend_func=None,
+    path=TREND_DB_PATH,
+    progress=None,
+    incremental=False,
+    **engine_kwargs
+):
+    store = open_trend_store(path)
+
+    # default: satu jendela per (batch, tahun), lewat cache mentah
+    if fetch_trend_func is None:
+        fetch_trend_func = make_trend_fetcher()
+
+    engine_kwargs.setdefault("fatal_errors", (TrendCacheMiss,))
+    engine = TrendSyncEngine(fetch_trend_func, **engine_kwargs)
+    report = engine.run(
+        keywords,
+        years,
+        skip=store.existing_pairs(years),
+        progress=progress,
+        # incremental: upsert per batch sehingga pembaca melihat hasil
+        # yang sudah masuk selama sinkronisasi berjalan
+        on_records=store.upsert if incremental else None
+    )
+    if not incremental:
+        store.upsert(report.records)
+
+    return store.load(), report
+
+
 def save_trend_yearly_final(
     keywords,
     years,
-    fetch_trend_func,
-    path="data/trends/trend_yearly.csv"
+    fetch_trend_func=None,
+    path=TREND_DB_PATH,
+    **engine_kwargs
 ):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-
-    if os.path.exists(path):
-        df_all = pd.read_csv(path)
-    else:
-        df_all = pd.DataFrame()
-
-    records = []
-
-    for year in years:
-        for kw in keywords:
-            if (
-                not df_all.empty
-                and ((df_all["keyword"] == kw) & (df_all["year"] == year)).any()
-            ):
-                continue
-
-            try:
-                trend = fetch_trend_func(kw, year)
-                if trend.empty:
-                    continue
-
-                series = trend.iloc[:, 0]
-
-                records.append({
-                    "keyword": kw,
-                    "year": int(year),
-                    "google_peak": int(series.max()),
-                    "google_mean": float(series.mean()),
-                    "google_sum": int(series.sum())
-                })
-
-            except:
-                continue
-
-    if records:
-        df_new = pd.DataFrame(records)
-        df_all = pd.concat([df_all, df_new], ignore_index=True)
-
-        # ranking per tahun
-        df_all["google_rank"] = (
-            df_all
-            .groupby("year")["google_peak"]
-            .rank(method="dense", ascending=False)
-        )
-
-        df_all.to_csv(path, index=False)
+    df_all, report = sync_trend_yearly(
+        keywords, years, fetch_trend_func, path, **engine_kwargs
+    )
+
+    # laporan lengkap tersedia lewat sync_trend_yearly; di sini cukup log
+    if report.failures:
+        logger.warning("Sinkronisasi tren: %s", report.summary())
+        for failure in report.failures:
+            logger.warning("gagal %s %s: %s", failure.year, failure.keywords, failure.error)
 
     return df_all
 
@@ -87,8 +136,8 @@ def save_trend_yearly_final(
 # ==============================
 # LOAD SAJA (TANPA SINKRON)
 # ==============================
-def load_trend_yearly(path="data/trends/trend_yearly.csv"):
-    if not os.path.exists(path):
+def load_trend_yearly(path=TREND_DB_PATH, years=None):
+    if not os.path.exists(path) and not os.path.exists(LEGACY_CSV_PATH):
         return pd.DataFrame()
 
-    return pd.read_csv(path)
+    return open_trend_store(path).load(years=years)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+CACHE_MODES = ("record", "replay", "refresh")
+
+
+class TrendCacheMiss(KeyError):
+    pass
+
+
+def cache_key(keywords, timeframe, geo, hl):
+    # urutan keyword tidak mengubah isi payload, jadi diurutkan
+    payload = json.dumps(
+        {
+            "keywords": sorted(keywords),
+            "timeframe": timeframe,
+            "geo": geo,
+            "hl": hl,
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ==============================
+# CACHE MENTAH INTEREST-OVER-TIME
+# ==============================
+# Frame mentah disimpan apa adanya (parquet) dengan kunci sha256 dari
+# (keywords, timeframe, geo, hl), sehingga metrik baru bisa dihitung
+# ulang tanpa request ke Google.
+#   record  : baca cache bila masih dalam TTL, selain itu fetch & simpan
+#   replay  : hanya dari cache (TTL diabaikan); miss → TrendCacheMiss
+#   refresh : selalu fetch & timpa cache
+class RawTrendCache:
+    def __init__(
+        self,
+        cache_dir="data/trends/raw",
+        ttl=7 * 24 * 3600,
+        mode="record",
+        clock=time.time
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"mode cache tidak dikenal: {mode}")
+
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.mode = mode
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _paths(self, key):
+        folder = os.path.join(self.cache_dir, key[:2])
+        return (
+            os.path.join(folder, f"{key}.parquet"),
+            os.path.join(folder, f"{key}.json"),
+        )
+
+    def _key_lock(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _fresh(self, meta):
+        if self.mode == "replay" or self.ttl is None:
+            return True
+        return self.clock() - meta["fetched_at"] <= self.ttl
+
+    def _read(self, key):
+        frame_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            frame = pd.read_parquet(frame_path)
+        except (OSError, ValueError, KeyError):
+            return None, None
+        return frame, meta
+
+    def contains(self, keywords, timeframe, geo="ID", hl="id-ID"):
+        if self.mode == "refresh":
+            return False
+        _, meta = self._read(cache_key(keywords, timeframe, geo, hl))
+        return meta is not None and self._fresh(meta)
+
+    def lookup(self, keywords, timeframe, geo="ID", hl="id-ID"):
+        frame, meta = self._read(cache_key(keywords, timeframe, geo, hl))
+        if meta is None or not self._fresh(meta):
+            return None
+        return frame
+
+    def store(self, keywords, timeframe, geo, hl, frame):
+        key = cache_key(keywords, timeframe, geo, hl)
+        frame_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(frame_path), exist_ok=True)
+
+        tmp = frame_path + ".tmp"
+        frame.to_parquet(tmp)
+        os.replace(tmp, frame_path)
+
+        # meta ditulis terakhir: frame tanpa meta dianggap tidak ada
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "keywords": list(keywords),
+                    "timeframe": timeframe,
+                    "geo": geo,
+                    "hl": hl,
+                    "fetched_at": self.clock(),
+                },
+                f,
+                ensure_ascii=False
+            )
+        os.replace(tmp, meta_path)
+
+    # request yang sama dari beberapa thread hanya di-fetch sekali
+    def get(self, keywords, timeframe, geo, hl, fetch):
+        key = cache_key(keywords, timeframe, geo, hl)
+
+        with self._key_lock(key):
+            if self.mode != "refresh":
+                frame = self.lookup(keywords, timeframe, geo, hl)
+                if frame is not None:
+                    self.hits += 1
+                    return frame
+
+            self.misses += 1
+            if self.mode == "replay":
+                raise TrendCacheMiss(f"tidak ada di cache: {list(keywords)} {timeframe}")
+
+            frame = fetch()
+            self.store(keywords, timeframe, geo, hl, frame)
+            return frame
+
+
+def year_timeframe(year):
+    return f"{year}-01-01 {year}-12-31"
+
+
+def slice_year(frame, year):
+    if frame.empty:
+        return frame
+    frame = frame.drop(columns=["isPartial"], errors="ignore")
+    return frame[pd.DatetimeIndex(frame.index).year == int(year)]
+
+
+# ==============================
+# FETCH SATU JENDELA PER TAHUN
+# ==============================
+# Granularitas dan skala 0–100 Google Trends bergantung pada panjang
+# jendela (1 tahun = mingguan, beberapa tahun = bulanan), jadi setiap
+# tahun selalu diambil dengan jendela satu tahunnya sendiri; metrik yang
+# masuk TrendStore dengan begitu memakai skala yang sama untuk semua
+# baris. Frame mentah tetap lewat RawTrendCache.
+class YearTrendFetcher:
+    def __init__(self, fetch_raw, cache, geo="ID", hl="id-ID"):
+        self.fetch_raw = fetch_raw
+        self.cache = cache
+        self.geo = geo
+        self.hl = hl
+
+    def window(self, keywords, year):
+        keywords = list(keywords)
+        timeframe = year_timeframe(int(year))
+        return self.cache.get(
+            keywords, timeframe, self.geo, self.hl,
+            lambda: self.fetch_raw(keywords, timeframe, self.geo, self.hl)
+        )
+
+    def is_cached(self, keywords, year):
+        return self.cache.contains(list(keywords), year_timeframe(int(year)), self.geo, self.hl)
+
+    # minggu pertama jendela bisa dimulai di akhir tahun sebelumnya
+    def __call__(self, keywords, year):
+        return slice_year(self.window(keywords, year), year)
@@ -0,0 +1,153 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+TREND_COLUMNS = [
+    "keyword", "year", "google_peak", "google_mean", "google_sum", "google_rank"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trend_yearly (
+    keyword     TEXT    NOT NULL,
+    year        INTEGER NOT NULL,
+    google_peak INTEGER NOT NULL,
+    google_mean REAL    NOT NULL,
+    google_sum  INTEGER NOT NULL,
+    google_rank REAL,
+    PRIMARY KEY (keyword, year)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS trend_yearly_year_peak
+    ON trend_yearly (year, google_peak DESC);
+"""
+
+UPSERT = """
+INSERT INTO trend_yearly (keyword, year, google_peak, google_mean, google_sum)
+VALUES (:keyword, :year, :google_peak, :google_mean, :google_sum)
+ON CONFLICT (keyword, year) DO UPDATE SET
+    google_peak = excluded.google_peak,
+    google_mean = excluded.google_mean,
+    google_sum  = excluded.google_sum
+"""
+
+
+# ==============================
+# PENYIMPANAN TREN (SQLITE)
+# ==============================
+# Satu baris per (keyword, tahun) dengan primary key, jadi cek
+# keberadaan cukup lookup indeks dan upsert tidak menulis ulang file.
+# Mode WAL membuat pembaca (dashboard) tidak terblokir saat sinkronisasi
+# sedang menulis. Koneksi dibuka per operasi agar aman dipakai lintas
+# thread.
+class TrendStore:
+    def __init__(self, path="data/trends/trend_yearly.sqlite", legacy_csv=None):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+        if legacy_csv and os.path.exists(legacy_csv) and self.count() == 0:
+            self.migrate_csv(legacy_csv)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM trend_yearly").fetchone()[0]
+
+    def has(self, keyword, year):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM trend_yearly WHERE keyword = ? AND year = ?",
+                (keyword, int(year))
+            ).fetchone()
+        return row is not None
+
+    def existing_pairs(self, years=None):
+        query = "SELECT keyword, year FROM trend_yearly"
+        params = []
+        if years is not None:
+            years = [int(y) for y in years]
+            query += f" WHERE year IN ({','.join('?' * len(years))})"
+            params = years
+
+        with closing(self._connect()) as conn:
+            return set(conn.execute(query, params).fetchall())
+
+    def years(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT DISTINCT year FROM trend_yearly ORDER BY year")
+            return [r[0] for r in rows]
+
+    # ranking dense per tahun, hanya untuk tahun yang berubah
+    def _rerank(self, conn, years):
+        for year in years:
+            peaks = pd.DataFrame(
+                conn.execute(
+                    "SELECT keyword, google_peak FROM trend_yearly WHERE year = ?",
+                    (year,)
+                ).fetchall(),
+                columns=["keyword", "google_peak"]
+            )
+            ranks = peaks["google_peak"].rank(method="dense", ascending=False)
+
+            conn.executemany(
+                "UPDATE trend_yearly SET google_rank = ? WHERE keyword = ? AND year = ?",
+                zip(ranks.astype(float).tolist(), peaks["keyword"].tolist(), [year] * len(peaks))
+            )
+
+    # semua record ditulis dalam satu transaksi: pembaca melihat data
+    # lama atau data baru secara utuh, tidak pernah setengah
+    def upsert(self, records):
+        records = [
+            {
+                "keyword": r["keyword"],
+                "year": int(r["year"]),
+                "google_peak": int(r["google_peak"]),
+                "google_mean": float(r["google_mean"]),
+                "google_sum": int(r["google_sum"]),
+            }
+            for r in records
+        ]
+        if not records:
+            return 0
+
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.executemany(UPSERT, records)
+                self._rerank(conn, sorted({r["year"] for r in records}))
+
+        return len(records)
+
+    def load(self, years=None, keywords=None):
+        query = f"SELECT {', '.join(TREND_COLUMNS)} FROM trend_yearly"
+        clauses, params = [], []
+        if years is not None:
+            years = [int(y) for y in years]
+            clauses.append(f"year IN ({','.join('?' * len(years))})")
+            params.extend(years)
+        if keywords is not None:
+            keywords = list(keywords)
+            clauses.append(f"keyword IN ({','.join('?' * len(keywords))})")
+            params.extend(keywords)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY year, google_rank, keyword"
+
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    # impor sekali dari trend_yearly.csv lama
+    def migrate_csv(self, csv_path):
+        df = pd.read_csv(csv_path)
+        if df.empty:
+            return 0
+        df = df.drop_duplicates(["keyword", "year"], keep="last")
+        return self.upsert(df.to_dict(orient="records"))
@@ -0,0 +1,235 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+MAX_TERMS_PER_PAYLOAD = 5  # batas istilah per build_payload Google Trends
+
+
+# ==============================
+# PEMBATAS LAJU (TOKEN BUCKET)
+# ==============================
+# Token terisi `rate` per detik hingga `capacity`; setiap request
+# mengambil satu token. Dipakai bersama oleh semua worker sehingga laju
+# total tetap terbatas berapa pun jumlah thread.
+class TokenBucket:
+    def __init__(self, rate=0.5, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+
+            self.sleep(wait)
+
+
+def backoff_delay(attempt, base=2.0, cap=60.0):
+    # exponential backoff dengan full jitter
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+# error klien HTTP (4xx selain 429, mis. keyword tidak valid) tidak akan
+# berhasil bila diulang; status dibaca dari e.response seperti di pytrends
+def is_retryable(error, fatal_errors=()):
+    if isinstance(error, fatal_errors):
+        return False
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return not (isinstance(status, int) and 400 <= status < 500 and status != 429)
+
+
+def batches(keywords, size=MAX_TERMS_PER_PAYLOAD):
+    keywords = list(dict.fromkeys(keywords))
+    return [keywords[i:i + size] for i in range(0, len(keywords), size)]
+
+
+# ==============================
+# LAPORAN SINKRONISASI
+# ==============================
+@dataclass
+class SyncFailure:
+    keywords: list
+    year: int
+    attempts: int
+    error: str
+    retryable: bool = True
+
+
+@dataclass
+class SyncReport:
+    records: list = field(default_factory=list)
+    failures: list = field(default_factory=list)
+    empty: list = field(default_factory=list)  # (keyword, year) tanpa data
+    n_requests: int = 0
+    n_retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def failed_pairs(self):
+        return [(kw, f.year) for f in self.failures for kw in f.keywords]
+
+    def summary(self):
+        return (
+            f"{len(self.records)} data tren · {self.n_requests} request · "
+            f"{self.n_retries} retry · {len(self.failures)} batch gagal · "
+            f"{len(self.empty)} keyword kosong · {self.seconds:.1f} detik"
+        )
+
+
+def trend_record(keyword, year, series):
+    return {
+        "keyword": keyword,
+        "year": int(year),
+        "google_peak": int(series.max()),
+        "google_mean": float(series.mean()),
+        "google_sum": int(series.sum())
+    }
+
+
+# ==============================
+# MESIN SINKRONISASI
+# ==============================
+# fetch_func(keywords, year) → DataFrame interest-over-time dengan satu
+# kolom per keyword (format pytrends). Fungsi ini bisa diganti stub lokal
+# untuk pengujian tanpa jaringan.
+#
+# Jika fetch_func punya is_cached(keywords, year) yang bernilai True,
+# request dilayani cache sehingga tidak memakai token rate limit.
+# Error bertipe fatal_errors (mis. cache miss saat replay) tidak diulang.
+#
+# Catatan: Google Trends menormalkan skor dalam satu payload relatif
+# terhadap istilah tertinggi di payload tersebut, jadi skor hasil batch
+# berbeda skala dengan request satu keyword.
+class TrendSyncEngine:
+    def __init__(
+        self,
+        fetch_func,
+        batch_size=MAX_TERMS_PER_PAYLOAD,
+        max_workers=4,
+        rate=0.5,
+        burst=1,
+        max_retries=4,
+        backoff_base=2.0,
+        backoff_cap=60.0,
+        fatal_errors=(),
+        sleep=time.sleep
+    ):
+        self.fetch_func = fetch_func
+        self.batch_size = max(1, min(batch_size, MAX_TERMS_PER_PAYLOAD))
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate=rate, capacity=burst, sleep=sleep)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.fatal_errors = tuple(fatal_errors)
+        self.sleep = sleep
+
+    def tasks(self, keywords, years, skip=()):
+        skip = set(skip)
+        tasks = []
+        for year in years:
+            pending = [kw for kw in keywords if (kw, int(year)) not in skip]
+            tasks.extend((batch, int(year)) for batch in batches(pending, self.batch_size))
+        return tasks
+
+    def _fetch(self, batch, year, report, lock):
+        is_cached = getattr(self.fetch_func, "is_cached", None)
+
+        attempt = 0
+        while True:
+            if not (is_cached and is_cached(batch, year)):
+                self.bucket.acquire()
+                with lock:
+                    report.n_requests += 1
+
+            try:
+                return self.fetch_func(batch, year), None
+            except Exception as e:  # semua error dicatat di laporan
+                retryable = is_retryable(e, self.fatal_errors)
+                if attempt >= self.max_retries or not retryable:
+                    return None, SyncFailure(
+                        batch, year, attempt + 1, f"{type(e).__name__}: {e}", retryable
+                    )
+
+                with lock:
+                    report.n_retries += 1
+                self.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+                attempt += 1
+
+    # satu keyword tidak valid menggagalkan seluruh payload; jika error
+    # tidak bisa diulang, keyword dalam batch dicoba satu per satu agar
+    # hanya keyword yang memang bermasalah tercatat gagal
+    def _fetch_task(self, batch, year, report, lock):
+        trend, failure = self._fetch(batch, year, report, lock)
+        if failure is None or failure.retryable or len(batch) == 1:
+            return [(batch, trend, failure)]
+        return [([kw], *self._fetch([kw], year, report, lock)) for kw in batch]
+
+    def _collect(self, batch, year, trend, report):
+        for kw in batch:
+            if trend is None or trend.empty or kw not in trend.columns:
+                report.empty.append((kw, year))
+                continue
+
+            series = trend[kw].dropna()
+            if series.empty:
+                report.empty.append((kw, year))
+                continue
+
+            report.records.append(trend_record(kw, year, series))
+
+    # on_records(records) dipanggil setiap batch selesai, agar hasil bisa
+    # langsung disimpan sebelum seluruh sinkronisasi rampung
+    def run(self, keywords, years, skip=(), progress=None, on_records=None):
+        start = time.perf_counter()
+        report = SyncReport()
+        lock = threading.Lock()
+
+        tasks = self.tasks(keywords, years, skip)
+        total = len(tasks)
+        if progress:
+            progress(0, total)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(self._fetch_task, batch, year, report, lock): year
+                for batch, year in tasks
+            }
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                year = futures[future]
+                n_before = len(report.records)
+
+                for batch, trend, failure in future.result():
+                    if failure is not None:
+                        report.failures.append(failure)
+                    else:
+                        self._collect(batch, year, trend, report)
+
+                if on_records and len(report.records) > n_before:
+                    on_records(report.records[n_before:])
+
+                if progress:
+                    progress(done, total)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
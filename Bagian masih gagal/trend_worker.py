@@ -0,0 +1,231 @@
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from src.trend_analysis import TREND_DB_PATH, open_trend_store, sync_trend_yearly
+
+ACTIVE_STATUSES = ("queued", "running")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    job_id     TEXT PRIMARY KEY,
+    keywords   TEXT NOT NULL,
+    years      TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    done       INTEGER NOT NULL DEFAULT 0,
+    total      INTEGER NOT NULL DEFAULT 0,
+    n_records  INTEGER NOT NULL DEFAULT 0,
+    failures   TEXT,
+    summary    TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def job_id_for(keywords, years):
+    payload = json.dumps(
+        {"keywords": sorted(set(keywords)), "years": sorted({int(y) for y in years})},
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# ==============================
+# STATUS JOB (SQLITE)
+# ==============================
+# Disimpan di database tren yang sama, jadi status job tetap terbaca
+# setelah proses Streamlit restart dan job yang terputus bisa dilanjutkan.
+class SyncJobStore:
+    def __init__(self, path=TREND_DB_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, job_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM sync_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return _job_dict(row)
+
+    # job aktif yang sudah mencakup keyword & tahun yang diminta, atau job
+    # sama yang baru selesai < retry_after detik, dipakai ulang; selain itu
+    # dijadwalkan baru
+    def claim(self, job_id, keywords, years, retry_after):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            with conn:
+                for row in conn.execute(
+                    "SELECT * FROM sync_jobs WHERE status IN (?, ?) ORDER BY created_at",
+                    ACTIVE_STATUSES
+                ):
+                    job = _job_dict(row)
+                    if set(keywords) <= set(job["keywords"]) and set(years) <= set(job["years"]):
+                        return job, False
+
+                row = conn.execute(
+                    "SELECT * FROM sync_jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row is not None and now - row["updated_at"] < retry_after:
+                    return _job_dict(row), False
+
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO sync_jobs
+                        (job_id, keywords, years, status, created_at, updated_at)
+                    VALUES (?, ?, ?, 'queued', ?, ?)
+                    """,
+                    (job_id, json.dumps(list(keywords)), json.dumps(list(years)), now, now)
+                )
+        return self.get(job_id), True
+
+    def update(self, job_id, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    f"UPDATE sync_jobs SET {assignments} WHERE job_id = ?",
+                    [*fields.values(), job_id]
+                )
+
+    def active(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM sync_jobs WHERE status IN (?, ?) ORDER BY created_at",
+                ACTIVE_STATUSES
+            ).fetchall()
+        return [_job_dict(row) for row in rows]
+
+
+def _job_dict(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job["keywords"] = json.loads(job["keywords"])
+    job["years"] = json.loads(job["years"])
+    job["failures"] = json.loads(job["failures"]) if job["failures"] else []
+    return job
+
+
+# ==============================
+# WORKER SINKRONISASI LATAR BELAKANG
+# ==============================
+# Satu thread per proses mengambil job dari antrean; submit() dengan
+# keyword & tahun yang sama dari sesi mana pun mengembalikan job yang
+# sama. Hasil di-upsert per batch sehingga halaman bisa menampilkan
+# data yang sudah masuk sambil menunggu sisanya.
+class TrendSyncWorker:
+    def __init__(self, path=TREND_DB_PATH, retry_after=15 * 60, **engine_kwargs):
+        self.path = path
+        self.retry_after = retry_after
+        self.engine_kwargs = engine_kwargs
+
+        open_trend_store(path)
+        self.jobs = SyncJobStore(path)
+        self.queue = queue.Queue()
+        self.fetchers = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+        # job yang terputus karena proses sebelumnya berhenti
+        resumed = self.jobs.active()
+        for job in resumed:
+            self.jobs.update(job["job_id"], status="queued")
+            self.queue.put(job["job_id"])
+        if resumed:
+            self._ensure_thread()
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(
+                target=self._loop, name="trend-sync-worker", daemon=True
+            )
+            self.thread.start()
+
+    def submit(self, keywords, years, fetch_trend_func=None):
+        keywords = list(dict.fromkeys(keywords))
+        years = sorted({int(y) for y in years})
+        job_id = job_id_for(keywords, years)
+
+        with self.lock:
+            job, created = self.jobs.claim(job_id, keywords, years, self.retry_after)
+            if created:
+                self.fetchers[job_id] = fetch_trend_func
+                self.queue.put(job_id)
+            self._ensure_thread()
+
+        return job
+
+    def status(self, job_id):
+        return self.jobs.get(job_id)
+
+    def _loop(self):
+        while True:
+            job_id = self.queue.get()
+            try:
+                self._run(job_id)
+            finally:
+                self.queue.task_done()
+
+    def _run(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return
+
+        with self.lock:
+            fetch_trend_func = self.fetchers.pop(job_id, None)
+
+        self.jobs.update(job_id, status="running", done=0)
+
+        def progress(done, total):
+            self.jobs.update(job_id, done=done, total=total)
+
+        try:
+            _, report = sync_trend_yearly(
+                job["keywords"],
+                job["years"],
+                fetch_trend_func=fetch_trend_func,
+                path=self.path,
+                progress=progress,
+                incremental=True,
+                **self.engine_kwargs
+            )
+        except Exception as e:  # job ditandai gagal, worker tetap hidup
+            self.jobs.update(job_id, status="failed", summary=f"{type(e).__name__}: {e}")
+            return
+
+        self.jobs.update(
+            job_id,
+            status="done",
+            n_records=len(report.records),
+            failures=json.dumps(
+                [
+                    {"keywords": f.keywords, "year": f.year, "attempts": f.attempts, "error": f.error}
+                    for f in report.failures
+                ],
+                ensure_ascii=False
+            ),
+            summary=report.summary()
+        )
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def get_sync_worker(path=TREND_DB_PATH):
+    with _workers_lock:
+        if path not in _workers:
+            _workers[path] = TrendSyncWorker(path)
+        return _workers[path]
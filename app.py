@@ -9,9 +9,10 @@ st.set_page_config(
 import pandas as pd
 import os
 
-from src.data_loader import load_data
-from src.preprocessing import explode_peneliti
-from src.internal_visual import show_internal_kpi, show_internal_visual
+from src.analytics import AnalyticsEngine
+from src.incremental import IncrementalStore
+from src.result_cache import ResultCache
+from src.internal_visual import show_internal_kpi, show_internal_visual, show_title_search
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_PATH = os.path.join(BASE_DIR, "data", "Data Clean.xlsx")
@@ -91,19 +92,21 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 # ==============================
 # LOAD DATA
 # ==============================
-@st.cache_data
-def load_all_data():
-    df_raw = load_data(DATA_PATH)
-    df_peneliti = explode_peneliti(df_raw)
-    return df_peneliti
-
-df_peneliti = load_all_data()
-
-if df_peneliti.empty:
+# engine & cache hasil dipakai bersama oleh semua sesi; setiap rerun
+# hanya mengecek stat file, dan baris baru di workbook ditambahkan ke
+# struktur yang sudah ada tanpa memproses ulang semuanya
+@st.cache_resource
+def load_engine():
+    store = IncrementalStore(DATA_PATH)
+    return store, AnalyticsEngine.from_store(store, cache=ResultCache(maxsize=512))
+
+store, engine = load_engine()
+engine.sync(store)
+
+if engine.n_rows == 0:
     st.error("❌ Data hasil preprocessing kosong. Cek explode_peneliti.")
     st.stop()
 
-df_all = df_peneliti.copy() 
 
 # ==============================
 # SIDEBAR FILTER (INTERNAL ONLY)
@@ -121,12 +124,6 @@ st.sidebar.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-df_peneliti["kelas"] = (
-    df_peneliti["kelas"]
-    .dropna()
-    .astype(int)
-)
-
 def safe_multiselect(label, options):
     selected = st.sidebar.multiselect(label, options, default=options)
     if not selected:
@@ -136,43 +133,44 @@ def safe_multiselect(label, options):
 
 provinsi = safe_multiselect(
     "Provinsi",
-    sorted(df_peneliti["provinsi"].dropna().unique())
+    engine.options("provinsi")
 )
 
 gender = safe_multiselect(
     "Jenis Kelamin",
-    sorted(df_peneliti["jenis_kelamin"].dropna().unique())
+    engine.options("jenis_kelamin")
 )
 
 bidang = safe_multiselect(
     "Bidang",
-    sorted(df_peneliti["bidang"].dropna().unique())
+    engine.options("bidang")
 )
 
 tahun = safe_multiselect(
     "Tahun",
-    sorted(df_peneliti["tahun"].dropna().unique())
+    engine.options("tahun")
 )
 
 
 kelas = safe_multiselect(
     "Kelas",
-    sorted(df_peneliti["kelas"].dropna().unique())
+    engine.options("kelas")
 )
 
 
 # ==============================
 # FILTER DATA
 # ==============================
-df_filtered = df_peneliti[
-    (df_peneliti["provinsi"].isin(provinsi)) &
-    (df_peneliti["jenis_kelamin"].isin(gender)) &
-    (df_peneliti["bidang"].isin(bidang)) &
-    (df_peneliti["tahun"].isin(tahun)) &
-    (df_peneliti["kelas"].isin(kelas))
-]
-
-if df_filtered.empty:
+filters = {
+    "provinsi": provinsi,
+    "jenis_kelamin": gender,
+    "bidang": bidang,
+    "tahun": tahun,
+    "kelas": kelas,
+}
+result = engine.run(filters)
+
+if result.empty:
     st.warning("⚠️ Data kosong setelah filter")
     st.stop()
 
@@ -180,13 +178,38 @@ if df_filtered.empty:
 # ==============================
 # INTERNAL KPI & VISUAL
 # ==============================
-show_internal_kpi(df_filtered)
+show_internal_kpi(result)
 st.markdown("<br>", unsafe_allow_html=True)
-show_internal_visual(
-    df_filtered,
-    df_all
+show_internal_visual(result)
+
+
+# ==============================
+# PENCARIAN JUDUL
+# ==============================
+st.markdown("### 🔎 Cari Judul Penelitian")
+query = st.text_input(
+    "Kata kunci",
+    placeholder='mis. limbah "era digital" OR pertanian',
+    help='Spasi = semua kata harus ada, OR = salah satu, "..." = frasa persis'
 )
 
+if query.strip():
+    show_title_search(engine.search(query.strip(), filters), engine=engine)
+
+with st.sidebar.expander("Statistik Cache"):
+    stats = engine.cache.stats()
+    st.caption(
+        f"Hit {stats['hits']} · Miss {stats['misses']} · "
+        f"Eviksi {stats['evictions']} · "
+        f"Isi {stats['size']}/{stats['maxsize']} · "
+        f"Hit rate {stats['hit_rate']:.0%}"
+    )
+    search_stats = engine.search_cache.stats()
+    st.caption(
+        f"Pencarian: Hit {search_stats['hits']} · Miss {search_stats['misses']} · "
+        f"Isi {search_stats['size']}/{search_stats['maxsize']}"
+    )
+
 
 
 st.markdown("---")
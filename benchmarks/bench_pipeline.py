@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.cube import AggregationCube
+from src.data_loader import cache_dir_for, load_data
+from src.dedup import TitleDeduper
+from src.emerging_terms import compute_emerging_terms
+from src.excel_stream import iter_sheet_chunks
+from src.filter_index import FILTER_COLUMNS, FilterIndex
+from src.keyword_extraction import KeywordModel, extract_keywords
+from src.peneliti_table import PenelitiTable
+from src.preprocessing import explode_peneliti
+from src.similar_titles import SimilarTitles
+from src.synthetic_data import make_raw_frame, write_workbook
+from src.text_normalization import normalize_texts, normalize_token, stem_word
+from src.topic_model import TopicModel
+
+# ==============================
+# BENCHMARK PIPELINE (TANPA STREAMLIT)
+# ==============================
+# Contoh:
+#   python -m benchmarks.bench_pipeline --sizes 10000 100000 1000000
+#   python -m benchmarks.bench_pipeline --json hasil.json
+#   python -m benchmarks.bench_pipeline --baseline hasil.json --tolerance 0.25
+
+
+def measure(fn, repeat=1, memory=True):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        # dijalankan terpisah karena tracemalloc memperlambat eksekusi
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return min(times), peak, result
+
+
+def random_filters(index, rng, keep=0.6):
+    filters = {}
+    for col in FILTER_COLUMNS:
+        options = index.options(col)
+        chosen = [v for v in options if rng.random() < keep]
+        filters[col] = chosen or options[:1]
+    return filters
+
+
+def load_data_cold_snapshot(path):
+    shutil.rmtree(cache_dir_for(path), ignore_errors=True)
+    return load_data(path)
+
+
+def isin_mask(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        mask &= df[col].isin(values).to_numpy()
+    return mask
+
+
+def bench_size(n_rows, repeat, memory, workbook_rows, seed):
+    results = []
+
+    def run(stage, fn):
+        seconds, peak, value = measure(fn, repeat=repeat, memory=memory)
+        results.append({
+            "rows": n_rows,
+            "stage": stage,
+            "seconds": seconds,
+            "peak_mb": None if peak is None else peak / 2**20,
+        })
+        return value
+
+    n_titles = int(np.ceil(n_rows / 1.5))
+    raw = make_raw_frame(n_titles, seed=seed)
+
+    # ---------- LOAD DATA (WORKBOOK) ----------
+    if n_titles <= workbook_rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.xlsx")
+            write_workbook(raw, path)
+
+            run("load_data_openpyxl", lambda: load_data(path, use_snapshot=False))
+            run("load_data_snapshot_build", lambda: load_data_cold_snapshot(path))
+            run("load_data_snapshot_warm", lambda: load_data(path))
+            run("excel_stream_chunks", lambda: sum(
+                len(chunk) for chunk in iter_sheet_chunks(path, chunk_size=5_000)
+            ))
+
+    # ---------- PREPROCESSING ----------
+    df = run("explode_peneliti", lambda: explode_peneliti(raw))
+
+    # ---------- FILTER ----------
+    rng = np.random.default_rng(seed)
+    index = run("filter_index_build", lambda: FilterIndex(df))
+    filters = random_filters(index, rng)
+
+    run("filter_isin", lambda: isin_mask(df, filters))
+    run("filter_bitmap", lambda: index.mask(filters))
+    df_filtered = df[index.mask(filters)]
+
+    table = run("peneliti_table_build", lambda: PenelitiTable(df))
+    run("peneliti_table_frame", lambda: table.frame(index.mask(filters)))
+    run("groupby_tahun_judul_str", lambda: df_filtered.groupby(["tahun", "judul"], observed=True).size())
+    table_filtered = table.frame(index.mask(filters))
+    run("groupby_tahun_judul_codes", lambda: table_filtered.groupby(["tahun", "judul"], observed=True).size())
+
+    # ---------- DEDUP ----------
+    run("dedup_minhash_lsh", lambda: TitleDeduper().add(df["judul"]))
+
+    # ---------- KEYWORD ----------
+    titles = df["judul"].dropna().unique()
+    run("text_normalize_cold", lambda: (
+        normalize_token.cache_clear(),
+        stem_word.cache_clear(),
+        normalize_texts(titles),
+    ))
+    model = run("keyword_model_fit", lambda: KeywordModel(titles))
+    run("keyword_top_subset", lambda: model.top_keywords(df_filtered["judul"].unique(), top_n=10))
+    run("keyword_top_by_provinsi", lambda: model.top_keywords_by_group(df_filtered, "provinsi", min_titles=2))
+    run("emerging_terms", lambda: compute_emerging_terms(df_filtered, model))
+
+    run("topic_model_fit", lambda: TopicModel().update(model))
+    topics = TopicModel()
+    topics.update(model)
+    run("topic_shares_tahun", lambda: topics.shares(df_filtered, "tahun"))
+
+    run("similar_index_build", lambda: SimilarTitles().update(model))
+    similar = SimilarTitles()
+    similar.update(model)
+    run("similar_query_1", lambda: similar.query(model, titles[:1]))
+    run("similar_all_pairs_top5", lambda: similar.all_pairs(k=5))
+
+    first_prov = df_filtered["provinsi"].iloc[0] if len(df_filtered) else None
+    prov_titles = df_filtered.loc[df_filtered["provinsi"] == first_prov, "judul"].unique()
+    if len(prov_titles) >= 2:
+        run("extract_keywords_legacy_1prov", lambda: extract_keywords(prov_titles, top_n=1))
+
+    # ---------- AGREGASI ----------
+    cube = run("cube_build", lambda: AggregationCube(df))
+    run("cube_kpi_crosstab_trend", lambda: (
+        cube.total(filters),
+        cube.dominant("bidang", filters),
+        cube.rollup(["bidang", "jenis_kelamin"], filters),
+        cube.unique_titles_per_year(filters),
+    ))
+    run("pandas_kpi_crosstab_trend", lambda: (
+        len(df_filtered),
+        df_filtered["bidang"].value_counts().idxmax(),
+        df_filtered.groupby(["bidang", "jenis_kelamin"], observed=True).size().unstack(fill_value=0),
+        df_filtered.groupby("tahun")["judul"].nunique(),
+    ))
+
+    return results
+
+
+def print_table(results):
+    print(f"{'rows':>10}  {'stage':<32} {'seconds':>10} {'peak MB':>10}")
+    for r in results:
+        peak = "-" if r["peak_mb"] is None else f"{r['peak_mb']:.1f}"
+        print(f"{r['rows']:>10}  {r['stage']:<32} {r['seconds']:>10.4f} {peak:>10}")
+
+
+def compare_baseline(results, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(b["rows"], b["stage"]): b for b in json.load(f)}
+
+    regressions = []
+    for r in results:
+        base = baseline.get((r["rows"], r["stage"]))
+        if base and r["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append((r, base))
+
+    for r, base in regressions:
+        print(
+            f"⚠️ REGRESI {r['stage']} @ {r['rows']} baris: "
+            f"{base['seconds']:.4f}s → {r['seconds']:.4f}s"
+        )
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline analisis LPB")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="jumlah baris peneliti (mis. 10000 ... 10000000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="lewati pengukuran peak memori")
+    parser.add_argument("--workbook-rows", type=int, default=20_000,
+                        help="batas judul untuk benchmark baca workbook")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    parser.add_argument("--baseline", help="file JSON hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_rows in args.sizes:
+        results.extend(bench_size(
+            n_rows,
+            repeat=args.repeat,
+            memory=not args.no_memory,
+            workbook_rows=args.workbook_rows,
+            seed=args.seed
+        ))
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline and compare_baseline(results, args.baseline, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
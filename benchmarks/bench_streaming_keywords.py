@@ -0,0 +1,86 @@
+import argparse
+import sys
+import time
+import tracemalloc
+
+from src.keyword_extraction import KeywordModel
+from src.streaming_keywords import StreamingKeywords, merge_sketches, sketch_partitions, topk_recall
+from src.synthetic_data import make_raw_frame
+
+# ==============================
+# AKURASI KEYWORD STREAMING VS TF-IDF EKSAK
+# ==============================
+# Contoh:
+#   python -m benchmarks.bench_streaming_keywords --sizes 10000 100000 --top 20
+# Recall = proporsi top-k KeywordModel yang juga muncul di top-k sketch;
+# baris "merge" membangun sketch per tahun secara paralel lalu digabung.
+# Exit code 1 bila recall mode streaming mana pun < --min-recall.
+
+
+def traced(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, seconds, peak / 2**20
+
+
+def bench_size(n_titles, top_n, capacity, seed):
+    raw = make_raw_frame(n_titles, seed=seed)
+    titles = raw["judul penelitian"].dropna().unique()
+    exact, exact_s, exact_mb = traced(lambda: KeywordModel(titles).top_keywords(top_n=top_n))
+
+    stream, stream_s, stream_mb = traced(
+        lambda: StreamingKeywords(capacity=capacity).consume(iter(titles)).top_keywords(top_n)
+    )
+
+    years = raw.drop_duplicates("judul penelitian").groupby("tahun")["judul penelitian"]
+    parts = {year: group.dropna().tolist() for year, group in years}
+    merged, merged_s, merged_mb = traced(
+        lambda: merge_sketches(sketch_partitions(parts, capacity=capacity).values()).top_keywords(top_n)
+    )
+
+    return [
+        {"titles": len(titles), "mode": "tfidf_exact", "seconds": exact_s, "peak_mb": exact_mb, "recall": 1.0},
+        {"titles": len(titles), "mode": "streaming", "seconds": stream_s, "peak_mb": stream_mb,
+         "recall": topk_recall(stream, exact)},
+        {"titles": len(titles), "mode": "streaming_merge", "seconds": merged_s, "peak_mb": merged_mb,
+         "recall": topk_recall(merged, exact)},
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Akurasi keyword streaming vs TF-IDF eksak")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="jumlah judul sintetis")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--capacity", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-recall", type=float, default=0.9,
+                        help="batas bawah recall; di bawahnya exit code 1")
+    args = parser.parse_args(argv)
+
+    failed = []
+    print(f"{'titles':>10}  {'mode':<16} {'seconds':>10} {'peak MB':>10} {'recall@' + str(args.top):>10}")
+    for n_titles in args.sizes:
+        for r in bench_size(n_titles, args.top, args.capacity, args.seed):
+            print(
+                f"{r['titles']:>10}  {r['mode']:<16} {r['seconds']:>10.3f} "
+                f"{r['peak_mb']:>10.1f} {r['recall']:>10.2f}"
+            )
+            if r["recall"] < args.min_recall:
+                failed.append(r)
+
+    for r in failed:
+        print(
+            f"GAGAL: recall {r['mode']} untuk {r['titles']} judul = {r['recall']:.2f} "
+            f"< {args.min_recall:.2f}",
+            file=sys.stderr
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,602 @@
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from src.cube import AggregationCube
+from src.data_loader import cache_dir_for, load_data
+from src.dedup import TitleDeduper
+from src.emerging_terms import compute_emerging_terms
+from src.filter_index import FILTER_COLUMNS, FilterIndex
+from src.keyword_extraction import KeywordModel
+from src.peneliti_table import PenelitiTable
+from src.preprocessing import explode_peneliti
+from src.result_cache import ResultCache, cached
+from src.similar_titles import SimilarTitles
+from src.text_normalization import NORMALIZER_VERSION, TextNormalizer
+from src.title_index import TitleIndex, parse_query
+from src.topic_model import TopicModel
+from src.trend_alignment import TrendAlignment
+
+
+# ==============================
+# AGREGASI (MURNI, TANPA STREAMLIT)
+# ==============================
+def compute_kpi(cube, filters=None):
+    return {
+        "total": cube.total(filters),
+        "bidang": cube.dominant("bidang", filters),
+        "jenis_kelamin": cube.dominant("jenis_kelamin", filters),
+        "tahun": int(cube.dominant("tahun", filters)),
+    }
+
+
+def compute_gender_bidang(cube, filters=None):
+    pivot = cube.rollup(["bidang", "jenis_kelamin"], filters)
+
+    return pivot.loc[
+        pivot.sum(axis=1) > 0,
+        pivot.sum(axis=0) > 0
+    ]
+
+
+def compute_topics(df, keyword_model, top_n=10):
+    keywords = keyword_model.top_keywords(
+        df["judul"].dropna().unique(),
+        top_n=top_n
+    )
+
+    topics = pd.DataFrame(
+        keywords,
+        columns=["topik", "jumlah"]
+    )
+    topics["topik"] = keyword_model.display_terms(topics["topik"])
+    return topics
+
+
+def compute_bidang_count(cube, filters=None):
+    bidang_count = (
+        cube.rollup("bidang", filters)
+        .loc[lambda s: s > 0]
+        .sort_values(ascending=False, kind="stable")
+        .reset_index()
+    )
+    bidang_count.columns = ["bidang", "jumlah"]
+
+    return bidang_count
+
+
+def compute_province_topics(df, keyword_model):
+    topics = keyword_model.top_keywords_by_group(
+        df,
+        "provinsi",
+        top_n=1,
+        min_titles=2  # guard aman
+    )
+    topics["topik"] = keyword_model.display_terms(topics["topik"])
+    return topics
+
+
+def compute_topic_shares(df, topic_model, by):
+    return topic_model.shares(df, by)
+
+
+def compute_emerging(df, keyword_model, top_n=10):
+    table, history = compute_emerging_terms(df, keyword_model, top_n=top_n)
+    table["topik"] = keyword_model.display_terms(table["topik"])
+    history["topik"] = keyword_model.display_terms(history["topik"])
+    return table, history
+
+
+def compute_trend(cube, filters=None):
+    all_years = sorted(cube.values["tahun"])
+
+    return (
+        cube.unique_titles_per_year(filters)
+        .reindex(all_years, fill_value=0)
+        .rename("judul")
+        .reset_index()
+    )
+
+
+def compute_search(hits, query, limit=200):
+    def per_group(col):
+        return (
+            hits.groupby(col, observed=True)["judul"]
+            .nunique()
+            .rename("jumlah")
+            .reset_index()
+        )
+
+    return SearchResult(
+        query=query,
+        n_titles=hits["judul"].nunique(),
+        titles=(
+            hits.drop_duplicates(["judul", "tahun", "provinsi"])
+            .sort_values(["tahun", "judul"], ascending=[False, True])
+            .head(limit)
+            .reset_index(drop=True)
+        ),
+        by_year=per_group("tahun"),
+        by_province=per_group("provinsi").sort_values("jumlah", ascending=False, kind="stable"),
+    )
+
+
+@dataclass
+class SearchResult:
+    query: str
+    n_titles: int
+    titles: pd.DataFrame
+    by_year: pd.DataFrame
+    by_province: pd.DataFrame
+
+
+# ==============================
+# HASIL ANALISIS INTERNAL
+# ==============================
+@dataclass
+class InternalResult:
+    filters: dict
+    n_rows: int
+    kpi: dict = None
+    gender_bidang: pd.DataFrame = None
+    topics: pd.DataFrame = None
+    bidang_count: pd.DataFrame = None
+    province_topics: pd.DataFrame = None
+    trend_all: pd.DataFrame = None
+    trend_selected: pd.DataFrame = None
+    topic_year: pd.DataFrame = None
+    topic_province: pd.DataFrame = None
+    topic_bidang: pd.DataFrame = None
+    emerging: pd.DataFrame = None
+    emerging_history: pd.DataFrame = None
+
+    @property
+    def empty(self):
+        return self.n_rows == 0
+
+    def to_dict(self):
+        def plain(value):
+            if not isinstance(value, pd.DataFrame):
+                return value
+            if value.index.name:
+                value = value.reset_index()
+            return value.to_dict(orient="records")
+
+        return {
+            "filters": self.filters,
+            "n_rows": self.n_rows,
+            "kpi": self.kpi,
+            "gender_bidang": plain(self.gender_bidang),
+            "topics": plain(self.topics),
+            "bidang_count": plain(self.bidang_count),
+            "province_topics": plain(self.province_topics),
+            "trend_all": plain(self.trend_all),
+            "trend_selected": plain(self.trend_selected),
+            "topic_year": plain(self.topic_year),
+            "topic_province": plain(self.topic_province),
+            "topic_bidang": plain(self.topic_bidang),
+            "emerging": plain(self.emerging),
+            "emerging_history": plain(self.emerging_history),
+        }
+
+
+# ==============================
+# STATE ENGINE (SNAPSHOT)
+# ==============================
+# Semua struktur turunan untuk satu versi data. Pembaruan membangun state
+# baru di samping lalu menukarnya dengan satu assignment; pembaca cukup
+# mengambil engine.state sekali dan tidak pernah melihat state setengah jadi.
+@dataclass
+class EngineState:
+    generation: int
+    deduper: TitleDeduper
+    table: PenelitiTable
+    filter_index: FilterIndex
+    cube: AggregationCube
+    keyword_model: KeywordModel
+    topic_model: TopicModel
+    similar_index: SimilarTitles
+    title_index: TitleIndex = None
+    row_titles: np.ndarray = None
+
+
+# ==============================
+# ENGINE ANALISIS (HEADLESS)
+# ==============================
+# Semua struktur turunan dibangun sekali dari tabel peneliti; run()
+# hanya menerima spesifikasi filter {kolom: [nilai]} dan mengembalikan
+# agregat biasa (DataFrame/dict), sehingga bisa dipakai dari Streamlit,
+# job batch, maupun CLI di bawah.
+class AnalyticsEngine:
+    # state_dir: folder model turunan yang disimpan antar restart (cache
+    # normalisasi judul, model topik, indeks judul mirip); None = memori
+    # search_cache: LRU kecil terpisah, supaya query bebas yang hampir
+    # selalu unik tidak mengusir hasil bagian dashboard dari cache utama
+    def __init__(self, df, cache=None, state_dir=None, search_cache=None):
+        self.cache = cache if cache is not None else ResultCache()
+        self.search_cache = search_cache if search_cache is not None else ResultCache(maxsize=64)
+        # hanya untuk penulis (sync/extend/rebuild); pembaca tanpa lock
+        self.lock = threading.RLock()
+
+        if state_dir is None:
+            self.normalizer = TextNormalizer()
+            topic_model = TopicModel()
+            similar_index = SimilarTitles()
+        else:
+            self.normalizer = TextNormalizer(
+                os.path.join(state_dir, f"judul_norm_v{NORMALIZER_VERSION}.parquet")
+            )
+            # model turunan bergantung pada kosakata ternormalisasi
+            topic_model = TopicModel.load(
+                os.path.join(state_dir, f"topik_v{NORMALIZER_VERSION}.joblib")
+            )
+            similar_index = SimilarTitles.load(
+                os.path.join(state_dir, f"judul_mirip_v{NORMALIZER_VERSION}.joblib")
+            )
+
+        self.state = self._build(df, topic_model, similar_index, generation=0)
+
+    # judul hampir sama (beda kapital/ejaan kecil) diganti judul kanoniknya,
+    # sehingga kubus, TF-IDF, tren, dan pencarian menghitung satu studi
+    # sekali; judul asli tetap disimpan di "judul_asli"
+    @staticmethod
+    def _canonicalize(df, deduper):
+        if "judul_asli" in df.columns:
+            return df
+        df = df.copy()
+        df["judul_asli"] = df["judul"]
+        ids = deduper.canonical_ids(df["judul"])
+        df["canonical_id"] = ids.astype(np.int32)
+        df["judul"] = deduper.canonical_titles(ids)
+        return df
+
+    # tabel masukan hanya dipakai selama membangun struktur turunan; yang
+    # disimpan engine adalah PenelitiTable (judul sekali + kode per baris)
+    def _build(self, df, topic_model, similar_index, generation):
+        # deduper baru: judul yang sudah hilang dari data tidak boleh lagi
+        # menjadi kanonik (mis. judul salah ketik yang sudah diperbaiki)
+        deduper = TitleDeduper()
+        df = self._canonicalize(df, deduper)
+        state = EngineState(
+            generation=generation,
+            deduper=deduper,
+            table=PenelitiTable(df),
+            filter_index=FilterIndex(df),
+            cube=AggregationCube(df),
+            keyword_model=KeywordModel(
+                df["judul"].dropna().unique(),
+                normalizer=self.normalizer
+            ),
+            topic_model=topic_model,
+            similar_index=similar_index,
+        )
+        self._index_titles(state)
+        state.topic_model.update(state.keyword_model)
+        state.similar_index.update(state.keyword_model)
+        return state
+
+    # indeks terbalik judul + id judul per baris peneliti
+    @staticmethod
+    def _index_titles(state):
+        state.title_index = TitleIndex(state.keyword_model)
+        state.row_titles = state.table.per_row(
+            pd.Index(state.keyword_model.titles).get_indexer(state.table.title_values("judul"))
+        )
+
+    # salinan penuh state untuk diubah di samping; normalizer (cache teks
+    # bersama, copy-on-write) tidak ikut disalin
+    def _copy_state(self, value):
+        return copy.deepcopy(value, {id(self.normalizer): self.normalizer})
+
+    # tampilan DataFrame penuh (judul dibentuk dari tabel judul)
+    @property
+    def df(self):
+        return self.state.table.frame()
+
+    @property
+    def n_rows(self):
+        return self.state.table.n_rows
+
+    @classmethod
+    def from_workbook(cls, path, sheet_name="GABUNGAN", cache=None):
+        df = explode_peneliti(load_data(path, sheet_name=sheet_name))
+        stem = os.path.splitext(os.path.basename(path))[0]
+        state_dir = os.path.join(cache_dir_for(path), f"{stem}__{sheet_name}__model")
+        return cls(df, cache=cache, state_dir=state_dir)
+
+    @classmethod
+    def from_store(cls, store, cache=None):
+        store.sync()
+        return cls(store.peneliti(), cache=cache, state_dir=store.store_dir)
+
+    # ==============================
+    # PEMBARUAN INKREMENTAL
+    # ==============================
+    # Baris baru (mis. tahun survei baru) cukup ditambahkan ke indeks
+    # filter, kubus, dan hitungan kosakata; bangun ulang penuh hanya jika
+    # ada baris lama yang hilang/berubah atau skema berubah. Keduanya
+    # dikerjakan pada salinan lalu ditukar, jadi pembaca tidak menunggu.
+    def extend(self, delta):
+        if delta.empty:
+            return
+        with self.lock:
+            state = self._copy_state(self.state)
+            state.generation += 1
+            delta = self._canonicalize(delta, state.deduper)
+            state.table.append(delta)
+            state.filter_index.append(delta)
+            state.cube.append(delta)
+            state.keyword_model.add_titles(delta["judul"].dropna().unique())
+            self._index_titles(state)
+            state.topic_model.update(state.keyword_model)
+            state.similar_index.update(state.keyword_model)
+            self.state = state
+            self.cache.clear()
+            self.search_cache.clear()
+
+    def rebuild(self, df):
+        with self.lock:
+            old = self.state
+            self.state = self._build(
+                df,
+                self._copy_state(old.topic_model),
+                self._copy_state(old.similar_index),
+                generation=old.generation + 1
+            )
+            self.cache.clear()
+            self.search_cache.clear()
+
+    # sync store dan pembaruan engine dalam satu lock: dua sesi yang sync
+    # bersamaan tidak boleh menghitung delta dari basis yang sama
+    def sync(self, store):
+        with self.lock:
+            ingest = store.sync()
+            if not ingest.changed:
+                return ingest
+
+            if ingest.mode == "append":
+                self.extend(ingest.added)
+            else:
+                self.rebuild(store.peneliti())
+            return ingest
+
+    def options(self, col, state=None):
+        state = state or self.state
+        return state.filter_index.options(col)
+
+    def normalize_filters(self, filters=None, state=None):
+        # pilihan "semua nilai" disamakan dengan tanpa filter supaya
+        # state default dan state eksplisit berbagi entri cache
+        state = state or self.state
+        filters = filters or {}
+        normalized = {}
+        for col in FILTER_COLUMNS:
+            selected = filters.get(col)
+            if selected is not None:
+                chosen = set(selected)
+                options = state.filter_index.options(col)
+                selected = [v for v in options if v in chosen]
+                if len(selected) == len(options) and state.filter_index.complete[col]:
+                    selected = None
+            normalized[col] = selected
+        return normalized
+
+    def filtered(self, filters=None, state=None):
+        state = state or self.state
+        mask = state.filter_index.mask(self.normalize_filters(filters, state))
+        return state.table.frame(mask)
+
+    # kunci cache menyertakan generasi state: hasil yang dihitung dari
+    # snapshot lama tidak pernah terbaca setelah pertukaran
+    def _cached(self, state, section, filters, compute):
+        return cached(self.cache, (state.generation, section), filters, compute)
+
+    def run(self, filters=None):
+        state = self.state
+        filters = self.normalize_filters(filters, state)
+        cube, model = state.cube, state.keyword_model
+        topic_model = state.topic_model
+
+        n_rows = state.filter_index.count(filters)
+        result = InternalResult(filters=filters, n_rows=n_rows)
+        if result.empty:
+            return result
+
+        # tabel terfilter hanya dibentuk jika bagian berbasis judul miss
+        df_cache = {}
+
+        def df_filtered():
+            if "df" not in df_cache:
+                df_cache["df"] = self.filtered(filters, state)
+            return df_cache["df"]
+
+        def section(name, section_filters, compute):
+            return self._cached(state, name, section_filters, compute)
+
+        result.kpi = section("kpi", filters, lambda: compute_kpi(cube, filters))
+        result.gender_bidang = section(
+            "gender_bidang", filters,
+            lambda: compute_gender_bidang(cube, filters)
+        )
+        result.topics = section(
+            "topik", filters,
+            lambda: compute_topics(df_filtered(), model)
+        )
+        result.bidang_count = section(
+            "bidang", filters,
+            lambda: compute_bidang_count(cube, filters)
+        )
+        result.province_topics = section(
+            "provinsi_topik", filters,
+            lambda: compute_province_topics(df_filtered(), model)
+        )
+        result.trend_all = section("tren_total", None, lambda: compute_trend(cube))
+        result.trend_selected = section(
+            "tren", filters,
+            lambda: compute_trend(cube, filters)
+        )
+
+        # porsi topik dari matriks dokumen × topik yang sudah tersimpan
+        result.topic_year = section(
+            "topik_tahun", filters,
+            lambda: compute_topic_shares(df_filtered(), topic_model, "tahun")
+        )
+        result.topic_province = section(
+            "topik_provinsi", filters,
+            lambda: compute_topic_shares(df_filtered(), topic_model, "provinsi")
+        )
+        result.topic_bidang = section(
+            "topik_bidang", filters,
+            lambda: compute_topic_shares(df_filtered(), topic_model, "bidang")
+        )
+
+        # term naik/turun: tahun terakhir filter vs tahun-tahun sebelumnya
+        result.emerging, result.emerging_history = section(
+            "topik_naik", filters,
+            lambda: compute_emerging(df_filtered(), model)
+        )
+
+        return result
+
+    # pencarian judul (AND/OR/"frasa") dibatasi filter aktif; kunci cache
+    # = klausa hasil parse, jadi query yang hanya beda spasi berbagi entri
+    def search(self, query, filters=None, limit=200):
+        state = self.state
+        filters = self.normalize_filters(filters, state)
+        clauses = tuple(tuple(clause) for clause in parse_query(query))
+
+        def compute():
+            title_ids = state.title_index.search(query)
+            row_mask = state.filter_index.mask(filters) & np.isin(state.row_titles, title_ids)
+            hits = state.table.frame(row_mask, ["judul", "tahun", "provinsi", "bidang"])
+            return compute_search(hits, query, limit)
+
+        result = cached(self.search_cache, (state.generation, "cari", clauses, limit), filters, compute)
+        return result if result.query == query else replace(result, query=query)
+
+    # ==============================
+    # KESELARASAN JUDUL DENGAN TREN
+    # ==============================
+    # Top-k cosine judul × keyword dihitung sekali per himpunan keyword
+    # (dibuang saat data berubah karena cache ikut dikosongkan); filter
+    # dan data tren baru hanya memicu agregasi ulang.
+    def trend_alignment(self, trend_df, filters=None):
+        state = self.state
+        filters = self.normalize_filters(filters, state)
+        keywords = sorted(trend_df["keyword"].dropna().unique())
+        keyword_key = hashlib.sha256("\n".join(keywords).encode("utf-8")).hexdigest()[:16]
+
+        alignment = self._cached(
+            state, f"selaras:{keyword_key}", None,
+            lambda: TrendAlignment(state.keyword_model, keywords)
+        )
+
+        trend_key = int(pd.util.hash_pandas_object(
+            trend_df[["keyword", "year", "google_mean"]], index=False
+        ).sum())
+        return self._cached(
+            state, f"selaras:{keyword_key}:{trend_key}", filters,
+            lambda: alignment.summarize(self.filtered(filters, state), trend_df)
+        )
+
+    # ==============================
+    # JUDUL MIRIP
+    # ==============================
+    # Tetangga terdekat dibaca dari graf top-k yang tersimpan; judul mirip
+    # dilengkapi tahun & provinsi agar studi lama lintas tahun terlihat.
+    # Judul yang sudah tidak ada di data (setelah bangun ulang) dibuang.
+    def _title_info(self, state):
+        return self._cached(
+            state, "judul_info", None,
+            lambda: (
+                state.table.frame(columns=["judul", "tahun", "provinsi", "bidang"])
+                .groupby("judul", observed=True)
+                .agg(tahun=("tahun", "min"), provinsi=("provinsi", "first"), bidang=("bidang", "first"))
+            )
+        )
+
+    def similar_titles(self, titles, k=5, state=None):
+        state = state or self.state
+        if isinstance(titles, str):
+            titles = [titles]
+        info = self._title_info(state)
+        pairs = state.similar_index.query(state.keyword_model, titles, k=state.similar_index.k)
+        pairs = pairs[pairs["judul_mirip"].isin(info.index)]
+        pairs = pairs[pairs.groupby("judul", sort=False).cumcount() < k]
+        pairs = pairs.assign(rank=pairs.groupby("judul", sort=False).cumcount() + 1)
+        return pairs.join(info, on="judul_mirip").reset_index(drop=True)
+
+    # laporan top-k judul mirip untuk seluruh korpus
+    def similar_report(self, k=5):
+        state = self.state
+        return self.similar_titles(state.keyword_model.titles, k=k, state=state)
+
+    def run_many(self, specs):
+        return [self.run(spec) for spec in specs]
+
+    def specs_per_value(self, col):
+        return [{col: [value]} for value in self.options(col)]
+
+
+# ==============================
+# CLI BATCH
+# ==============================
+# Contoh:
+#   python -m src.analytics --per provinsi --out laporan.jsonl
+#   python -m src.analytics --specs filter.json
+# filter.json berisi list spesifikasi, mis. [{"provinsi": ["ACEH"], "tahun": [2023]}]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analisis internal LPB tanpa Streamlit")
+    parser.add_argument("--data", default="data/Data Clean.xlsx")
+    parser.add_argument("--sheet", default="GABUNGAN")
+    parser.add_argument("--specs", help="file JSON berisi list spesifikasi filter")
+    parser.add_argument("--per", choices=FILTER_COLUMNS,
+                        help="buat satu spesifikasi untuk setiap nilai kolom ini")
+    parser.add_argument("--out", help="file JSON Lines keluaran (default: stdout)")
+    parser.add_argument("--mirip", help="tulis laporan top-5 judul mirip seluruh korpus ke CSV ini")
+    args = parser.parse_args(argv)
+
+    engine = AnalyticsEngine.from_workbook(args.data, sheet_name=args.sheet)
+
+    if args.mirip:
+        report = engine.similar_report(k=5)
+        report.to_csv(args.mirip, index=False)
+        print(f"{len(report)} pasangan judul mirip → {args.mirip}", file=sys.stderr)
+        if not (args.specs or args.per):
+            return 0
+
+    specs = []
+    if args.specs:
+        with open(args.specs, encoding="utf-8") as f:
+            specs.extend(json.load(f))
+    if args.per:
+        specs.extend(engine.specs_per_value(args.per))
+    if not specs:
+        specs = [{}]
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for result in engine.run_many(specs):
+            out.write(json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    stats = engine.cache.stats()
+    print(
+        f"{len(specs)} spesifikasi · cache hit {stats['hits']} / miss {stats['misses']}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.filter_index import FILTER_COLUMNS
+
+
+# ==============================
+# KUBUS AGREGASI (HITUNG SEKALI)
+# ==============================
+# counts[provinsi, jenis_kelamin, bidang, tahun, kelas] = jumlah baris
+# peneliti. Nilai kosong mendapat slot tambahan di akhir dimensi: slot
+# ini ikut terhitung saat dimensi tidak difilter, tetapi tidak pernah
+# terpilih oleh filter eksplisit (sama seperti isin).
+#
+# Jumlah judul unik tidak bisa dijumlahkan antar sel, jadi disimpan
+# matriks pendamping unit (tahun, judul) × sel; unit terhitung jika
+# menyentuh salah satu sel terpilih.
+class AggregationCube:
+    TITLE_SHIFT = 20  # kunci unit = kode judul << 20 | kode tahun
+
+    def __init__(self, df, dims=FILTER_COLUMNS, title_col="judul", year_dim="tahun"):
+        self.dims = list(dims)
+        self.title_col = title_col
+        self.year_dim = year_dim
+
+        self.values = {dim: [] for dim in self.dims}
+        self.codes = {dim: {} for dim in self.dims}
+        self.has_missing = {dim: False for dim in self.dims}
+        self.title_codes = {}
+
+        self.shape = (0,) * len(self.dims)
+        self.counts = np.zeros(self.shape, dtype=np.int64)
+
+        self.unit_keys = pd.Index([], dtype=np.int64)
+        self.unit_year = np.array([], dtype=np.int64)
+        self._pair_units = np.array([], dtype=np.int64)
+        self._pair_cells = np.array([], dtype=np.int64)
+
+        self.append(df)
+
+    def _slot_map(self, dim, n_values, had_missing):
+        # posisi lama → posisi baru; slot kosong selalu di akhir dimensi
+        target = np.arange(n_values + int(had_missing))
+        if had_missing:
+            target[-1] = len(self.values[dim])
+        return target
+
+    def _grow(self, old_shape, old_missing):
+        targets = [
+            self._slot_map(dim, old_shape[i] - int(old_missing[dim]), old_missing[dim])
+            for i, dim in enumerate(self.dims)
+        ]
+
+        counts = np.zeros(self.shape, dtype=np.int64)
+        counts[np.ix_(*targets)] = self.counts
+        self.counts = counts
+
+        if len(self._pair_cells):
+            old_codes = np.unravel_index(self._pair_cells, old_shape)
+            self._pair_cells = np.ravel_multi_index(
+                [targets[i][c] for i, c in enumerate(old_codes)],
+                self.shape
+            )
+
+        year_axis = self.dims.index(self.year_dim)
+        self.unit_year = targets[year_axis][self.unit_year]
+        self.unit_keys = pd.Index(
+            (self.unit_keys.to_numpy() >> self.TITLE_SHIFT << self.TITLE_SHIFT) | self.unit_year
+        )
+
+    # ==============================
+    # TAMBAH BARIS (INKREMENTAL)
+    # ==============================
+    # Sel kubus cukup ditambah bincount baris baru. Nilai dimensi baru
+    # (mis. tahun baru) memperbesar kubus dengan memindahkan isi lama,
+    # tanpa menghitung ulang dari data.
+    def append(self, df):
+        old_shape = self.shape
+        old_missing = dict(self.has_missing)
+
+        codes = []
+        for dim in self.dims:
+            values, lookup = self.values[dim], self.codes[dim]
+            for v in sorted(pd.unique(df[dim].dropna()).tolist()):
+                if v not in lookup:
+                    lookup[v] = len(values)
+                    values.append(v)
+
+            dim_codes = pd.Index(values).get_indexer(df[dim]) if values else np.full(len(df), -1)
+            missing = dim_codes < 0
+            self.has_missing[dim] = self.has_missing[dim] or bool(missing.any())
+            codes.append(np.where(missing, len(values), dim_codes))
+
+        self.shape = tuple(
+            len(self.values[dim]) + int(self.has_missing[dim]) for dim in self.dims
+        )
+        if self.shape != old_shape:
+            self._grow(old_shape, old_missing)
+
+        n_cells = int(np.prod(self.shape))
+        flat = np.ravel_multi_index(codes, self.shape) if len(df) else np.array([], dtype=np.int64)
+        self.counts += np.bincount(flat, minlength=n_cells).reshape(self.shape)
+
+        # unit judul unik per tahun
+        titles = df[self.title_col]
+        for title in pd.unique(titles.dropna()).tolist():
+            if title not in self.title_codes:
+                self.title_codes[title] = len(self.title_codes)
+
+        title_codes = titles.map(self.title_codes).to_numpy(dtype=float)
+        valid = ~np.isnan(title_codes)
+        year_codes = codes[self.dims.index(self.year_dim)][valid]
+        keys = (title_codes[valid].astype(np.int64) << self.TITLE_SHIFT) | year_codes
+
+        unit_idx = self.unit_keys.get_indexer(keys)
+        new_keys = pd.unique(keys[unit_idx < 0])
+        if len(new_keys):
+            self.unit_keys = self.unit_keys.append(pd.Index(new_keys))
+            self.unit_year = np.concatenate([
+                self.unit_year,
+                new_keys & ((1 << self.TITLE_SHIFT) - 1)
+            ])
+            unit_idx = self.unit_keys.get_indexer(keys)
+
+        pair_keys = np.unique(np.concatenate([
+            self._pair_units * n_cells + self._pair_cells,
+            unit_idx.astype(np.int64) * n_cells + flat[valid],
+        ]))
+        self._pair_units, self._pair_cells = np.divmod(pair_keys, n_cells)
+
+        self.title_cells = sp.csr_matrix(
+            (
+                np.ones(len(pair_keys), dtype=np.int32),
+                (self._pair_units, self._pair_cells)
+            ),
+            shape=(len(self.unit_keys), n_cells)
+        )
+
+    def _index(self, dim, selected):
+        values = self.values[dim]
+        if selected is None:
+            idx = np.arange(len(values) + int(self.has_missing[dim]))
+        else:
+            lookup = self.codes[dim]
+            idx = np.array(
+                list({lookup[v] for v in selected if v in lookup}),
+                dtype=np.int64
+            )
+
+        # urut sesuai nilai (slot kosong terakhir), bukan urutan kode
+        order = sorted(
+            range(len(idx)),
+            key=lambda i: (idx[i] >= len(values), values[idx[i]] if idx[i] < len(values) else 0)
+        )
+        return idx[order] if len(idx) else idx
+
+    def selection(self, filters=None):
+        filters = filters or {}
+        return tuple(self._index(dim, filters.get(dim)) for dim in self.dims)
+
+    def _labels(self, dim, idx):
+        values = self.values[dim]
+        return [values[i] if i < len(values) else None for i in idx]
+
+    def slice(self, filters=None):
+        return self.counts[np.ix_(*self.selection(filters))]
+
+    def total(self, filters=None):
+        return int(self.slice(filters).sum())
+
+    def rollup(self, keep, filters=None):
+        keep = [keep] if isinstance(keep, str) else list(keep)
+        sel = self.selection(filters)
+        sub = self.counts[np.ix_(*sel)]
+
+        drop_axes = tuple(i for i, dim in enumerate(self.dims) if dim not in keep)
+        sub = sub.sum(axis=drop_axes)
+
+        keep_axes = sorted(self.dims.index(dim) for dim in keep)
+        sub = np.transpose(sub, [keep_axes.index(self.dims.index(dim)) for dim in keep])
+
+        labels = [self._labels(dim, sel[self.dims.index(dim)]) for dim in keep]
+        if len(keep) == 1:
+            return pd.Series(sub, index=pd.Index(labels[0], name=keep[0]))
+
+        return pd.DataFrame(
+            sub.reshape(len(labels[0]), -1),
+            index=pd.Index(labels[0], name=keep[0]),
+            columns=pd.MultiIndex.from_product(labels[1:], names=keep[1:])
+            if len(keep) > 2 else pd.Index(labels[1], name=keep[1])
+        )
+
+    def dominant(self, dim, filters=None):
+        counts = self.rollup(dim, filters)
+        counts = counts[counts.index.notna()]
+        return counts.idxmax() if counts.sum() > 0 else None
+
+    def unique_titles_per_year(self, filters=None):
+        cell_mask = np.zeros(self.shape, dtype=np.int32)
+        cell_mask[np.ix_(*self.selection(filters))] = 1
+
+        hit = (self.title_cells @ cell_mask.ravel()) > 0
+        year_idx = np.arange(self.shape[self.dims.index(self.year_dim)])
+        counts = np.bincount(self.unit_year[hit], minlength=len(year_idx))
+
+        return pd.Series(
+            counts,
+            index=pd.Index(self._labels(self.year_dim, year_idx), name=self.year_dim)
+        )
@@ -1,17 +1,126 @@
+import hashlib
+import json
+import os
+
 import pandas as pd
 
-def load_data(path, sheet_name="GABUNGAN"):
+CACHE_DIRNAME = ".cache"
+SNAPSHOT_VERSION = 1
+
+
+def normalize_columns(columns):
+    return (
+        pd.Index(columns)
+        .astype(str)
+        .str.strip()
+        .str.lower()
+    )
+
+
+def read_excel_sheet(path, sheet_name="GABUNGAN"):
     df = pd.read_excel(
         path,
         sheet_name=sheet_name,
         header=0,
         engine="openpyxl"
     )
-    df.columns = (
-        df.columns
-        .astype(str)
-        .str.strip()
-        .str.lower()
+    df.columns = normalize_columns(df.columns)
+
+    return df
+
+
+# ==============================
+# SNAPSHOT KOLUMNAR (PARQUET)
+# ==============================
+def cache_dir_for(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_stat_key(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def snapshot_paths(path, sheet_name, snapshot_dir=None):
+    snapshot_dir = snapshot_dir or cache_dir_for(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(snapshot_dir, f"{stem}__{sheet_name}")
+    return base + ".parquet", base + ".json"
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+
+
+def _write_snapshot(df, parquet_path, meta_path, meta):
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    tmp = parquet_path + ".tmp"
+    try:
+        df.to_parquet(tmp, index=False)
+    except (ImportError, OSError, TypeError, ValueError):
+        # snapshot hanya optimasi; workbook tetap bisa dibaca langsung
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
+    os.replace(tmp, parquet_path)
+    _write_meta(meta_path, meta)
+    return True
+
+
+def load_data(path, sheet_name="GABUNGAN", use_snapshot=True, snapshot_dir=None):
+    if not use_snapshot:
+        return read_excel_sheet(path, sheet_name)
+
+    parquet_path, meta_path = snapshot_paths(path, sheet_name, snapshot_dir)
+    stat_key = file_stat_key(path)
+    meta = _read_meta(meta_path)
+    has_snapshot = meta is not None and os.path.exists(parquet_path)
+
+    if has_snapshot and meta.get("version") == SNAPSHOT_VERSION:
+        # jalur cepat: ukuran & mtime sama → tidak perlu hashing
+        if meta.get("size") == stat_key["size"] and meta.get("mtime_ns") == stat_key["mtime_ns"]:
+            return pd.read_parquet(parquet_path)
+
+        # mtime berubah (mis. checkout ulang) tapi isi workbook sama
+        sha = file_sha256(path)
+        if meta.get("sha256") == sha:
+            meta.update(stat_key)
+            _write_meta(meta_path, meta)
+            return pd.read_parquet(parquet_path)
+    else:
+        sha = file_sha256(path)
+
+    df = read_excel_sheet(path, sheet_name)
+    _write_snapshot(
+        df,
+        parquet_path,
+        meta_path,
+        {
+            "version": SNAPSHOT_VERSION,
+            "sheet_name": sheet_name,
+            "sha256": sha,
+            **stat_key,
+        }
     )
 
-    return df
\ No newline at end of file
+    return df
@@ -0,0 +1,329 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+SHINGLE_BASE = np.uint64(1_000_003)
+
+
+def normalize_title(titles):
+    return (
+        pd.Series(titles, dtype=object)
+        .str.lower()
+        .str.replace(r"[\W_]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+# ==============================
+# SHINGLE & MINHASH (TERVEKTORISASI)
+# ==============================
+# Semua teks digabung jadi satu array code point (UTF-32); hash tiap
+# shingle k karakter dihitung dengan rolling polynomial, lalu minhash
+# per dokumen = minimum per segmen (np.minimum.reduceat).
+def shingle_hashes(texts, k=5):
+    texts = list(texts)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    # teks lebih pendek dari k tetap mendapat satu shingle (teks utuh)
+    n_shingles = np.maximum(lengths - k + 1, 1)
+    seg_starts = np.cumsum(n_shingles) - n_shingles
+    doc = np.repeat(np.arange(len(texts)), n_shingles)
+    pos = starts[doc] + np.arange(n_shingles.sum()) - seg_starts[doc]
+
+    hashes = np.zeros(len(pos), dtype=np.uint64)
+    for j in range(k):
+        idx = pos + j
+        valid = idx < ends[doc]
+        c = codes[np.minimum(idx, max(len(codes) - 1, 0))] if len(codes) else np.zeros(len(idx), dtype=np.uint64)
+        hashes = hashes * SHINGLE_BASE + np.where(valid, c + np.uint64(1), np.uint64(0))
+
+    return hashes, seg_starts
+
+
+def minhash_signatures(texts, num_perm=64, k=5, seed=0):
+    if not len(texts):
+        return np.empty((0, num_perm), dtype=np.uint64)
+
+    hashes, seg_starts = shingle_hashes(texts, k)
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+    # multiply-shift: (a·x + b) mod 2^64, ambil 32 bit atas
+    signatures = np.empty((len(seg_starts), num_perm), dtype=np.uint64)
+    for p in range(num_perm):
+        values = (hashes * a[p] + b[p]) >> np.uint64(32)
+        signatures[:, p] = np.minimum.reduceat(values, seg_starts)
+
+    return signatures
+
+
+def band_keys(signatures, bands):
+    rows = signatures.shape[1] // bands
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    for band in range(bands):
+        for col in range(band * rows, (band + 1) * rows):
+            keys[:, band] = (keys[:, band] * SHINGLE_BASE) ^ signatures[:, col]
+    return keys
+
+
+# ==============================
+# JARAK EDIT BERPITA (TERVEKTORISASI)
+# ==============================
+# Jarak sisip/hapus antar pasangan teks, hanya pada diagonal |i-j| ≤ k
+# (cukup untuk memutuskan "≤ k edit"); satu baris DP diproses untuk
+# semua pasangan sekaligus. Nilai dipotong di k+1.
+def padded_codes(texts, pad):
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    flat = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    starts = np.cumsum(lengths) - lengths
+
+    width = int(lengths.max(initial=0))
+    col = np.arange(width)
+    inside = col[None, :] < lengths[:, None]
+    idx = np.where(inside, starts[:, None] + col[None, :], 0)
+    codes = np.where(inside, flat[idx] if len(flat) else 0, pad)
+    return codes, lengths
+
+
+def banded_indel_distance(a_texts, b_texts, k):
+    a, a_len = padded_codes(a_texts, pad=-1)
+    b, b_len = padded_codes(b_texts, pad=-2)
+    n, cap = len(a_texts), k + 1
+    if n == 0:
+        return np.array([], dtype=np.int64)
+
+    width = 2 * k + 1
+    offsets = np.arange(width) - k  # j - i
+    result = np.full(n, cap, dtype=np.int64)
+
+    # baris 0: D[0, j] = j
+    prev = np.minimum(np.where(offsets >= 0, offsets, cap), cap)[None, :].repeat(n, axis=0)
+    empty = (a_len == 0) & (b_len <= k)
+    result[empty] = b_len[empty]
+
+    for i in range(1, int(a_len.max(initial=0)) + 1):
+        cur = np.full((n, width), cap, dtype=np.int64)
+        a_char = a[:, i - 1]
+
+        for o in range(width):
+            j = i + offsets[o]
+            if j < 0:
+                continue
+            if j == 0:
+                cur[:, o] = min(i, cap)
+                continue
+
+            best = np.full(n, cap, dtype=np.int64)
+            if o + 1 < width:
+                best = np.minimum(best, prev[:, o + 1] + 1)
+            if o >= 1:
+                best = np.minimum(best, cur[:, o - 1] + 1)
+            if j - 1 < b.shape[1]:
+                same = a_char == b[:, j - 1]
+                best = np.where(same, np.minimum(best, prev[:, o]), best)
+            cur[:, o] = np.minimum(best, cap)
+
+        # baca D[len(a), len(b)] untuk pasangan yang berakhir di baris ini
+        done = (a_len == i) & (np.abs(b_len - i) <= k)
+        result[done] = cur[done, b_len[done] - i + k]
+        prev = cur
+
+    return result
+
+
+# ==============================
+# DETEKSI JUDUL HAMPIR SAMA (LSH)
+# ==============================
+# Judul dengan semua baris satu band sama masuk bucket yang sama; hanya
+# pasangan dalam bucket yang dibandingkan (kesepakatan signature ≥
+# threshold ≈ kemiripan Jaccard shingle). Karena judul LPB sering hanya
+# beda nama desa, nomor sekolah, atau kelas, kandidat dikonfirmasi lagi
+# per token: jumlah token harus sama, token berangka harus identik, dan
+# token yang berbeda hanya boleh salah ketik kecil (≤ max_word_edits)
+# di kata panjang (≥ min_typo_len huruf), total ≤ max_edits. Jadi
+# "Desa Kuta"/"Desa Kota" dan "Kelas 7"/"Kelas 8" tetap dua studi.
+# Pasangan lolos digabung dengan komponen terhubung; judul baru selalu
+# ikut id kanonik yang sudah ada, sehingga id lama stabil.
+class TitleDeduper:
+    def __init__(
+        self,
+        threshold=0.7,
+        max_edits=3,
+        max_word_edits=2,
+        min_typo_len=6,
+        num_perm=64,
+        bands=16,
+        shingle=5,
+        seed=0,
+        max_bucket=10
+    ):
+        self.threshold = threshold
+        self.max_edits = max_edits
+        self.max_word_edits = max_word_edits
+        self.min_typo_len = min_typo_len
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle = shingle
+        self.seed = seed
+        self.max_bucket = max_bucket
+
+        self.titles = []
+        self.normalized = []
+        self.title_ids = {}
+        self.canonical = np.array([], dtype=np.int64)
+        self.signatures = np.empty((0, num_perm), dtype=np.uint64)
+        self.keys = np.empty((0, bands), dtype=np.uint64)
+
+    @property
+    def n_titles(self):
+        return len(self.titles)
+
+    # semua pasangan dalam satu bucket: setelah diurutkan per kunci, anggota
+    # bucket bersebelahan, jadi pasangan berjarak d = elemen ke-i dan ke-i+d
+    # dengan kunci sama. Bucket raksasa (judul template) dibatasi: tiap
+    # judul hanya dipasangkan dengan max_bucket anggota sebelumnya.
+    def _candidate_pairs(self, n_old):
+        n = len(self.keys)
+        codes = []
+        for band in range(self.bands):
+            order = np.lexsort((np.arange(n), self.keys[:, band]))
+            key = self.keys[order, band]
+
+            for d in range(1, self.max_bucket + 1):
+                same = key[d:] == key[:-d]
+                if not same.any():
+                    break
+                left, right = order[:-d][same], order[d:][same]
+
+                # pasangan lama-lama sudah diperiksa saat penambahan sebelumnya
+                new = right >= n_old
+                codes.append(left[new].astype(np.int64) * n + right[new])
+
+        codes = np.unique(np.concatenate(codes)) if codes else np.array([], dtype=np.int64)
+        return np.stack(np.divmod(codes, n), axis=1)
+
+    # token judul `ids` sebagai matriks kode (baris = judul, kolom = posisi
+    # token, -1 = kosong) beserta jumlah token dan kosakatanya
+    def _token_table(self, ids):
+        tokens = [self.normalized[i].split() for i in ids]
+        n_tokens = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        codes, vocab = pd.factorize(pd.Series([t for ts in tokens for t in ts], dtype=object))
+
+        table = np.full((len(ids), int(n_tokens.max(initial=0))), -1, dtype=np.int64)
+        rows = np.repeat(np.arange(len(ids)), n_tokens)
+        cols = np.arange(n_tokens.sum()) - np.repeat(np.cumsum(n_tokens) - n_tokens, n_tokens)
+        table[rows, cols] = codes
+        return table, n_tokens, np.asarray(vocab, dtype=object)
+
+    def _verify(self, pairs, chunk=200_000):
+        # jarak sisip/hapus ≥ selisih panjang: saring dulu tanpa signature
+        lengths = np.fromiter(map(len, self.normalized), dtype=np.int64, count=len(self.normalized))
+        pairs = pairs[np.abs(lengths[pairs[:, 0]] - lengths[pairs[:, 1]]) <= self.max_edits]
+
+        keep = np.zeros(len(pairs), dtype=bool)
+        for start in range(0, len(pairs), chunk):
+            p = pairs[start:start + chunk]
+            agreement = (self.signatures[p[:, 0]] == self.signatures[p[:, 1]]).mean(axis=1)
+            keep[start:start + chunk] = agreement >= self.threshold
+        pairs = pairs[keep]
+        if not len(pairs):
+            return pairs
+
+        ids, inverse = np.unique(pairs, return_inverse=True)
+        table, n_tokens, vocab = self._token_table(ids)
+        a, b = inverse.reshape(pairs.shape).T
+        same_shape = n_tokens[a] == n_tokens[b]
+        pairs, a, b = pairs[same_shape], a[same_shape], b[same_shape]
+
+        differ = table[a] != table[b]
+        few = differ.sum(axis=1) <= self.max_edits
+        pairs, a, b, differ = pairs[few], a[few], b[few], differ[few]
+
+        # token yang berbeda: harus kata panjang tanpa angka dengan edit kecil
+        pair_idx, pos = np.nonzero(differ)
+        word_a = pd.Series(vocab[table[a[pair_idx], pos]], dtype=object)
+        word_b = pd.Series(vocab[table[b[pair_idx], pos]], dtype=object)
+        edits = banded_indel_distance(word_a.tolist(), word_b.tolist(), self.max_word_edits)
+        typo = (
+            (np.minimum(word_a.str.len(), word_b.str.len()).to_numpy() >= self.min_typo_len)
+            & ~word_a.str.contains(r"\d").to_numpy(dtype=bool)
+            & ~word_b.str.contains(r"\d").to_numpy(dtype=bool)
+            & (edits <= self.max_word_edits)
+        )
+
+        bad = np.bincount(pair_idx, weights=~typo, minlength=len(pairs)) > 0
+        total = np.bincount(pair_idx, weights=edits, minlength=len(pairs))
+        return pairs[~bad & (total <= self.max_edits)]
+
+    def add(self, titles):
+        new_titles = [
+            t for t in pd.unique(pd.Series(titles, dtype=object).dropna())
+            if t not in self.title_ids
+        ]
+        if not new_titles:
+            return 0
+
+        n_old = self.n_titles
+        for title in new_titles:
+            self.title_ids[title] = len(self.titles)
+            self.titles.append(title)
+
+        normalized = normalize_title(new_titles).fillna("").tolist()
+        self.normalized.extend(normalized)
+
+        signatures = minhash_signatures(
+            normalized,
+            self.num_perm,
+            self.shingle,
+            self.seed
+        )
+        self.signatures = np.vstack([self.signatures, signatures])
+        self.keys = np.vstack([self.keys, band_keys(signatures, self.bands)])
+
+        pairs = self._verify(self._candidate_pairs(n_old))
+
+        # graf: judul lama → kanoniknya, plus pasangan mirip yang lolos
+        n = self.n_titles
+        edges = np.concatenate([
+            np.stack([np.arange(n_old), self.canonical], axis=1),
+            pairs,
+        ])
+        graph = sp.csr_matrix(
+            (np.ones(len(edges), dtype=np.int8), (edges[:, 0], edges[:, 1])),
+            shape=(n, n)
+        )
+        _, labels = connected_components(graph, directed=False)
+
+        # id terkecil per komponen = judul paling awal muncul
+        first = np.full(labels.max() + 1, n, dtype=np.int64)
+        np.minimum.at(first, labels, np.arange(n))
+
+        canonical = np.concatenate([self.canonical, np.zeros(n - n_old, dtype=np.int64)])
+        anchor = first[labels[n_old:]]
+        canonical[n_old:] = np.where(anchor < n_old, canonical[np.minimum(anchor, max(n_old - 1, 0))], anchor)
+        self.canonical = canonical
+
+        return len(new_titles)
+
+    def canonical_ids(self, titles):
+        self.add(titles)
+        idx = pd.Index(self.titles).get_indexer(pd.Series(titles, dtype=object))
+        return np.where(idx >= 0, self.canonical[np.maximum(idx, 0)], -1)
+
+    def canonical_titles(self, ids):
+        titles = np.asarray(self.titles, dtype=object)
+        return np.where(ids >= 0, titles[np.maximum(ids, 0)], None)
+
+    def duplicate_groups(self):
+        groups = pd.Series(self.titles, dtype=object).groupby(self.canonical)
+        return {
+            self.titles[canon]: list(members)
+            for canon, members in groups
+            if len(members) > 1
+        }
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from src.keyword_extraction import group_indicator
+
+COLUMNS = [
+    "arah", "rank", "topik", "jumlah_sekarang", "jumlah_sebelumnya",
+    "porsi_sekarang", "porsi_sebelumnya", "pertumbuhan", "z",
+]
+
+
+# ==============================
+# MATRIKS TAHUN × TERM
+# ==============================
+# Jumlah judul unik per (tahun, term) untuk seluruh kosakata KeywordModel
+# sekaligus: indikator tahun × judul dikali matriks biner judul × term.
+def year_term_counts(df, keyword_model, year_col="tahun", title_col="judul"):
+    pairs = df[[year_col, title_col]].dropna().drop_duplicates()
+    rows = pairs[title_col].map(keyword_model.title_rows).to_numpy(dtype=float)
+    known = ~np.isnan(rows)
+
+    codes, years = pd.factorize(pairs.loc[known, year_col], sort=True)
+    G = group_indicator(codes, rows[known].astype(np.int64), len(years), keyword_model.n_docs)
+
+    B = keyword_model.matrix.copy()
+    B.data[:] = 1
+    counts = np.asarray((G @ B).todense()).astype(np.int64)
+    n_titles = np.bincount(codes, minlength=len(years))
+    return np.asarray(years), counts, n_titles
+
+
+# ==============================
+# SKOR KENAIKAN / LONJAKAN
+# ==============================
+# Tahun terakhir pada filter dibandingkan dengan gabungan tahun-tahun
+# sebelumnya (p0 = porsi judul yang memuat term, dihaluskan):
+#   pertumbuhan = log2(porsi sekarang / porsi sebelumnya)
+#   z           = (x − N·p0) / √(N·p0·(1−p0))  — lonjakan binomial
+# Term dengan kemunculan < min_count di kedua periode diabaikan.
+def emerging_scores(counts, n_titles, alpha=0.5):
+    current, prior = counts[-1], counts[:-1].sum(axis=0)
+    n_current, n_prior = n_titles[-1], n_titles[:-1].sum()
+
+    p_current = (current + alpha) / (n_current + 2 * alpha)
+    p_prior = (prior + alpha) / (n_prior + 2 * alpha)
+
+    growth = np.log2(p_current / p_prior)
+    z = (current - n_current * p_prior) / np.sqrt(n_current * p_prior * (1 - p_prior))
+    return growth, z
+
+
+def compute_emerging_terms(df, keyword_model, top_n=10, min_count=3, history_terms=5):
+    empty = pd.DataFrame(columns=COLUMNS), pd.DataFrame(columns=["tahun", "topik", "porsi"])
+    if keyword_model.matrix.shape[1] == 0:
+        return empty
+
+    years, counts, n_titles = year_term_counts(df, keyword_model)
+    if len(years) < 2:
+        return empty
+
+    growth, z = emerging_scores(counts, n_titles)
+    current, prior = counts[-1], counts[:-1].sum(axis=0)
+    support = np.maximum(current, prior) >= min_count
+
+    def ranked(direction):
+        score = z if direction == "naik" else -z
+        valid = np.flatnonzero(support & (score > 0))
+        if not len(valid):
+            return np.array([], dtype=np.int64)
+        k = min(top_n, len(valid))
+        top = valid[np.argpartition(-score[valid], k - 1)[:k]]
+        return top[np.lexsort((top, -score[top]))]
+
+    frames, picked = [], {}
+    for direction in ("naik", "turun"):
+        idx = picked[direction] = ranked(direction)
+        frames.append(pd.DataFrame({
+            "arah": direction,
+            "rank": np.arange(1, len(idx) + 1),
+            "topik": keyword_model.terms[idx],
+            "jumlah_sekarang": current[idx],
+            "jumlah_sebelumnya": prior[idx],
+            "porsi_sekarang": current[idx] / n_titles[-1],
+            "porsi_sebelumnya": prior[idx] / n_titles[:-1].sum(),
+            "pertumbuhan": growth[idx],
+            "z": z[idx],
+        }))
+    table = pd.concat(frames, ignore_index=True)
+
+    # riwayat porsi per tahun untuk term naik teratas
+    idx = picked["naik"][:history_terms]
+    shares = counts[:, idx] / n_titles[:, None]
+    history = pd.DataFrame({
+        "tahun": np.repeat(years, len(idx)),
+        "topik": np.tile(keyword_model.terms[idx], len(years)),
+        "porsi": shares.ravel(),
+    })
+
+    return table, history
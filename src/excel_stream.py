@@ -0,0 +1,133 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from src.data_loader import normalize_columns
+
+
+# ==============================
+# PEMBACA EXCEL BERTAHAP (READ-ONLY)
+# ==============================
+# openpyxl mode read-only membaca baris satu per satu dari XML sheet,
+# jadi memori puncak dibatasi oleh chunk_size, bukan ukuran workbook.
+def _header_names(header):
+    names = [
+        f"unnamed: {i}" if value is None else value
+        for i, value in enumerate(header)
+    ]
+    return list(normalize_columns(names))
+
+
+# teks angka (mis. tahun "2020") dijadikan numerik seperti parser
+# read_excel, agar tipe kolom sama dengan load_data
+def _chunk_frame(rows, columns):
+    df = pd.DataFrame.from_records(rows, columns=columns).infer_objects()
+
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        converted = pd.to_numeric(df[col], errors="coerce")
+        if converted.notna().sum() == df[col].notna().sum() > 0:
+            df[col] = converted
+
+    return df
+
+
+def iter_sheet_chunks(path, sheet_name="GABUNGAN", chunk_size=10_000):
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return
+
+        columns = _header_names(header)
+        n_cols = len(columns)
+        buffer = []
+
+        for row in rows:
+            # baris kosong total dilewati (sisa format di bawah tabel)
+            if row is None or all(v is None for v in row):
+                continue
+
+            row = tuple(row[:n_cols]) + (None,) * (n_cols - len(row))
+            buffer.append(row)
+
+            if len(buffer) >= chunk_size:
+                yield _chunk_frame(buffer, columns)
+                buffer = []
+
+        if buffer:
+            yield _chunk_frame(buffer, columns)
+    finally:
+        wb.close()
+
+
+def sheet_names(path):
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def read_sheet(path, sheet_name="GABUNGAN", chunk_size=10_000, process_chunk=None):
+    parts = []
+    for chunk in iter_sheet_chunks(path, sheet_name, chunk_size):
+        parts.append(process_chunk(chunk) if process_chunk else chunk)
+
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
+
+
+# ==============================
+# BANYAK SHEET / WORKBOOK PARALEL
+# ==============================
+# Parsing openpyxl murni Python (terikat GIL), jadi paralelisme memakai
+# proses. process_chunk harus fungsi level modul agar bisa di-pickle;
+# gunakan untuk mereduksi tiap chunk di worker (mis. explode_peneliti)
+# sehingga yang dikirim balik ke proses utama sudah ringkas.
+def list_workbooks(data_dir):
+    return sorted(
+        path
+        for path in glob.glob(os.path.join(data_dir, "*.xlsx"))
+        if not os.path.basename(path).startswith("~$")
+    )
+
+
+def _read_task(task):
+    path, sheet_name, chunk_size, process_chunk = task
+    return read_sheet(path, sheet_name, chunk_size, process_chunk)
+
+
+def read_sheets(
+    paths,
+    sheets=None,
+    chunk_size=10_000,
+    process_chunk=None,
+    max_workers=None
+):
+    if isinstance(paths, str):
+        paths = list_workbooks(paths) if os.path.isdir(paths) else [paths]
+
+    tasks = []
+    for path in paths:
+        names = sheets if sheets is not None else sheet_names(path)
+        for name in ([names] if isinstance(names, str) else names):
+            tasks.append((path, name, chunk_size, process_chunk))
+
+    if not tasks:
+        return {}
+
+    if max_workers == 1 or len(tasks) == 1:
+        results = map(_read_task, tasks)
+        return {(t[0], t[1]): df for t, df in zip(tasks, results)}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(_read_task, tasks)
+        return {(t[0], t[1]): df for t, df in zip(tasks, results)}
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ["provinsi", "jenis_kelamin", "bidang", "tahun", "kelas"]
+
+# jumlah bit 1 untuk setiap nilai byte (0..255)
+POPCOUNT = np.unpackbits(
+    np.arange(256, dtype=np.uint8)[:, None], axis=1
+).sum(axis=1).astype(np.uint8)
+
+
+# ==============================
+# INDEKS BITMAP FILTER
+# ==============================
+# Inverted index nilai filter → bitmap baris (bit dipadatkan per byte).
+# Filter dalam satu kolom digabung dengan OR, antar kolom dengan AND.
+# Kolom yang semua nilainya dipilih (dan tanpa nilai kosong) dilewati
+# sehingga kondisi default sidebar tidak menyentuh bitmap sama sekali.
+class FilterIndex:
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = 0
+        self.columns = list(columns)
+        self.values = {col: [] for col in self.columns}
+        self.codes = {col: {} for col in self.columns}
+        self.bitmaps = {col: np.empty((0, 0), dtype=np.uint8) for col in self.columns}
+        self.complete = {col: True for col in self.columns}
+
+        self.append(df)
+
+    def _refresh_masks(self):
+        n_bytes = (self.n_rows + 7) // 8
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self._none = np.zeros(n_bytes, dtype=np.uint8)
+
+    # ==============================
+    # TAMBAH BARIS (INKREMENTAL)
+    # ==============================
+    # Baris baru ditempel di akhir; hanya byte terakhir yang belum penuh
+    # yang dibongkar ulang, bitmap lama cukup disalin.
+    def append(self, df):
+        n_old, n_new = self.n_rows, self.n_rows + len(df)
+        tail_bits = n_old % 8
+        full_bytes = n_old // 8
+
+        for col in self.columns:
+            values, lookup = self.values[col], self.codes[col]
+
+            for v in sorted(pd.unique(df[col].dropna()).tolist()):
+                if v not in lookup:
+                    lookup[v] = len(values)
+                    values.append(v)
+
+            codes = pd.Index(values).get_indexer(df[col]) if values else np.full(len(df), -1)
+            self.complete[col] = self.complete[col] and bool((codes >= 0).all())
+
+            old = self.bitmaps[col]
+            old = np.vstack([
+                old,
+                np.zeros((len(values) - old.shape[0], old.shape[1]), dtype=np.uint8)
+            ]) if old.shape[0] < len(values) else old
+
+            new_bits = codes[None, :] == np.arange(len(values))[:, None]
+            if tail_bits:
+                tail = np.unpackbits(old[:, full_bytes:], axis=1)[:, :tail_bits].astype(bool)
+                new_bits = np.hstack([tail, new_bits])
+
+            self.bitmaps[col] = np.hstack([
+                old[:, :full_bytes],
+                np.packbits(new_bits, axis=1)
+            ])
+
+        self.n_rows = n_new
+        self._refresh_masks()
+
+    def options(self, col):
+        return sorted(self.values[col])
+
+    def _column_bits(self, col, selected):
+        lookup = self.codes[col]
+        idx = sorted({lookup[v] for v in selected if v in lookup})
+
+        # baris bernilai kosong tidak pernah lolos isin, jadi kolom
+        # hanya boleh dilewati jika tidak punya nilai kosong
+        if len(idx) == len(lookup) and self.complete[col]:
+            return None
+        if not idx:
+            return self._none
+
+        return np.bitwise_or.reduce(self.bitmaps[col][idx], axis=0)
+
+    def bits(self, selections):
+        result = None
+        for col, selected in selections.items():
+            if selected is None:
+                continue
+
+            col_bits = self._column_bits(col, selected)
+            if col_bits is None:
+                continue
+
+            result = col_bits if result is None else result & col_bits
+
+        return self._all if result is None else result
+
+    def mask(self, selections):
+        bits = self.bits(selections)
+        if bits is self._all:
+            return np.ones(self.n_rows, dtype=bool)
+        return np.unpackbits(bits, count=self.n_rows).astype(bool)
+
+    def rows(self, selections):
+        return np.flatnonzero(self.mask(selections))
+
+    def count(self, selections):
+        bits = self.bits(selections)
+        if bits is self._all:
+            return self.n_rows
+        return int(POPCOUNT[bits].sum(dtype=np.int64))
@@ -0,0 +1,196 @@
+import glob
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import cache_dir_for, file_stat_key, load_data
+from src.preprocessing import concat_peneliti, explode_peneliti
+
+STORE_VERSION = 1
+HASH_COL = "row_hash"
+
+
+# hash per baris mentah; baris identik dibedakan dengan nomor kemunculan
+def row_hashes(df_raw):
+    if df_raw.empty:
+        return np.array([], dtype=np.uint64)
+
+    hashes = pd.util.hash_pandas_object(df_raw, index=False).to_numpy()
+    occurrence = pd.Series(hashes).groupby(hashes).cumcount().to_numpy(dtype=np.uint64)
+    return hashes + occurrence
+
+
+@dataclass
+class IngestResult:
+    mode: str  # "unchanged" | "append" | "update" | "full"
+    added: pd.DataFrame = field(default_factory=pd.DataFrame)
+    n_removed: int = 0
+
+    @property
+    def changed(self):
+        return self.mode != "unchanged"
+
+
+# ==============================
+# INGESTI INKREMENTAL
+# ==============================
+# Tabel peneliti hasil explode disimpan sebagai part parquet yang hanya
+# ditambah (append-only) di data/.cache/<nama>__<sheet>__peneliti/.
+# Setiap sinkronisasi membandingkan hash baris mentah dengan manifest:
+#   - baris baru saja       → explode delta, tulis part baru ("append")
+#   - ada baris hilang/ubah → buang baris lama, tulis ulang part ("update")
+#   - skema kolom berubah   → bangun ulang penuh ("full")
+# Di memori hanya manifest dan hash baris mentah; tabel peneliti dibaca
+# dari part saat diminta (peneliti()) atau saat ada baris yang dibuang,
+# sehingga store yang ikut tercache tidak menahan salinan tabel penuh.
+class IncrementalStore:
+    def __init__(self, path, sheet_name="GABUNGAN", store_dir=None):
+        self.path = path
+        self.sheet_name = sheet_name
+        stem = os.path.splitext(os.path.basename(path))[0]
+        self.store_dir = store_dir or os.path.join(
+            cache_dir_for(path), f"{stem}__{sheet_name}__peneliti"
+        )
+
+        self.lock = threading.Lock()
+        self.manifest = None
+        self.raw_hashes = np.array([], dtype=np.uint64)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.store_dir, "manifest.json")
+
+    @property
+    def hashes_path(self):
+        return os.path.join(self.store_dir, "raw_hashes.npy")
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            raw_hashes = np.load(self.hashes_path)
+            complete = all(
+                os.path.exists(os.path.join(self.store_dir, name))
+                for name in manifest["parts"]
+            )
+        except (OSError, ValueError, KeyError):
+            return False
+
+        if manifest.get("version") != STORE_VERSION or not complete:
+            return False
+
+        self.manifest = manifest
+        self.raw_hashes = raw_hashes
+        return True
+
+    def _read_parts(self):
+        return concat_peneliti([
+            pd.read_parquet(os.path.join(self.store_dir, name))
+            for name in self.manifest["parts"]
+        ])
+
+    def _write_part(self, df, index):
+        name = f"part-{index:05d}.parquet"
+        tmp = os.path.join(self.store_dir, name + ".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(self.store_dir, name))
+        return name
+
+    def _commit(self, manifest, raw_hashes):
+        tmp = self.hashes_path + ".tmp.npy"
+        np.save(tmp, raw_hashes)
+        os.replace(tmp, self.hashes_path)
+
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+        # part lama yang tidak lagi dirujuk manifest dibersihkan
+        for path in glob.glob(os.path.join(self.store_dir, "part-*.parquet")):
+            if os.path.basename(path) not in manifest["parts"]:
+                os.remove(path)
+
+        self.manifest = manifest
+        self.raw_hashes = raw_hashes
+
+    def _rewrite(self, df, schema, stat_key, raw_hashes, next_part):
+        os.makedirs(self.store_dir, exist_ok=True)
+        parts = [self._write_part(df, next_part)] if len(df) else []
+        self._commit(
+            {
+                "version": STORE_VERSION,
+                "schema": schema,
+                "source": stat_key,
+                "parts": parts,
+                "next_part": next_part + 1,
+            },
+            raw_hashes
+        )
+
+    def sync(self, df_raw=None):
+        with self.lock:
+            return self._sync(df_raw)
+
+    def _sync(self, df_raw):
+        if self.manifest is None:
+            self._load()
+
+        stat_key = file_stat_key(self.path)
+        if (
+            df_raw is None
+            and self.manifest is not None
+            and self.manifest.get("source") == stat_key
+        ):
+            return IngestResult("unchanged")
+
+        if df_raw is None:
+            df_raw = load_data(self.path, sheet_name=self.sheet_name)
+
+        schema = list(df_raw.columns)
+        hashes = row_hashes(df_raw)
+        df_raw = df_raw.assign(**{HASH_COL: hashes})
+        next_part = self.manifest.get("next_part", 0) if self.manifest else 0
+
+        if self.manifest is None or self.manifest.get("schema") != schema:
+            df = explode_peneliti(df_raw, extra_columns=[HASH_COL])
+            self._rewrite(df, schema, stat_key, hashes, next_part)
+            return IngestResult("full", added=df)
+
+        is_new = ~np.isin(hashes, self.raw_hashes)
+        is_removed = ~np.isin(self.raw_hashes, hashes)
+        delta = explode_peneliti(df_raw[is_new], extra_columns=[HASH_COL])
+
+        if is_removed.any():
+            removed = self.raw_hashes[is_removed]
+            kept = self._read_parts()
+            if len(kept):
+                kept = kept[~np.isin(kept[HASH_COL].to_numpy(), removed)]
+            df = concat_peneliti([kept, delta])
+            self._rewrite(df, schema, stat_key, hashes, next_part)
+            return IngestResult("update", added=delta, n_removed=int(is_removed.sum()))
+
+        if not is_new.any():
+            self._commit({**self.manifest, "source": stat_key}, self.raw_hashes)
+            return IngestResult("unchanged")
+
+        os.makedirs(self.store_dir, exist_ok=True)
+        parts = list(self.manifest["parts"])
+        if len(delta):
+            parts.append(self._write_part(delta, next_part))
+
+        self._commit(
+            {**self.manifest, "source": stat_key, "parts": parts, "next_part": next_part + 1},
+            np.concatenate([self.raw_hashes, hashes[is_new]])
+        )
+        return IngestResult("append", added=delta)
+
+    def peneliti(self):
+        if self.manifest is None:
+            self.sync()
+        with self.lock:
+            return self._read_parts()
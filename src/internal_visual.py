@@ -1,27 +1,26 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 
-from src.keyword_extraction import extract_keywords
-
 
 # ==============================
 # KPI INTERNAL
 # ==============================
-def show_internal_kpi(df):
+def show_internal_kpi(result):
+    kpi = result.kpi
+
     c1, c2, c3, c4 = st.columns(4)
 
-    c1.metric("👩‍🔬 Total Penelitian", df.shape[0])
-    c2.metric("📚 Bidang Dominan", df["bidang"].value_counts().idxmax())
-    c3.metric("⚧ Gender Dominan", df["jenis_kelamin"].value_counts().idxmax())
-    c4.metric("📅 Tahun Teraktif", int(df["tahun"].value_counts().idxmax()))
+    c1.metric("👩‍🔬 Total Penelitian", kpi["total"])
+    c2.metric("📚 Bidang Dominan", kpi["bidang"])
+    c3.metric("⚧ Gender Dominan", kpi["jenis_kelamin"])
+    c4.metric("📅 Tahun Teraktif", kpi["tahun"])
 
 
 # ==============================
 # VISUAL INTERNAL
 # ==============================
-def show_internal_visual(df, df_all):
+def show_internal_visual(result):
     # =====================================================
     # ROW 1 — STACKED BAR + 2 PIE (SEBARIS)
     # =====================================================
@@ -31,7 +30,7 @@ def show_internal_visual(df, df_all):
     with col1:
         st.markdown("### Gender vs Bidang")
 
-        pivot = pd.crosstab(df["bidang"], df["jenis_kelamin"])
+        pivot = result.gender_bidang
 
         fig = px.bar(
             pivot,
@@ -46,15 +45,7 @@ def show_internal_visual(df, df_all):
     with col2:
         st.markdown("### Topik Penelitian (Judul)")
 
-        keywords = extract_keywords(
-            df["judul"].dropna().unique(),
-            top_n=10
-        )
-
-        topic_df = pd.DataFrame(
-            keywords,
-            columns=["topik", "jumlah"]
-        )
+        topic_df = result.topics
 
         fig = px.pie(
             topic_df,
@@ -68,12 +59,7 @@ def show_internal_visual(df, df_all):
     with col3:
         st.markdown("### Distribusi Bidang")
 
-        bidang_count = (
-            df["bidang"]
-            .value_counts()
-            .reset_index()
-        )
-        bidang_count.columns = ["bidang", "jumlah"]
+        bidang_count = result.bidang_count
 
         fig = px.pie(
             bidang_count,
@@ -88,29 +74,7 @@ def show_internal_visual(df, df_all):
     # =====================================================
     st.markdown("### Topik Penelitian Terfavorit per Provinsi")
 
-    records = []
-
-    for prov, df_p in df.groupby("provinsi"):
-        judul_list = df_p["judul"].dropna().unique()
-
-        # guard aman
-        if len(judul_list) < 2:
-            continue
-
-        keywords = extract_keywords(judul_list, top_n=1)
-
-        if not keywords:
-            continue
-
-        topik, skor = keywords[0]
-
-        records.append({
-            "provinsi": prov,
-            "topik": topik,
-            "jumlah": len(judul_list)
-        })
-
-    prov_topic_df = pd.DataFrame(records)
+    prov_topic_df = result.province_topics
 
     if prov_topic_df.empty:
         st.warning("⚠️ Tidak cukup data untuk analisis topik per provinsi.")
@@ -150,23 +114,8 @@ def show_internal_visual(df, df_all):
     st.markdown("### Tren Jumlah Penelitian per Tahun")
 
 
-    all_years = sorted(df_all["tahun"].dropna().unique())
-
-
-    trend_all = (
-        df_all.groupby("tahun")["judul"]
-        .nunique()
-        .reindex(all_years, fill_value=0)
-        .reset_index()
-    )
-
-
-    trend_selected = (
-        df.groupby("tahun")["judul"]
-        .nunique()
-        .reindex(all_years, fill_value=0)
-        .reset_index()
-    )
+    trend_all = result.trend_all
+    trend_selected = result.trend_selected
 
 
     fig, ax = plt.subplots(figsize=(9, 4))
@@ -209,6 +158,92 @@ def show_internal_visual(df, df_all):
         )
 
 
+    # =====================================================
+    # ROW 3B — PORSI TOPIK (MODEL TOPIK NMF)
+    # =====================================================
+    st.markdown("### Porsi Topik Penelitian")
+
+    if result.topic_year is None or result.topic_year.empty:
+        st.warning("⚠️ Model topik belum tersedia untuk data ini.")
+    else:
+        tab_year, tab_prov, tab_bidang = st.tabs(["Per Tahun", "Per Provinsi", "Per Bidang"])
+
+        for tab, shares, col, label in [
+            (tab_year, result.topic_year, "tahun", "Tahun"),
+            (tab_prov, result.topic_province, "provinsi", "Provinsi"),
+            (tab_bidang, result.topic_bidang, "bidang", "Bidang"),
+        ]:
+            with tab:
+                fig = px.bar(
+                    shares,
+                    x=col,
+                    y="porsi",
+                    color="topik",
+                    labels={"porsi": "Porsi Judul", col: label, "topik": "Topik"},
+                    title=f"Porsi Topik per {label}"
+                )
+                fig.update_layout(barmode="stack", yaxis_tickformat=".0%", xaxis_tickangle=-45)
+                fig.update_xaxes(type="category")
+                st.plotly_chart(fig, use_container_width=True)
+
+
+    # =====================================================
+    # ROW 3C — TOPIK NAIK & TURUN (TAHUN TERAKHIR FILTER)
+    # =====================================================
+    st.markdown("### Topik Naik & Turun")
+
+    emerging = result.emerging
+
+    if emerging is None or emerging.empty:
+        st.info("ℹ️ Pilih minimal dua tahun untuk melihat topik yang naik/turun.")
+    else:
+        col1, col2 = st.columns(2)
+
+        for col, direction, title in [
+            (col1, "naik", "Topik Paling Naik"),
+            (col2, "turun", "Topik Paling Turun"),
+        ]:
+            with col:
+                terms = emerging[emerging["arah"] == direction]
+                fig = px.bar(
+                    terms,
+                    x="z",
+                    y="topik",
+                    orientation="h",
+                    hover_data={
+                        "jumlah_sekarang": True,
+                        "jumlah_sebelumnya": True,
+                        "pertumbuhan": ":.2f",
+                        "z": ":.1f",
+                    },
+                    labels={
+                        "z": "Skor Lonjakan (z)",
+                        "topik": "Topik",
+                        "jumlah_sekarang": "Judul Tahun Terakhir",
+                        "jumlah_sebelumnya": "Judul Tahun Sebelumnya",
+                        "pertumbuhan": "Pertumbuhan (log2)",
+                    },
+                    title=title
+                )
+                fig.update_layout(yaxis={"categoryorder": "total ascending" if direction == "naik" else "total descending"})
+                st.plotly_chart(fig, use_container_width=True)
+
+        history = result.emerging_history
+        if history is not None and not history.empty:
+            fig = px.line(
+                history,
+                x="tahun",
+                y="porsi",
+                color="topik",
+                markers=True,
+                labels={"porsi": "Porsi Judul", "tahun": "Tahun", "topik": "Topik"},
+                title="Riwayat Topik Paling Naik"
+            )
+            fig.update_layout(yaxis_tickformat=".1%")
+            fig.update_xaxes(type="category")
+            st.plotly_chart(fig, use_container_width=True)
+
+
 
     # =====================================================
     # ROW 4 — AKURASI EKSTRAKSI TOPIK
@@ -231,3 +266,73 @@ def show_internal_visual(df, df_all):
     #     label="Akurasi Topik (Judul vs Bidang)",
     #     value=f"{accuracy} %"
     # )
+
+
+# ==============================
+# PENCARIAN JUDUL
+# ==============================
+def show_title_search(search, engine=None):
+    if search.n_titles == 0:
+        st.info(f"Tidak ada judul yang cocok dengan \"{search.query}\" pada filter ini.")
+        return
+
+    st.caption(f"{search.n_titles} judul cocok dengan \"{search.query}\"")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig = px.bar(
+            search.by_year,
+            x="tahun",
+            y="jumlah",
+            labels={"jumlah": "Jumlah Judul", "tahun": "Tahun"},
+            title="Judul Cocok per Tahun"
+        )
+        fig.update_xaxes(type="category")
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        fig = px.bar(
+            search.by_province,
+            x="provinsi",
+            y="jumlah",
+            labels={"jumlah": "Jumlah Judul", "provinsi": "Provinsi"},
+            title="Judul Cocok per Provinsi"
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(search.titles, use_container_width=True, hide_index=True)
+
+    if engine is not None:
+        _render_similar(engine, search.titles["judul"].drop_duplicates().tolist())
+
+
+# ==============================
+# JUDUL MIRIP (LINTAS TAHUN LPB)
+# ==============================
+def _render_similar(engine, titles):
+    st.markdown("#### Studi Serupa")
+
+    title = st.selectbox("Pilih judul untuk melihat studi serupa", titles)
+    if not title:
+        return
+
+    similar = engine.similar_titles(title, k=5)
+    if similar.empty:
+        st.info("Belum ada judul lain yang mirip dengan judul ini.")
+        return
+
+    st.dataframe(
+        similar[["rank", "judul_mirip", "tahun", "provinsi", "bidang", "skor"]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "rank": "Peringkat",
+            "judul_mirip": "Judul Serupa",
+            "tahun": st.column_config.NumberColumn("Tahun", format="%d"),
+            "provinsi": "Provinsi",
+            "bidang": "Bidang",
+            "skor": st.column_config.ProgressColumn("Kemiripan", min_value=0.0, max_value=1.0, format="%.2f"),
+        },
+    )
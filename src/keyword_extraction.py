@@ -1,4 +1,7 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 
 STOPWORDS_ID = [
     "yang", "dan", "di", "ke", "dari", "untuk", "dengan",
@@ -7,6 +10,75 @@ STOPWORDS_ID = [
     "berbasis", "melalui", "menggunakan", "of", "the"
 ]
 
+
+def top_k(terms, scores, top_n):
+    n = len(scores)
+    if top_n <= 0 or n == 0:
+        return []
+
+    if top_n < n:
+        idx = np.argpartition(-scores, top_n - 1)[:top_n]
+    else:
+        idx = np.arange(n)
+
+    # skor turun, seri diurutkan sesuai urutan istilah (alfabetis)
+    idx = idx[np.lexsort((idx, -scores[idx]))]
+
+    return [(terms[i], float(scores[i])) for i in idx]
+
+
+def group_indicator(group_codes, doc_rows, n_groups, n_docs):
+    G = sp.csr_matrix(
+        (np.ones(len(doc_rows)), (group_codes, doc_rows)),
+        shape=(n_groups, n_docs)
+    )
+    G.sum_duplicates()
+    G.data[:] = 1
+
+    return G
+
+
+# top-k per baris matriks (sparse/dense) diproses per blok agar memori
+# terbatas; hasil: (baris, peringkat, kolom, skor) untuk skor > 0
+def top_k_rows(S, top_n, block_cells=4_000_000):
+    n_rows, n_cols = S.shape
+    k = min(top_n, n_cols)
+    if k <= 0 or n_rows == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty, np.array([], dtype=np.float64)
+
+    block_rows = max(1, block_cells // max(n_cols, 1))
+    out_rows, out_rank, out_cols, out_scores = [], [], [], []
+
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        block = S[start:stop]
+        block = block.toarray() if sp.issparse(block) else np.asarray(block)
+
+        if k < n_cols:
+            cand = np.sort(np.argpartition(-block, k - 1, axis=1)[:, :k], axis=1)
+        else:
+            cand = np.tile(np.arange(n_cols), (stop - start, 1))
+
+        cand_scores = np.take_along_axis(block, cand, axis=1)
+        order = np.argsort(-cand_scores, axis=1, kind="stable")
+        cand = np.take_along_axis(cand, order, axis=1)
+        cand_scores = np.take_along_axis(cand_scores, order, axis=1)
+
+        r_idx, c_idx = np.nonzero(cand_scores > 0)
+        out_rows.append(r_idx + start)
+        out_rank.append(c_idx + 1)
+        out_cols.append(cand[r_idx, c_idx])
+        out_scores.append(cand_scores[r_idx, c_idx])
+
+    return (
+        np.concatenate(out_rows),
+        np.concatenate(out_rank),
+        np.concatenate(out_cols),
+        np.concatenate(out_scores),
+    )
+
+
 def extract_keywords(texts, top_n=10):
     tfidf = TfidfVectorizer(
         stop_words=STOPWORDS_ID,
@@ -19,10 +91,165 @@ def extract_keywords(texts, top_n=10):
     scores = X.sum(axis=0).A1
     keywords = tfidf.get_feature_names_out()
 
-    result = sorted(
-        zip(keywords, scores),
-        key=lambda x: x[1],
-        reverse=True
-    )
+    return top_k(keywords, scores, top_n)
+
+
+# ==============================
+# MODEL TF-IDF KORPUS (FIT SEKALI)
+# ==============================
+# Menyimpan hitungan term mentah semua judul unik. Bobot TF-IDF (idf
+# smooth + normalisasi l2, sama dengan TfidfVectorizer) dihitung ulang
+# dari hitungan tersebut, sehingga skor subset cukup slicing baris.
+class KeywordModel:
+    def __init__(
+        self,
+        titles,
+        stop_words=STOPWORDS_ID,
+        ngram_range=(1, 2),
+        min_df=2,
+        max_df=0.85,
+        normalizer=None
+    ):
+        # normalizer (mis. TextNormalizer) dipasang sebagai preprocessor
+        self.normalizer = normalizer
+        self.analyzer = CountVectorizer(
+            stop_words=stop_words,
+            ngram_range=ngram_range,
+            preprocessor=normalizer
+        ).build_analyzer()
+        self.min_df = min_df
+        self.max_df = max_df
+
+        self.titles = []
+        self.title_rows = {}
+        self.vocabulary = {}
+        self.counts = sp.csr_matrix((0, 0), dtype=np.int32)
+
+        self.add_titles(titles)
+
+    @property
+    def n_docs(self):
+        return len(self.titles)
+
+    def add_titles(self, titles):
+        new_titles = [
+            t for t in pd.unique(pd.Series(titles, dtype=object).dropna())
+            if t not in self.title_rows
+        ]
+        if not new_titles:
+            return 0
+        if self.normalizer is not None:
+            self.normalizer.prime(new_titles)
+
+        indptr, indices = [0], []
+        for title in new_titles:
+            for term in self.analyzer(title):
+                indices.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+            indptr.append(len(indices))
+
+        n_terms = len(self.vocabulary)
+        new_counts = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(new_titles), n_terms)
+        )
+        new_counts.sum_duplicates()
+
+        old_counts = self.counts
+        old_counts.resize((old_counts.shape[0], n_terms))
+        self.counts = sp.vstack([old_counts, new_counts], format="csr")
+
+        for title in new_titles:
+            self.title_rows[title] = len(self.titles)
+            self.titles.append(title)
+
+        self._refresh()
+        return len(new_titles)
+
+    def _refresh(self):
+        n_docs = self.n_docs
+        doc_freq = np.bincount(self.counts.indices, minlength=self.counts.shape[1])
+
+        max_doc = self.max_df if isinstance(self.max_df, int) else self.max_df * n_docs
+        min_doc = self.min_df if isinstance(self.min_df, int) else self.min_df * n_docs
+        keep = np.flatnonzero((doc_freq >= min_doc) & (doc_freq <= max_doc))
+
+        terms = np.empty(len(self.vocabulary), dtype=object)
+        terms[list(self.vocabulary.values())] = list(self.vocabulary.keys())
+
+        # urutan kolom alfabetis seperti get_feature_names_out()
+        keep = keep[np.argsort(terms[keep].astype(str), kind="stable")]
+
+        self.terms = terms[keep]
+        self.doc_freq = doc_freq[keep]
+        self.idf = np.log((1 + n_docs) / (1 + self.doc_freq)) + 1
+
+        X = self.counts[:, keep].astype(np.float64) @ sp.diags(self.idf)
+        norms = np.sqrt(X.multiply(X).sum(axis=1)).A1
+        norms[norms == 0] = 1
+        self.matrix = sp.csr_matrix(sp.diags(1 / norms) @ X)
+
+    # term untuk ditampilkan: bentuk asli tersering bila normalizer
+    # mencatatnya (TextNormalizer), selain itu term apa adanya
+    def display_terms(self, terms):
+        display = getattr(self.normalizer, "display", None)
+        terms = list(terms)
+        return [display(t) for t in terms] if display is not None else terms
+
+    def rows_for(self, titles):
+        rows = {
+            self.title_rows[t]
+            for t in pd.Series(titles, dtype=object).dropna()
+            if t in self.title_rows
+        }
+        return np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+
+    def scores(self, rows=None):
+        X = self.matrix if rows is None else self.matrix[rows]
+        return np.asarray(X.sum(axis=0)).ravel()
+
+    def top_keywords(self, titles=None, top_n=10):
+        rows = None if titles is None else self.rows_for(titles)
+        if rows is not None and len(rows) == 0:
+            return []
+
+        return top_k(self.terms, self.scores(rows), top_n)
+
+    # ==============================
+    # TOP-K PER KELOMPOK (SEKALIGUS)
+    # ==============================
+    # Matriks indikator kelompok × dokumen dikalikan dengan matriks
+    # dokumen × term, lalu top-k diambil per baris secara blok.
+    def top_keywords_by_group(
+        self,
+        df,
+        group_col,
+        top_n=1,
+        title_col="judul",
+        min_titles=1,
+        block_cells=4_000_000
+    ):
+        pairs = df[[group_col, title_col]].dropna().drop_duplicates()
+        codes, groups = pd.factorize(pairs[group_col], sort=True)
+        n_titles = np.bincount(codes, minlength=len(groups))
+
+        rows = pairs[title_col].map(self.title_rows).to_numpy(dtype=float)
+        known = ~np.isnan(rows)
+
+        G = group_indicator(
+            codes[known],
+            rows[known].astype(np.int64),
+            len(groups),
+            self.n_docs
+        )
+        S = G @ self.matrix
+
+        g_idx, ranks, term_idx, scores = top_k_rows(S, top_n, block_cells)
+        result = pd.DataFrame({
+            group_col: np.asarray(groups)[g_idx],
+            "rank": ranks,
+            "topik": self.terms[term_idx],
+            "skor": scores,
+            "jumlah": n_titles[g_idx],
+        })
 
-    return result[:top_n]
+        return result[result["jumlah"] >= min_titles].reset_index(drop=True)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import concat_peneliti
+
+TITLE_COLUMNS = ["judul", "judul_asli", "canonical_id"]
+
+
+# ==============================
+# TABEL PENELITI RINGKAS
+# ==============================
+# String judul disimpan sekali di tabel judul (satu baris per judul asli);
+# tabel peneliti hanya berisi title_id int32 di samping kolom kode yang
+# sudah ringkas (kategori provinsi/bidang/jenis_kelamin, tahun int16,
+# kelas Int8). frame() membentuk tampilan DataFrame lama hanya untuk
+# baris/kolom yang diminta: kolom judul menjadi Categorical di atas
+# title_id, jadi string tidak disalin per baris dan groupby memakai kode.
+class PenelitiTable:
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.title_columns = [c for c in TITLE_COLUMNS if c in self.columns]
+        self.key = "judul_asli" if "judul_asli" in self.columns else "judul"
+
+        self.title_ids = {}
+        self.titles = df[self.title_columns].iloc[:0].reset_index(drop=True)
+        self.rows = None
+        self._categories = {}
+
+        self.append(df)
+
+    @property
+    def n_rows(self):
+        return len(self.rows)
+
+    def append(self, df):
+        keys = df[self.key]
+
+        # judul asli baru → baris baru di tabel judul (urutan kemunculan)
+        first = df.loc[keys.notna() & ~keys.duplicated(), self.title_columns]
+        first = first[~first[self.key].isin(self.title_ids.keys())]
+        if self.key != "judul":
+            # judul kanonik hanya disimpan bila berbeda dari judul asli
+            first = first.assign(judul=first["judul"].where(first["judul"] != first[self.key]))
+        for title in first[self.key]:
+            self.title_ids[title] = len(self.title_ids)
+        if len(first):
+            self.titles = pd.concat([self.titles, first], ignore_index=True)
+            self._categories = {}
+
+        ids = pd.Index(self.titles[self.key]).get_indexer(keys).astype(np.int32)
+        compact = df.drop(columns=self.title_columns)
+        compact.insert(0, "title_id", ids)
+        self.rows = compact.reset_index(drop=True) if self.rows is None else concat_peneliti([self.rows, compact])
+
+    def title_values(self, col="judul"):
+        values = self.titles[col]
+        if col == "judul" and self.key != "judul":
+            values = values.fillna(self.titles[self.key])
+        return values
+
+    # kode kategori per title_id untuk kolom judul (kategori terurut,
+    # sehingga sort_values sama dengan urutan string)
+    def _title_codes(self, col):
+        if col not in self._categories:
+            values = self.title_values(col)
+            categories = pd.Index(values.dropna().unique()).sort_values()
+            self._categories[col] = categories.get_indexer(values), categories
+        return self._categories[col]
+
+    def _title_column(self, col, ids):
+        known = ids >= 0
+        if col == "canonical_id":
+            values = self.titles[col].to_numpy()
+            return np.where(known, values[np.maximum(ids, 0)], -1).astype(np.int32)
+
+        # kategori dipersempit ke judul yang muncul di tampilan, agar groupby
+        # subset kecil tidak menelusuri seluruh kosakata judul
+        codes, categories = self._title_codes(col)
+        codes = np.where(known, codes[np.maximum(ids, 0)], -1)
+        used = np.unique(codes[codes >= 0])
+        codes = np.where(codes >= 0, np.searchsorted(used, codes), -1)
+        return pd.Categorical.from_codes(codes, categories=categories[used])
+
+    # ==============================
+    # ACCESSOR (TAMPILAN DATAFRAME)
+    # ==============================
+    def frame(self, mask=None, columns=None):
+        rows = self.rows if mask is None else self.rows[mask]
+        ids = rows["title_id"].to_numpy()
+
+        data = {}
+        for col in (self.columns if columns is None else columns):
+            data[col] = self._title_column(col, ids) if col in self.title_columns else rows[col].array
+        return pd.DataFrame(data, index=rows.index)
+
+    # nilai per judul (urut title_id) → nilai per baris peneliti
+    def per_row(self, per_title, fill=-1):
+        ids = self.rows["title_id"].to_numpy()
+        per_title = np.asarray(per_title)
+        if not len(per_title):
+            return np.full(len(ids), fill)
+        return np.where(ids >= 0, per_title[np.maximum(ids, 0)], fill)
@@ -1,6 +1,31 @@
+import re
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+JK_COL_PATTERN = re.compile(r"^jenis kelamin peneliti (\d+)$")
+
+BASE_COLUMNS = {
+    "judul penelitian": "judul",
+    "bidang": "bidang",
+    "tahun": "tahun",
+    "provinsi": "provinsi",
+}
+
+CATEGORY_COLUMNS = ["bidang", "provinsi", "jenis_kelamin"]
+
+
+def peneliti_slots(columns):
+    slots = []
+    for col in columns:
+        match = JK_COL_PATTERN.match(col)
+        if match:
+            slots.append(int(match.group(1)))
+    return sorted(slots)
+
 
-def explode_peneliti(df):
+def explode_peneliti(df, extra_columns=()):
     # 🔥 NORMALISASI NAMA KOLOM
     df = df.copy()
     df.columns = (
@@ -9,21 +34,61 @@ def explode_peneliti(df):
         .str.strip()
     )
 
-    records = []
+    slots = peneliti_slots(df.columns)
+    n_rows, n_slots = len(df), len(slots)
+
+    if n_rows == 0 or n_slots == 0:
+        return pd.DataFrame(columns=[
+            *BASE_COLUMNS.values(), "jenis_kelamin", "kelas", *extra_columns
+        ])
+
+    # wide → long: matriks (baris × slot) lalu ravel baris-mayor,
+    # urutan hasil sama dengan loop lama (baris dulu, lalu peneliti ke-i)
+    jk = df[[f"jenis kelamin peneliti {i}" for i in slots]].to_numpy(dtype=object)
+    kelas = np.column_stack([
+        pd.to_numeric(df[f"kelas peneliti {i}"], errors="coerce").to_numpy(dtype=float)
+        if f"kelas peneliti {i}" in df.columns
+        else np.full(n_rows, np.nan)
+        for i in slots
+    ])
+
+    jk = jk.ravel()
+    kelas = kelas.ravel()
+    keep = pd.notna(jk)
+    row_idx = np.repeat(np.arange(n_rows), n_slots)[keep]
+
+    out = {
+        new: df[old].to_numpy()[row_idx]
+        for old, new in BASE_COLUMNS.items()
+    }
+    out["jenis_kelamin"] = jk[keep]
+    out["kelas"] = kelas[keep]
+    for col in extra_columns:
+        out[col] = df[col].to_numpy()[row_idx]
+
+    result = pd.DataFrame(out)
+    for col in CATEGORY_COLUMNS:
+        result[col] = result[col].astype("category")
+    # baris tanpa tahun tidak pernah lolos filter maupun tren
+    tahun = pd.to_numeric(result["tahun"], errors="coerce")
+    result = result[tahun.notna().to_numpy()].reset_index(drop=True)
+    result["tahun"] = tahun.dropna().to_numpy().astype("int16")
+    result["kelas"] = result["kelas"].astype("Int8")
+
+    return result
+
 
-    for _, row in df.iterrows():
-        for idx in [1, 2]:
-            jk_col = f"jenis kelamin peneliti {idx}"
-            kelas_col = f"kelas peneliti {idx}"
+def concat_peneliti(frames):
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame(columns=[*BASE_COLUMNS.values(), "jenis_kelamin", "kelas"])
 
-            if jk_col in df.columns and pd.notna(row[jk_col]):
-                records.append({
-                    "judul": row["judul penelitian"],
-                    "bidang": row["bidang"],
-                    "tahun": row["tahun"],
-                    "provinsi": row["provinsi"],
-                    "jenis_kelamin": row[jk_col],
-                    "kelas": row[kelas_col] if kelas_col in df.columns else None
-                })
+    # kategori digabung (union) agar dtype kategorikal tetap terjaga
+    result = pd.concat(frames, ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        result[col] = union_categoricals(
+            [f[col].astype("category") for f in frames],
+            sort_categories=True
+        )
 
-    return pd.DataFrame(records)
+    return result
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+
+
+def normalize_filters(filters):
+    if not filters:
+        return ()
+
+    return tuple(
+        (col, None if values is None else tuple(sorted(set(values), key=str)))
+        for col, values in sorted(filters.items())
+    )
+
+
+# ==============================
+# CACHE HASIL PER STATE FILTER (LRU)
+# ==============================
+# Dipakai bersama lintas sesi (st.cache_resource), jadi nilai yang
+# disimpan harus diperlakukan read-only oleh pemanggil.
+class ResultCache:
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_compute(self, section, filters, compute):
+        key = (section, normalize_filters(filters))
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # dihitung di luar lock agar sesi lain tidak ikut menunggu
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def cached(cache, section, filters, compute):
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(section, filters, compute)
@@ -0,0 +1,226 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.trend_alignment import keyword_vectors
+
+INDEX_VERSION = 1
+COLUMNS = ["judul", "rank", "judul_mirip", "skor"]
+
+
+def rowwise_cosine(X, a, b, chunk=200_000):
+    # baris X sudah dinormalkan l2, jadi cosine = dot product
+    out = np.empty(len(a))
+    for start in range(0, len(a), chunk):
+        stop = start + chunk
+        out[start:stop] = np.asarray(X[a[start:stop]].multiply(X[b[start:stop]]).sum(axis=1)).ravel()
+    return out
+
+
+# top-k per baris hanya atas entri non-nol matriks sparse (tanpa densify),
+# jadi biaya sebanding nnz, bukan baris × kolom. Skor cosine ≤ 1, sehingga
+# satu kunci `baris·4 − skor` sudah mengurutkan per baris lalu skor turun.
+def sparse_top_k(S, k):
+    S = S.tocsr()
+    rows = np.repeat(np.arange(S.shape[0]), np.diff(S.indptr))
+    order = np.argsort(rows * 4.0 - S.data)
+    rank = np.arange(len(order)) - S.indptr[rows[order]]
+    keep = order[rank < k]
+    return rows[keep], S.indices[keep], S.data[keep]
+
+
+# top-k per sumber dari daftar edge (src, dst, skor); hasil urut per src
+def top_edges(src, dst, scores, k):
+    order = np.lexsort((dst, -scores, src))
+    src, dst, scores = src[order], dst[order], scores[order]
+    rank = np.arange(len(src)) - np.searchsorted(src, src)
+    keep = rank < k
+    return src[keep], dst[keep], scores[keep]
+
+
+# ==============================
+# INDEKS JUDUL MIRIP (SPARSE COSINE)
+# ==============================
+# Vektor judul = baris TF-IDF KeywordModel.matrix (l2). Kandidat tetangga
+# dicari lewat inverted index tanpa term sangat umum (df > max_postings),
+# sehingga biaya ∝ Σ min(df, max_postings)², bukan n²; kandidat teratas
+# per judul lalu diurutkan ulang dengan cosine eksak. Hasilnya graf top-k
+# per judul yang disimpan ke disk: judul baru cukup dibandingkan dengan
+# korpus lalu edge-nya digabung, tanpa membangun ulang (skor edge lama
+# tetap memakai idf saat edge itu dihitung).
+class SimilarTitles:
+    def __init__(self, k=10, max_postings=2000, candidates=50, block_rows=2048, path=None):
+        self.k = k
+        self.max_postings = max_postings
+        self.candidates = candidates
+        self.block_rows = block_rows
+        self.path = path
+
+        self.titles = []
+        self.title_rows = {}
+        self.src = np.array([], dtype=np.int32)
+        self.dst = np.array([], dtype=np.int32)
+        self.scores = np.array([], dtype=np.float32)
+        self._vector_cache = None
+
+    @property
+    def params(self):
+        return {"k": self.k, "max_postings": self.max_postings, "candidates": self.candidates}
+
+    @property
+    def n_titles(self):
+        return len(self.titles)
+
+    @classmethod
+    def load(cls, path, **params):
+        index = cls(path=path, **params)
+        try:
+            state = joblib.load(path)
+        except (OSError, EOFError, ValueError, KeyError, AttributeError, ImportError):
+            return index
+
+        if state.get("version") != INDEX_VERSION or state.get("params") != index.params:
+            return index
+
+        index.titles = list(state["titles"])
+        index.title_rows = {t: i for i, t in enumerate(index.titles)}
+        index.src, index.dst, index.scores = state["src"], state["dst"], state["scores"]
+        return index
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        tmp = path + ".tmp"
+        joblib.dump(
+            {
+                "version": INDEX_VERSION,
+                "params": self.params,
+                "titles": self.titles,
+                "src": self.src,
+                "dst": self.dst,
+                "scores": self.scores,
+            },
+            tmp
+        )
+        os.replace(tmp, path)
+
+    # ==============================
+    # VEKTOR & INVERTED INDEX
+    # ==============================
+    # baris = posisi judul di indeks ini; judul yang tidak ada di model
+    # menjadi vektor nol
+    def vectors(self, keyword_model):
+        key = (id(keyword_model), keyword_model.n_docs, self.n_titles)
+        if self._vector_cache is None or self._vector_cache[0] != key:
+            rows = pd.Series(self.titles, dtype=object).map(keyword_model.title_rows)
+            known = rows.notna().to_numpy()
+            X = keyword_model.matrix[rows.fillna(0).to_numpy(dtype=np.int64)]
+            if not known.all():
+                X = sp.diags(known.astype(float)) @ X
+            X = sp.csr_matrix(X)
+            columns = {term: i for i, term in enumerate(keyword_model.terms)}
+            self._vector_cache = key, X, X.T.tocsr(), columns
+        return self._vector_cache[1:]
+
+    def _pruned(self, X):
+        df = np.bincount(X.indices, minlength=X.shape[1])
+        return sp.csr_matrix(X @ sp.diags((df <= self.max_postings).astype(float)))
+
+    # edge kandidat baris `rows` × kolom `cols` (None = semua judul),
+    # skornya cosine eksak atas vektor lengkap
+    def _candidate_edges(self, X, Xc, rows, cols=None):
+        XcT = Xc.T.tocsr() if cols is None else Xc[cols].T.tocsr()
+
+        out_src, out_dst = [], []
+        for start in range(0, len(rows), self.block_rows):
+            block = rows[start:start + self.block_rows]
+            r, c, _ = sparse_top_k(Xc[block] @ XcT, self.candidates + 1)
+            src = block[r]
+            dst = c if cols is None else cols[c]
+            out_src.append(src[src != dst])
+            out_dst.append(dst[src != dst])
+
+        src = np.concatenate(out_src).astype(np.int64) if out_src else np.array([], dtype=np.int64)
+        dst = np.concatenate(out_dst).astype(np.int64) if out_dst else np.array([], dtype=np.int64)
+        return src, dst, rowwise_cosine(X, src, dst)
+
+    def update(self, keyword_model):
+        new_titles = [t for t in keyword_model.titles if t not in self.title_rows]
+        if not new_titles:
+            return 0
+
+        n_old = self.n_titles
+        for title in new_titles:
+            self.title_rows[title] = len(self.titles)
+            self.titles.append(title)
+        n = self.n_titles
+
+        X, _, _ = self.vectors(keyword_model)
+        Xc = self._pruned(X)
+        new = np.arange(n_old, n)
+
+        # judul baru × semua judul, dan judul lama × judul baru
+        edges = [self._candidate_edges(X, Xc, new)]
+        if n_old:
+            edges.append(self._candidate_edges(X, Xc, np.arange(n_old), new))
+
+        src = np.concatenate([self.src.astype(np.int64)] + [e[0] for e in edges] + [e[1] for e in edges])
+        dst = np.concatenate([self.dst.astype(np.int64)] + [e[1] for e in edges] + [e[0] for e in edges])
+        scores = np.concatenate([self.scores.astype(np.float64)] + [e[2] for e in edges] * 2)
+
+        _, first = np.unique(src * n + dst, return_index=True)
+        src, dst, scores = src[first], dst[first], scores[first]
+        keep = scores > 0
+        src, dst, scores = top_edges(src[keep], dst[keep], scores[keep], self.k)
+
+        self.src, self.dst, self.scores = src.astype(np.int32), dst.astype(np.int32), scores.astype(np.float32)
+        self.save()
+        return len(new_titles)
+
+    # ==============================
+    # QUERY
+    # ==============================
+    # judul korpus dibaca langsung dari graf; teks lain dicocokkan lewat
+    # inverted index lengkap (hanya judul yang berbagi term disentuh)
+    def neighbours(self, titles, k=5):
+        positions = np.array([self.title_rows[t] for t in titles if t in self.title_rows], dtype=np.int64)
+        lo = np.searchsorted(self.src, positions, side="left")
+        counts = np.minimum(np.searchsorted(self.src, positions, side="right") - lo, k)
+
+        rank = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        idx = np.repeat(lo, counts) + rank
+        return pd.DataFrame({
+            "judul": [self.titles[i] for i in self.src[idx]],
+            "rank": rank + 1,
+            "judul_mirip": [self.titles[i] for i in self.dst[idx]],
+            "skor": self.scores[idx].astype(np.float64),
+        })
+
+    def query(self, keyword_model, texts, k=5):
+        texts = list(dict.fromkeys(texts))
+        other = [t for t in texts if t not in self.title_rows]
+
+        frames = [self.neighbours(texts, k)]
+        if other:
+            _, XT, columns = self.vectors(keyword_model)
+            r, c, s = sparse_top_k(keyword_vectors(keyword_model, other, columns) @ XT, k)
+            frames.append(pd.DataFrame({
+                "judul": np.asarray(other, dtype=object)[r],
+                "rank": np.arange(len(r)) - np.searchsorted(r, r) + 1,
+                "judul_mirip": [self.titles[i] for i in c],
+                "skor": s,
+            }))
+
+        table = pd.concat(frames, ignore_index=True)
+        position = table["judul"].map({t: i for i, t in enumerate(texts)})
+        return table.iloc[np.lexsort((table["rank"], position))].reset_index(drop=True)
+
+    # laporan top-k semua judul (k ≤ self.k) langsung dari graf
+    def all_pairs(self, k=5):
+        return self.neighbours(self.titles, k)
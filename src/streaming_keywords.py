@@ -0,0 +1,252 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.utils import murmurhash3_32
+
+from src.keyword_extraction import STOPWORDS_ID, top_k
+
+
+# hash fitur yang sama dengan HashingVectorizer (murmurhash3 32-bit)
+def feature_hashes(terms):
+    return np.fromiter(
+        (murmurhash3_32(t, seed=0, positive=True) for t in terms),
+        dtype=np.uint64,
+        count=len(terms)
+    )
+
+
+# ==============================
+# COUNT-MIN SKETCH
+# ==============================
+# Tabel depth × width; estimasi = minimum dari depth bucket (tidak pernah
+# di bawah nilai asli). Dua sketch dengan ukuran & seed sama digabung
+# dengan menjumlahkan tabel.
+class CountMinSketch:
+    def __init__(self, width=2**16, depth=4, seed=0):
+        if width & (width - 1):
+            raise ValueError("width harus pangkat 2")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.shift = np.uint64(64 - int(width).bit_length() + 1)
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2**63, depth, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2**63, depth, dtype=np.uint64)
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _buckets(self, hashes):
+        # multiply-shift per baris tabel
+        return ((hashes[None, :] * self.a[:, None] + self.b[:, None]) >> self.shift).astype(np.int64)
+
+    def add(self, hashes, counts):
+        buckets = self._buckets(hashes)
+        for row in range(self.depth):
+            np.add.at(self.table[row], buckets[row], counts)
+
+    def estimate(self, hashes):
+        buckets = self._buckets(hashes)
+        return np.take_along_axis(self.table, buckets, axis=1).min(axis=0)
+
+    def merge(self, other):
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("sketch count-min beda ukuran/seed tidak bisa digabung")
+        self.table += other.table
+        return self
+
+
+# ==============================
+# SPACE-SAVING (MERGEABLE)
+# ==============================
+# Maksimal `capacity` term dipantau beserta batas atas bobotnya dan error
+# maksimalnya. Update per batch = merge dengan ringkasan eksak batch;
+# term yang tidak ada di salah satu ringkasan penuh dianggap berbobot
+# minimum ringkasan itu (Agarwal dkk., "Mergeable Summaries").
+class SpaceSaving:
+    def __init__(self, capacity=2000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.float64)
+        self.errors = pd.Series(dtype=np.float64)
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def floor(self):
+        return self.counts.min() if len(self.counts) >= self.capacity else 0.0
+
+    def merge(self, other):
+        index = self.counts.index.union(other.counts.index)
+        floor, other_floor = self.floor, other.floor
+
+        counts = (
+            self.counts.reindex(index, fill_value=floor)
+            + other.counts.reindex(index, fill_value=other_floor)
+        )
+        errors = (
+            self.errors.reindex(index, fill_value=floor)
+            + other.errors.reindex(index, fill_value=other_floor)
+        )
+
+        if len(counts) > self.capacity:
+            keep = np.argsort(-counts.to_numpy(), kind="stable")[:self.capacity]
+            counts, errors = counts.iloc[keep], errors.iloc[keep]
+
+        self.counts, self.errors = counts, errors
+        return self
+
+    def update(self, weights):
+        # ringkasan batch dipangkas ke kapasitas yang sama; term yang
+        # terbuang berbobot ≤ minimum sisa, jadi floor tetap batas atas
+        weights = weights.astype(np.float64)
+        if len(weights) > self.capacity:
+            keep = np.argsort(-weights.to_numpy(), kind="stable")[:self.capacity]
+            weights = weights.iloc[keep]
+
+        batch = SpaceSaving(capacity=self.capacity)
+        batch.counts = weights
+        batch.errors = pd.Series(0.0, index=weights.index)
+        return self.merge(batch)
+
+
+# ==============================
+# KEYWORD STREAMING (MEMORI KONSTAN)
+# ==============================
+# Satu kali jalan atas generator judul, per batch:
+#   - document frequency di Count-Min (kunci: hash fitur term)
+#   - bobot term = tf / ‖tf·idf judul‖ (idf perkiraan saat itu) dijumlahkan
+#     di Space-Saving → kandidat top-k beserta namanya
+# Saat top_keywords(), bobot dikali idf dari estimasi df akhir sehingga
+# skor ≈ jumlah TF-IDF KeywordModel tanpa menyimpan kosakata penuh.
+# Sketch per partisi (tahun/provinsi) bisa dibangun paralel lalu di-merge.
+class StreamingKeywords:
+    def __init__(
+        self,
+        capacity=2000,
+        width=2**16,
+        depth=4,
+        seed=0,
+        stop_words=STOPWORDS_ID,
+        ngram_range=(1, 2),
+        min_df=2,
+        max_df=0.85,
+        normalizer=None
+    ):
+        self.min_df = min_df
+        self.max_df = max_df
+        self.analyzer = CountVectorizer(
+            stop_words=stop_words,
+            ngram_range=ngram_range,
+            preprocessor=normalizer
+        ).build_analyzer()
+        self.weights = SpaceSaving(capacity)
+        self.doc_freq = CountMinSketch(width, depth, seed)
+        self.n_docs = 0
+
+    @property
+    def nbytes(self):
+        return (
+            self.doc_freq.table.nbytes
+            + self.weights.counts.memory_usage(deep=True)
+            + self.weights.errors.memory_usage(index=False)
+        )
+
+    def update(self, titles):
+        titles = [t for t in titles if isinstance(t, str)]
+        if not titles:
+            return self
+
+        terms = [self.analyzer(t) for t in titles]
+        lengths = np.fromiter(map(len, terms), dtype=np.int64, count=len(terms))
+        doc_ids = np.repeat(np.arange(len(titles)), lengths)
+        codes, uniques = pd.factorize(np.fromiter(
+            (term for doc in terms for term in doc), dtype=object, count=int(lengths.sum())
+        ))
+        self.n_docs += len(titles)
+        if not len(uniques):
+            return self
+
+        pair, tf = np.unique(doc_ids * len(uniques) + codes, return_counts=True)
+        pair_doc, pair_term = np.divmod(pair, len(uniques))
+        hashes = feature_hashes(uniques)
+        self.doc_freq.add(hashes, np.bincount(pair_term, minlength=len(uniques)))
+
+        # norma l2 judul memakai idf perkiraan saat ini (df dari sketch,
+        # termasuk batch ini); seperti KeywordModel, term yang sejauh ini
+        # < min_df tidak ikut norma. Bobot tf / norma dijumlahkan per term.
+        df = self.doc_freq.estimate(hashes)
+        idf = np.log((1 + self.n_docs) / (1 + df)) + 1
+        counted = df[pair_term] >= self.min_df
+        norms = np.sqrt(np.bincount(
+            pair_doc, weights=np.where(counted, tf * idf[pair_term], 0.0) ** 2
+        ))
+        norms[norms == 0] = 1
+        weights = np.bincount(pair_term, weights=tf / norms[pair_doc], minlength=len(uniques))
+
+        self.weights.update(pd.Series(weights, index=pd.Index(uniques, dtype=object)))
+        return self
+
+    def consume(self, titles, batch_size=5_000):
+        titles = iter(titles)
+        while True:
+            batch = list(islice(titles, batch_size))
+            if not batch:
+                return self
+            self.update(batch)
+
+    def merge(self, other):
+        self.weights.merge(other.weights)
+        self.doc_freq.merge(other.doc_freq)
+        self.n_docs += other.n_docs
+        return self
+
+    def top_keywords(self, top_n=10):
+        min_df, max_df = self.min_df, self.max_df
+        terms = self.weights.counts.index.to_numpy(dtype=object)
+        if not len(terms):
+            return []
+
+        df = self.doc_freq.estimate(feature_hashes(terms))
+        max_doc = max_df if isinstance(max_df, int) else max_df * self.n_docs
+        min_doc = min_df if isinstance(min_df, int) else min_df * self.n_docs
+        keep = (df >= min_doc) & (df <= max_doc)
+
+        # bobot terjamin (count − error): bagian error hanya isian floor
+        # saat merge, jadi tidak ikut menaikkan peringkat term
+        idf = np.log((1 + self.n_docs) / (1 + df[keep])) + 1
+        guaranteed = (self.weights.counts - self.weights.errors).to_numpy()
+        scores = guaranteed[keep] * idf
+
+        # urutan alfabetis untuk pemecah seri, sama dengan KeywordModel
+        order = np.argsort(terms[keep].astype(str), kind="stable")
+        return top_k(terms[keep][order], scores[order], top_n)
+
+
+def sketch_partitions(partitions, max_workers=4, batch_size=5_000, **sketch_kwargs):
+    # partitions: {nama: iterable judul}; tiap partisi satu sketch
+    def build(titles):
+        return StreamingKeywords(**sketch_kwargs).consume(titles, batch_size)
+
+    names = list(partitions)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sketches = list(pool.map(build, (partitions[n] for n in names)))
+    return dict(zip(names, sketches))
+
+
+def merge_sketches(sketches):
+    sketches = list(sketches)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    return merged
+
+
+# proporsi top-k eksak yang ikut muncul di top-k perkiraan
+def topk_recall(approx, exact):
+    exact_terms = {term for term, _ in exact}
+    if not exact_terms:
+        return 1.0
+    return len(exact_terms & {term for term, _ in approx}) / len(exact_terms)
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import explode_peneliti
+
+# ==============================
+# DATA SINTETIS BERBENTUK LPB
+# ==============================
+# Dipakai untuk benchmark: bentuk kolom sama dengan sheet "GABUNGAN"
+# setelah load_data (nama kolom huruf kecil), ukuran bisa diatur.
+
+PROVINSI = [
+    "ACEH", "SUMUT", "SUMBAR", "RIAU", "KEPRI", "JAMBI", "SUMSEL", "BABEL",
+    "BENGKULU", "LAMPUNG", "DKI", "JABAR", "BANTEN", "JATENG", "DIY", "JATIM",
+    "BALI", "NTB", "NTT", "KALBAR", "KALTENG", "KALSEL", "KALTIM", "KALTARA",
+    "SULUT", "GORONTALO", "SULTENG", "SULBAR", "SULSEL", "SULTRA", "MALUKU",
+    "MALUT", "PAPUA", "PAPUA BARAT", "PAPUA TENGAH", "PAPUA PEGUNUNGAN",
+    "PAPUA SELATAN", "PAPUA BARAT DAYA",
+]
+
+BIDANG = [
+    "Ekonomi", "Matematika", "Fisika", "Komputer", "Ilmu Hayati",
+    "Sosiologi", "Sejarah", "Psikologi", "Lingkungan", "Geografi",
+]
+
+JENIS_KELAMIN = ["Laki-laki", "Perempuan"]
+
+KATA_KERJA = [
+    "pemanfaatan", "pengembangan", "peningkatan", "pengolahan", "penerapan",
+    "efektivitas", "identifikasi", "optimalisasi", "inovasi", "rancang bangun",
+    "strategi", "upaya", "pembuatan", "evaluasi", "uji", "perancangan",
+]
+
+OBJEK = [
+    "limbah", "sampah plastik", "daun", "kulit pisang", "minyak jelantah",
+    "aplikasi", "media pembelajaran", "umkm", "pangan lokal", "air hujan",
+    "energi surya", "bioplastik", "pupuk organik", "tanaman obat", "kompos",
+    "budaya lokal", "bahasa daerah", "kesehatan mental", "literasi digital",
+    "sensor", "mikrokontroler", "ekowisata", "batik", "tenun", "mangrove",
+    "ikan", "rumput laut", "singkong", "jagung", "kopi", "kakao", "bambu",
+]
+
+SASARAN = [
+    "siswa", "remaja", "masyarakat", "petani", "nelayan", "pelajar sma",
+    "pelajar smp", "generasi z", "ibu rumah tangga", "pedagang", "guru",
+    "anak usia dini", "lansia", "wisatawan", "pengusaha lokal",
+]
+
+KONTEKS = [
+    "di era digital", "pasca pandemi covid 19", "di daerah pesisir",
+    "di sekolah", "di desa", "di perkotaan", "berbasis kearifan lokal",
+    "secara berkelanjutan", "dalam menghadapi perubahan iklim",
+    "untuk ketahanan pangan", "sebagai alternatif ramah lingkungan",
+]
+
+PENGHUBUNG = ["untuk", "bagi", "dalam", "pada", "terhadap", "melalui"]
+
+WILAYAH = ["desa", "kecamatan", "kabupaten", "kota", "kampung", "pantai"]
+
+SUKU_KATA = [
+    "ka", "ra", "ma", "su", "ta", "ngi", "lo", "wa", "ba", "ja", "ri", "sa",
+    "mo", "de", "ku", "pa", "la", "na", "go", "tu", "bu", "si", "ha", "we",
+]
+
+
+def _zipf_choice(rng, options, size, a=1.3):
+    weights = 1 / np.arange(1, len(options) + 1) ** a
+    weights = weights / weights.sum()
+    return np.asarray(options, dtype=object)[rng.choice(len(options), size=size, p=weights)]
+
+
+def make_titles(n_titles, seed=0):
+    rng = np.random.default_rng(seed)
+
+    parts = pd.DataFrame({
+        "kerja": _zipf_choice(rng, KATA_KERJA, n_titles),
+        "objek": _zipf_choice(rng, OBJEK, n_titles),
+        "hubung": rng.choice(PENGHUBUNG, size=n_titles),
+        "sasaran": _zipf_choice(rng, SASARAN, n_titles),
+        "konteks": _zipf_choice(rng, KONTEKS, n_titles),
+    })
+
+    titles = parts["kerja"].str.cat(
+        [parts["objek"], parts["hubung"], parts["sasaran"], parts["konteks"]],
+        sep=" "
+    )
+
+    # nama tempat dari suku kata acak agar judul jarang bentrok
+    # pada ukuran besar dan kosakata tumbuh seperti data asli
+    syllables = np.asarray(SUKU_KATA, dtype=object)
+    tempat = pd.Series(rng.choice(np.asarray(WILAYAH, dtype=object), size=n_titles))
+    nama = pd.Series(syllables[rng.integers(0, len(syllables), size=n_titles)])
+    for _ in range(2):
+        nama = nama + syllables[rng.integers(0, len(syllables), size=n_titles)]
+
+    titles = titles.str.cat([tempat, nama], sep=" ")
+
+    # sebagian judul ditulis kapital penuh seperti data asli
+    upper = rng.random(n_titles) < 0.4
+    titles[upper] = titles[upper].str.upper()
+
+    return titles
+
+
+def make_raw_frame(
+    n_titles,
+    years=tuple(range(2015, 2031)),
+    n_slots=2,
+    seed=0
+):
+    rng = np.random.default_rng(seed)
+
+    tahun = rng.choice(np.asarray(years), size=n_titles)
+    provinsi = _zipf_choice(rng, PROVINSI, n_titles, a=0.6)
+    bidang = rng.choice(np.asarray(BIDANG, dtype=object), size=n_titles)
+    jumlah = rng.integers(1, n_slots + 1, size=n_titles)
+    kelas_awal = rng.integers(7, 13, size=n_titles)
+
+    df = pd.DataFrame({
+        "tahun": tahun,
+        "provinsi": provinsi,
+        "nama lpb": "LPB " + pd.Series(provinsi).astype(str) + " " + pd.Series(tahun).astype(str),
+        "bidang": bidang,
+        "judul penelitian": make_titles(n_titles, seed=seed + 1),
+        "penjelasan singkat": "Penelitian ini bertujuan untuk mengetahui manfaat inovasi.",
+        "jumlah peneliti": jumlah,
+    })
+
+    for i in range(1, n_slots + 1):
+        present = jumlah >= i
+        jk = rng.choice(np.asarray(JENIS_KELAMIN, dtype=object), size=n_titles)
+        kelas = np.clip(kelas_awal + rng.integers(-1, 2, size=n_titles), 7, 12).astype(float)
+
+        df[f"jenis kelamin peneliti {i}"] = np.where(present, jk, None)
+        df[f"kelas peneliti {i}"] = np.where(present, kelas, np.nan)
+
+    df["jenjang pendidikan"] = np.where(kelas_awal >= 10, "SMA", "SMP")
+
+    return df
+
+
+def make_peneliti_frame(n_rows, seed=0, **kwargs):
+    n_slots = kwargs.get("n_slots", 2)
+    # rata-rata (1 + n_slots) / 2 peneliti per judul, beri sedikit lebih
+    n_titles = int(np.ceil(n_rows / ((1 + n_slots) / 2) * 1.05)) + 16
+    df = explode_peneliti(make_raw_frame(n_titles, seed=seed, **kwargs))
+
+    return df.iloc[:n_rows].reset_index(drop=True)
+
+
+# ==============================
+# TULIS WORKBOOK
+# ==============================
+EXCEL_MAX_ROWS = 1_048_575
+
+
+def write_workbook(df, path, sheet_name="GABUNGAN", per_year_sheets=False):
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel maksimal {EXCEL_MAX_ROWS} baris data, diminta {len(df)}")
+
+    out = df.rename(columns=lambda c: c.title())
+
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        out.to_excel(writer, sheet_name=sheet_name, index=False)
+
+        if per_year_sheets:
+            for year, df_year in out.groupby("Tahun"):
+                df_year.to_excel(writer, sheet_name=str(year), index=False)
+
+    return path
@@ -0,0 +1,312 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.keyword_extraction import STOPWORDS_ID
+from src.title_matcher import token_stream
+
+NORMALIZER_VERSION = 2
+
+# kata fungsi/umum tambahan (bentuk asli, dicek sebelum stemming)
+STOPWORDS_EXTRA = [
+    "atau", "serta", "bagi", "akan", "ini", "itu", "tersebut", "adalah",
+    "para", "secara", "antara", "upaya", "sebuah", "suatu", "tentang",
+    "agar", "dapat", "bagaimana", "apakah", "kepada", "hingga", "sampai",
+    "setelah", "sebelum", "saat", "juga", "ada", "tidak", "belum", "sudah",
+    "masih", "lebih", "sangat", "karena", "jika", "maka", "yaitu", "seperti",
+    "kajian", "tinjauan", "sebagai", "dengan", "nya", "se",
+    "a", "an", "and", "in", "on", "for", "to", "with", "at", "by", "from",
+    "as", "is", "are", "its", "their", "into", "using", "based", "study",
+    "analysis", "effect", "impact",
+]
+STOPWORDS = frozenset(STOPWORDS_ID) | frozenset(STOPWORDS_EXTRA)
+
+# singkatan & salah ketik yang sering muncul di judul
+SLANG_MAP = {
+    "yg": "yang", "dgn": "dengan", "dg": "dengan", "utk": "untuk",
+    "dlm": "dalam", "pd": "pada", "thd": "terhadap", "tdk": "tidak",
+    "krn": "karena", "karna": "karena", "sbg": "sebagai", "tsb": "tersebut",
+    "kab": "kabupaten", "kec": "kecamatan", "kel": "kelurahan",
+    "prov": "provinsi", "propinsi": "provinsi", "covid19": "covid 19",
+    "analisa": "analisis", "sistim": "sistem", "praktek": "praktik",
+    "resiko": "risiko", "kwalitas": "kualitas", "aktifitas": "aktivitas",
+    "efektifitas": "efektivitas", "kreatifitas": "kreativitas",
+    "produktifitas": "produktivitas", "obyek": "objek", "ijin": "izin",
+    "jaman": "zaman", "tehnologi": "teknologi", "tekhnologi": "teknologi",
+    "menejemen": "manajemen", "managemen": "manajemen", "manajement": "manajemen",
+}
+
+# ==============================
+# STEMMING BAHASA INDONESIA (TANPA KAMUS)
+# ==============================
+# Versi ringkas confix stripping (Nazief–Adriani): akhiran -nya, akhiran
+# turunan (-kan/-i/-an untuk awalan kerja me-/di-/ber-/ter-, hanya -an
+# untuk awalan benda pe-/ke-), lalu maksimal dua awalan dengan perubahan
+# bunyi nasal (meny→s, meng→∅, mem→∅/m, men→∅/t). Tanpa kamus kata dasar,
+# pilihan bentuk dasar yang ambigu dibuat konsisten (memanfaatkan dan
+# pemanfaatan → "manfaat"), dan setiap langkah dibatalkan jika sisa
+# kata < MIN_STEM huruf. Kata dasar yang tampak berimbuhan (perilaku,
+# pemerintah) ada di PROTECTED, juga bila tersisa setelah akhiran dilepas
+# (pemerintahan → "pemerintah"); hasil peluluhan yang keliru dipetakan
+# ke kata dasarnya di SPECIAL_STEMS (pengetahuan → "etahu" → "tahu",
+# pemahaman → "maham" → "paham", perikanan → "rikan" → "ikan",
+# menyanyi → "sanyi" → "nyanyi").
+MIN_STEM = 4
+VOWELS = frozenset("aeiou")
+
+SPECIAL_STEMS = {
+    "belajar": "ajar", "pelajar": "ajar", "bekerja": "kerja",
+    "pekerja": "kerja", "perusaha": "usaha", "perusahaan": "usaha",
+    "meneliti": "teliti", "diteliti": "teliti", "peneliti": "teliti",
+    # meng-/peng- + vokal: kata dasar berawalan k yang luluh
+    "embang": "kembang", "enal": "kenal", "elola": "kelola",
+    "elompok": "kelompok", "erja": "kerja", "ering": "kering",
+    "eluar": "keluar", "endali": "kendali", "enai": "kena",
+    "urang": "kurang", "unjung": "kunjung", "andung": "kandung",
+    "ontrol": "kontrol", "etahu": "tahu", "etahui": "tahu",
+    "diketahui": "tahu",
+    # mem-/pem- + vokal: kata dasar berawalan p yang luluh
+    "maham": "paham", "masar": "pasar", "milih": "pilih", "makai": "pakai",
+    "mulih": "pulih", "mikir": "pikir", "menuh": "penuh", "micu": "picu",
+    "mantau": "pantau", "mutih": "putih",
+    # meny-/peny- + vokal: kata dasar berawalan ny
+    "sanyi": "nyanyi",
+    # per-/ber- + vokal: kata dasar berawalan vokal, bukan r
+    "rikan": "ikan", "rair": "air", "rekonomi": "ekonomi", "ralat": "alat",
+    "ringat": "ingat", "rangkat": "angkat", "radab": "adab", "ragama": "agama",
+    "rasal": "asal", "raroma": "aroma", "rasrama": "asrama",
+    "rinteraksi": "interaksi", "ratur": "atur",
+}
+
+PROTECTED = frozenset([
+    "perempuan", "berita", "terapi", "terumbu", "teras", "terminal",
+    "pesisir", "penduduk", "pertama", "persepsi", "persen", "permen",
+    "pendek", "penting", "perlu", "periode", "persis", "personal",
+    "mental", "media", "medis", "metode", "menteri", "menara", "merah",
+    "meja", "digital", "dinas", "disiplin", "diri", "diskusi", "keluarga",
+    "kelompok", "kelola", "kelas", "kerja", "kebun", "kecil", "kedelai",
+    "berat", "beras", "bersih", "beragam", "peta", "pena",
+    "pemilu", "penyu", "perahu", "pelangi",
+    "perilaku", "peristiwa", "perintah", "pemerintah", "peran", "perang",
+    "peserta", "perspektif", "pesantren", "pestisida", "pengaruh",
+    "performa", "percaya", "persentase", "pesawat", "pesona", "peduli",
+    "merdeka", "mertua", "mereka", "mentimun", "kendara", "dinasti",
+])
+
+
+def _strip_nasal(word, start):
+    # awalan me-/pe- beserta perubahan bunyinya
+    base = word[2:]
+    if base.startswith("ny") and base[2:3] in VOWELS:
+        return "s" + base[2:]
+    if base.startswith("ng"):
+        rest = base[2:]
+        return rest if rest[:1] in VOWELS or rest[:1] in ("g", "h", "k") else None
+    if base.startswith("m"):
+        rest = base[1:]
+        if rest[:1] in ("b", "p", "f", "v"):
+            return rest
+        return "m" + rest if rest[:1] in VOWELS else None
+    if base.startswith("n"):
+        rest = base[1:]
+        if rest[:1] in ("c", "d", "j", "s", "z", "t"):
+            return rest
+        return "t" + rest if rest[:1] in VOWELS else None
+    if start == "pe" and base.startswith("r"):
+        rest = base[1:]
+        return "r" + rest if rest[:1] in VOWELS else rest
+    if base[:1] in ("l", "r", "w", "y") or (start == "pe" and base[:1] in ("t", "k", "d", "s", "j", "c")):
+        return base
+    return None
+
+
+def _strip_prefix(word, previous, had_an, had_suffix):
+    first = previous is None
+    if first and word[:2] in ("me", "pe"):
+        return _strip_nasal(word, word[:2])
+    if first and word.startswith("di") and had_suffix:
+        return word[2:]
+    # ke- hanya sebagai konfiks ke-an, atau setelah ber- (berkelanjutan)
+    if word.startswith("ke") and had_an and previous in (None, "ber"):
+        return word[2:]
+    if word.startswith(("ber", "per", "ter")):
+        rest = word[3:]
+        if rest[:1] in VOWELS:
+            return None if word.startswith("ter") else "r" + rest
+        return rest
+    return None
+
+
+@lru_cache(maxsize=200_000)
+def stem_word(word):
+    if len(word) <= MIN_STEM or word in PROTECTED or not word.isalpha():
+        return word
+    if word in SPECIAL_STEMS:
+        return SPECIAL_STEMS[word]
+
+    w = word
+    if w.endswith("nya") and len(w) - 3 >= MIN_STEM:
+        w = w[:-3]
+        if w in PROTECTED:
+            return w
+
+    if w.startswith(("me", "di", "ber", "ter")):
+        suffixes = ("kan", "i", "an")
+    elif w.startswith(("pe", "ke")):
+        suffixes = ("an",)
+    else:
+        return w
+
+    for suffix in suffixes:
+        if not w.endswith(suffix) or len(w) - len(suffix) <= MIN_STEM:
+            continue
+        if suffix == "i" and (w[-2] in VOWELS or w[-2] in ("s", "y")):
+            continue
+        stem, n_prefixes = _strip_prefixes(w[:-len(suffix)], suffix == "an", True)
+        if n_prefixes:
+            return stem
+        break
+
+    # tanpa awalan yang bisa dilepas, akhiran tadi dianggap bagian kata dasar
+    return _strip_prefixes(w, False, False)[0]
+
+
+def _strip_prefixes(w, had_an, had_suffix):
+    previous, n_prefixes = None, 0
+    for _ in range(2):
+        if w in SPECIAL_STEMS:
+            return SPECIAL_STEMS[w], n_prefixes + 1
+        if w in PROTECTED:
+            return w, n_prefixes + 1
+        stripped = _strip_prefix(w, previous, had_an, had_suffix)
+        if stripped is None or len(stripped) < MIN_STEM:
+            break
+        previous = w[:3] if w.startswith(("ber", "per", "ter")) else w[:2]
+        w, n_prefixes = stripped, n_prefixes + 1
+
+    return SPECIAL_STEMS.get(w, w), n_prefixes
+
+
+# satu token mentah → token ternormalisasi ("" jika stopword); dipanggil
+# sekali per token unik, bukan per kemunculan
+@lru_cache(maxsize=200_000)
+def normalize_token(token):
+    token = SLANG_MAP.get(token, token)
+    return " ".join(
+        stem_word(part)
+        for part in token.split()
+        if part not in STOPWORDS
+    )
+
+
+# surfaces (opsional): dict {(stem, bentuk asli): jumlah} yang ditambah
+# dengan kemunculan token satu kata di teks ini
+def normalize_texts(texts, surfaces=None):
+    texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+    doc_ids, tokens = token_stream(texts)
+
+    codes, uniques = pd.factorize(tokens)
+    normalized = np.array([normalize_token(t) for t in uniques], dtype=object)
+    if surfaces is not None:
+        counts = np.bincount(codes, minlength=len(uniques))
+        for token, stem, n in zip(uniques, normalized, counts):
+            if stem and " " not in stem:
+                surfaces[stem, token] = surfaces.get((stem, token), 0) + int(n)
+    normalized = normalized[codes] if len(codes) else np.array([], dtype=object)
+
+    keep = normalized != ""
+    joined = (
+        pd.Series(normalized[keep], dtype=object)
+        .groupby(doc_ids[keep])
+        .agg(" ".join)
+    )
+    return joined.reindex(range(len(texts)), fill_value="").tolist()
+
+
+# ==============================
+# NORMALISASI JUDUL (TERCACHE)
+# ==============================
+# Dipasang sebagai preprocessor CountVectorizer. Judul korpus dinormalisasi
+# per batch (prime) dan hasilnya disimpan sebagai parquet di samping
+# dataset, sehingga setelah restart hanya judul baru yang diproses; teks
+# lain (mis. query pencarian) dinormalisasi langsung tanpa disimpan.
+# Jumlah bentuk asli per stem ikut disimpan, agar grafik bisa menampilkan
+# kata yang paling sering dipakai di judul ("pembelajaran", bukan "ajar").
+class TextNormalizer:
+    def __init__(self, path=None):
+        self.path = path
+        self.texts = {}
+        self.surfaces = {}
+        self._display = None
+
+        if path is not None:
+            try:
+                cached = pd.read_parquet(path)
+                forms = pd.read_parquet(self.surfaces_path)
+                self.texts = dict(zip(cached["judul"], cached["teks"]))
+                self.surfaces = dict(zip(zip(forms["stem"], forms["bentuk"]), forms["jumlah"]))
+            except (OSError, ValueError, KeyError):
+                pass
+
+    @property
+    def surfaces_path(self):
+        return os.path.splitext(self.path)[0] + "_bentuk.parquet"
+
+    def prime(self, titles):
+        new_titles = [
+            t for t in pd.unique(pd.Series(titles, dtype=object).dropna())
+            if isinstance(t, str) and t not in self.texts
+        ]
+        if not new_titles:
+            return 0
+
+        # copy-on-write: snapshot engine lama masih membaca dict lama
+        surfaces = dict(self.surfaces)
+        texts = dict(self.texts)
+        texts.update(zip(new_titles, normalize_texts(new_titles, surfaces)))
+        self.texts, self.surfaces = texts, surfaces
+        self.save()
+        return len(new_titles)
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        tmp = self.path + ".tmp"
+        pd.DataFrame({
+            "judul": list(self.texts.keys()),
+            "teks": list(self.texts.values()),
+        }).to_parquet(tmp, index=False)
+        os.replace(tmp, self.path)
+
+        tmp = self.surfaces_path + ".tmp"
+        pd.DataFrame({
+            "stem": [stem for stem, _ in self.surfaces],
+            "bentuk": [form for _, form in self.surfaces],
+            "jumlah": list(self.surfaces.values()),
+        }).to_parquet(tmp, index=False)
+        os.replace(tmp, self.surfaces_path)
+
+    # term ternormalisasi (uni/bigram) → bentuk asli tersering per kata;
+    # seri dipecah alfabetis, kata tanpa catatan ditampilkan apa adanya
+    # peta dibangun ulang bila dict surfaces sudah diganti prime()
+    def display(self, term):
+        surfaces = self.surfaces
+        if self._display is None or self._display[0] is not surfaces:
+            forms = pd.DataFrame(
+                [(stem, form, n) for (stem, form), n in surfaces.items()],
+                columns=["stem", "bentuk", "jumlah"]
+            )
+            forms = forms.sort_values(["jumlah", "bentuk"], ascending=[False, True], kind="stable")
+            self._display = surfaces, dict(forms.drop_duplicates("stem")[["stem", "bentuk"]].itertuples(index=False))
+        mapping = self._display[1]
+        return " ".join(mapping.get(word, word) for word in term.split())
+
+    def __call__(self, text):
+        cached = self.texts.get(text)
+        if cached is not None:
+            return cached
+        return normalize_texts([text])[0]
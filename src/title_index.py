@@ -0,0 +1,188 @@
+import re
+
+import numpy as np
+
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+# ==============================
+# VARINT (LEB128) TERVEKTORISASI
+# ==============================
+# 7 bit per byte, bit tertinggi = masih ada byte lanjutan.
+def varint_lengths(values):
+    values = np.asarray(values, dtype=np.uint64)
+    n_bytes = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        n_bytes += rest > 0
+        rest >>= np.uint64(7)
+    return n_bytes
+
+
+def varint_encode(values, chunk=2_000_000):
+    parts = []
+    for start in range(0, len(values), chunk):
+        v = np.asarray(values[start:start + chunk], dtype=np.uint64)
+        n_bytes = varint_lengths(v)
+
+        k = np.arange(int(n_bytes.max(initial=1)), dtype=np.uint64)
+        groups = (v[:, None] >> (k * np.uint64(7))) & np.uint64(0x7F)
+        groups |= (k[None, :] < (n_bytes[:, None] - 1).astype(np.uint64)) * np.uint64(0x80)
+        parts.append(groups[k[None, :] < n_bytes[:, None].astype(np.uint64)].astype(np.uint8))
+
+    return np.concatenate(parts) if parts else np.array([], dtype=np.uint8)
+
+
+def varint_decode(buf):
+    if not len(buf):
+        return np.array([], dtype=np.int64)
+
+    b = buf.astype(np.uint64)
+    ends = np.flatnonzero((b & np.uint64(0x80)) == 0)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    group = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shift = ((np.arange(len(b)) - starts[group]) * 7).astype(np.uint64)
+
+    return np.add.reduceat((b & np.uint64(0x7F)) << shift, starts).astype(np.int64)
+
+
+def parse_query(query):
+    # spasi = AND, kata OR memisahkan klausa, "..." = frasa
+    clauses = [[]]
+    for match in QUERY_PATTERN.finditer(query or ""):
+        phrase, word = match.groups()
+        if word == "OR":
+            clauses.append([])
+        else:
+            clauses[-1].append(phrase if phrase is not None else word)
+    return [c for c in clauses if c]
+
+
+# ==============================
+# INDEKS TERBALIK JUDUL
+# ==============================
+# Dibangun dari matriks hitungan KeywordModel (analyzer & STOPWORDS_ID
+# yang sama, unigram + bigram), jadi judul tidak ditokenisasi ulang.
+# Posting list tiap term = id judul terurut, disimpan sebagai selisih
+# (delta) berurutan yang dikodekan varint dalam satu buffer byte; tiap
+# posting list diawali panjang byte-nya (varint). Kosakata didominasi
+# term dengan satu judul, jadi offset absolut (uint32) hanya disimpan
+# setiap CHECKPOINT term dan sisanya dilompati lewat prefix panjang.
+class TitleIndex:
+    CHECKPOINT = 16
+
+    def __init__(self, model):
+        self.model = model
+        self.analyzer = model.analyzer
+        self.vocabulary = model.vocabulary
+        self.n_docs = model.n_docs
+
+        postings = model.counts.tocsc()
+        postings.sort_indices()
+        doc_ids = postings.indices.astype(np.int64)
+        term_ptr = postings.indptr.astype(np.int64)
+        self.n_terms = len(term_ptr) - 1
+
+        # posting pertama tiap term disimpan absolut, sisanya delta
+        deltas = np.diff(doc_ids, prepend=0)
+        firsts = term_ptr[:-1][np.diff(term_ptr) > 0]
+        deltas[firsts] = doc_ids[firsts]
+
+        body = varint_encode(deltas)
+        n_bytes = np.zeros(len(deltas) + 1, dtype=np.int64)
+        n_bytes[1:] = np.cumsum(varint_lengths(deltas))
+        body_len = np.diff(n_bytes[term_ptr])
+
+        # susun [panjang][posting] per term dalam satu buffer
+        prefix = varint_encode(body_len)
+        prefix_len = varint_lengths(body_len)
+        starts = np.concatenate([[0], np.cumsum(prefix_len + body_len)])
+
+        self.buffer = np.empty(int(starts[-1]), dtype=np.uint8)
+        self.buffer[
+            np.repeat(starts[:-1], prefix_len) + _ranks(prefix_len)
+        ] = prefix
+        self.buffer[
+            np.repeat(starts[:-1] + prefix_len, body_len) + _ranks(body_len)
+        ] = body
+
+        ptr_dtype = np.uint32 if len(self.buffer) < 2**32 else np.uint64
+        self.checkpoints = starts[:-1][::self.CHECKPOINT].astype(ptr_dtype)
+
+    @property
+    def nbytes(self):
+        return self.buffer.nbytes + self.checkpoints.nbytes
+
+    def _read_length(self, pos):
+        value, shift = 0, 0
+        while True:
+            byte = int(self.buffer[pos])
+            value |= (byte & 0x7F) << shift
+            pos += 1
+            if byte < 0x80:
+                return value, pos
+            shift += 7
+
+    def postings(self, term):
+        col = self.vocabulary.get(term)
+        if col is None or col >= self.n_terms:
+            return np.array([], dtype=np.int64)
+
+        pos = int(self.checkpoints[col // self.CHECKPOINT])
+        for _ in range(col % self.CHECKPOINT):
+            length, pos = self._read_length(pos)
+            pos += length
+
+        length, pos = self._read_length(pos)
+        return np.cumsum(varint_decode(self.buffer[pos:pos + length]))
+
+    def _unigrams(self, text):
+        return [t for t in self.analyzer(text) if " " not in t]
+
+    # None = tidak membatasi (mis. hanya stopword)
+    def phrase(self, text):
+        tokens = self._unigrams(text)
+        if not tokens:
+            return None
+        if len(tokens) == 1:
+            return self.postings(tokens[0])
+
+        bigrams = [" ".join(tokens[i:i + 2]) for i in range(len(tokens) - 1)]
+        docs = _intersect([self.postings(b) for b in bigrams])
+        if len(tokens) == 2 or not len(docs):
+            return docs
+
+        # frasa > 2 kata: bigram cocok semua, pastikan urutannya bersambung
+        n = len(tokens)
+        keep = [
+            d for d in docs
+            if any(
+                words[i:i + n] == tokens
+                for words in [self._unigrams(self.model.titles[d])]
+                for i in range(len(words) - n + 1)
+            )
+        ]
+        return np.array(keep, dtype=np.int64)
+
+    def search(self, query):
+        result = np.array([], dtype=np.int64)
+        for clause in parse_query(query):
+            sets = [s for s in (self.phrase(item) for item in clause) if s is not None]
+            if sets:
+                result = np.union1d(result, _intersect(sets))
+        return result
+
+
+# posisi 0..n-1 di dalam tiap kelompok sepanjang `lengths`
+def _ranks(lengths):
+    return np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+
+def _intersect(sets):
+    sets = sorted(sets, key=len)
+    result = sets[0]
+    for other in sets[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, other, assume_unique=True)
+    return result
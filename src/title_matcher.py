@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.keyword_extraction import group_indicator
+
+TOKEN_PATTERN = r"\w+"
+
+
+# token huruf kecil per teks, diratakan: (id dokumen, posisi, token)
+def token_stream(texts):
+    tokens = (
+        pd.Series(texts, dtype=object)
+        .str.lower()
+        .str.findall(TOKEN_PATTERN)
+        .explode()
+        .dropna()
+    )
+    doc_ids = tokens.index.to_numpy(dtype=np.int64)
+    return doc_ids, tokens.to_numpy(dtype=object)
+
+
+# ==============================
+# PENCOCOK BANYAK KEYWORD (SEKALI JALAN)
+# ==============================
+# Semua judul dan semua keyword ditokenisasi bersama, lalu setiap n-gram
+# diberi kode bilangan bulat secara bertahap: kode(n) = faktorisasi
+# (kode(n-1), token berikutnya). Keyword cocok dengan judul jika kode
+# frasa keyword muncul di antara n-gram judul — satu pencarian isin per
+# panjang frasa, tanpa regex per keyword. Pencocokan per kata utuh
+# ("tani" tidak cocok dengan "pertanian").
+class TitleMatcher:
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k for k in keywords if isinstance(k, str)))
+
+    def incidence(self, titles):
+        titles = pd.Series(titles, dtype=object).reset_index(drop=True)
+        n_docs, n_kw = len(titles), len(self.keywords)
+
+        doc_ids, tokens = token_stream(pd.concat(
+            [titles, pd.Series(self.keywords, dtype=object)],
+            ignore_index=True
+        ))
+        codes, vocab = pd.factorize(tokens)
+        codes = codes.astype(np.int64)
+        n_vocab = len(vocab)
+
+        is_kw = doc_ids >= n_docs
+        kw_lengths = np.bincount(doc_ids[is_kw] - n_docs, minlength=n_kw)
+        # indeks token terakhir tiap keyword di stream
+        kw_last = np.flatnonzero(is_kw)[np.cumsum(kw_lengths) - 1] if n_kw else np.array([], dtype=np.int64)
+
+        rows, cols = [], []
+        gram = codes
+        start_doc = doc_ids
+        for n in range(1, int(kw_lengths.max(initial=0)) + 1):
+            if n > 1:
+                # n-gram berakhir di posisi i = (n-1)-gram berakhir di i-1 + token i
+                prev = np.concatenate([[-1], gram[:-1]])
+                start_doc = np.concatenate([[-1], start_doc[:-1]])
+                gram, _ = pd.factorize((prev + 1) * n_vocab + codes)
+                gram = gram.astype(np.int64)
+
+            valid = start_doc == doc_ids
+            targets = np.flatnonzero(kw_lengths == n)
+            if not len(targets):
+                continue
+
+            kw_grams = gram[kw_last[targets]]
+            title_pos = np.flatnonzero(valid & ~is_kw)
+            hit = title_pos[np.isin(gram[title_pos], kw_grams)]
+            if not len(hit):
+                continue
+
+            # satu kode n-gram bisa dimiliki beberapa keyword (beda tanda baca)
+            order = np.argsort(kw_grams, kind="stable")
+            sorted_grams = kw_grams[order]
+            lo = np.searchsorted(sorted_grams, gram[hit], side="left")
+            hi = np.searchsorted(sorted_grams, gram[hit], side="right")
+            reps = hi - lo
+            offsets = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps)
+            rows.append(np.repeat(doc_ids[hit], reps))
+            cols.append(targets[order[np.repeat(lo, reps) + offsets]])
+
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.array([], dtype=np.int64)
+
+        M = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(n_docs, n_kw)
+        )
+        M.sum_duplicates()
+        M.data[:] = 1
+        return M
+
+    # ==============================
+    # HITUNG MENTION
+    # ==============================
+    # Jumlah judul unik yang menyebut tiap keyword, total atau per kelompok
+    # (tahun/provinsi/...), lewat satu perkalian indikator kelompok × judul.
+    def counts(self, df, by=None, title_col="judul"):
+        cols = [title_col] if by is None else [by, title_col]
+        pairs = df[cols].dropna().drop_duplicates()
+
+        title_codes, titles = pd.factorize(pairs[title_col])
+        M = self.incidence(titles)
+
+        if by is None:
+            return pd.Series(
+                np.asarray(M.sum(axis=0)).ravel(),
+                index=pd.Index(self.keywords, name="keyword"),
+                name="jumlah_judul"
+            )
+
+        group_codes, groups = pd.factorize(pairs[by], sort=True)
+        G = group_indicator(group_codes, title_codes, len(groups), len(titles))
+        counts = (G @ M).toarray().astype(np.int64)
+
+        return pd.DataFrame(
+            counts,
+            index=pd.Index(groups, name=by),
+            columns=pd.Index(self.keywords, name="keyword")
+        )
+
+    def mention_table(self, df, title_col="judul"):
+        n_titles = df[title_col].dropna().nunique()
+        counts = self.counts(df, title_col=title_col)
+
+        table = counts.reset_index()
+        table["rasio_judul"] = table["jumlah_judul"] / n_titles * 100 if n_titles else 0.0
+        return table
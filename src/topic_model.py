@@ -0,0 +1,222 @@
+import os
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.decomposition import MiniBatchNMF
+from sklearn.exceptions import ConvergenceWarning
+
+from src.keyword_extraction import group_indicator
+
+MODEL_VERSION = 3
+
+
+# ==============================
+# MODEL TOPIK ONLINE (NMF MINI-BATCH)
+# ==============================
+# Kosakata & idf dibekukan saat fit pertama (diambil dari hitungan
+# KeywordModel, jadi judul tidak ditokenisasi ulang). Judul baru — mis.
+# tahun survei baru — cukup di-partial_fit lalu ditransformasi; baris
+# matriks dokumen × topik judul lama tidak dihitung ulang. Model beserta
+# matriks tersebut disimpan ke disk dan dipakai lagi setelah restart.
+class TopicModel:
+    def __init__(
+        self,
+        n_topics=10,
+        min_df=3,
+        max_df=0.5,
+        batch_size=512,
+        seed=0,
+        path=None
+    ):
+        self.n_topics = n_topics
+        self.min_df = min_df
+        self.max_df = max_df
+        self.batch_size = batch_size
+        self.seed = seed
+        self.path = path
+
+        self.nmf = None
+        self.terms = np.array([], dtype=object)
+        self.idf = np.array([], dtype=np.float64)
+        self.titles = []
+        self.title_rows = {}
+        self.doc_topic = np.empty((0, 0), dtype=np.float32)
+
+    @property
+    def params(self):
+        return {
+            "n_topics": self.n_topics,
+            "min_df": self.min_df,
+            "max_df": self.max_df,
+            "seed": self.seed,
+        }
+
+    @property
+    def fitted(self):
+        return self.nmf is not None
+
+    @classmethod
+    def load(cls, path, **params):
+        model = cls(path=path, **params)
+        try:
+            state = joblib.load(path)
+        except (OSError, EOFError, ValueError, KeyError, AttributeError, ImportError):
+            return model
+
+        if state.get("version") != MODEL_VERSION or state.get("params") != model.params:
+            return model
+
+        model.nmf = state["nmf"]
+        model.terms = state["terms"]
+        model.idf = state["idf"]
+        model.titles = list(state["titles"])
+        model.title_rows = {t: i for i, t in enumerate(model.titles)}
+        model.doc_topic = state["doc_topic"]
+        return model
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None or not self.fitted:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        tmp = path + ".tmp"
+        joblib.dump(
+            {
+                "version": MODEL_VERSION,
+                "params": self.params,
+                "nmf": self.nmf,
+                "terms": self.terms,
+                "idf": self.idf,
+                "titles": self.titles,
+                "doc_topic": self.doc_topic,
+            },
+            tmp
+        )
+        os.replace(tmp, path)
+
+    # kosakata beku: term dengan df di antara min_df dan max_df
+    def _freeze_vocabulary(self, keyword_model):
+        counts = keyword_model.counts
+        n_docs = counts.shape[0]
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        keep = np.flatnonzero((doc_freq >= self.min_df) & (doc_freq <= self.max_df * n_docs))
+
+        terms = np.empty(len(keyword_model.vocabulary), dtype=object)
+        terms[list(keyword_model.vocabulary.values())] = list(keyword_model.vocabulary.keys())
+        keep = keep[np.argsort(terms[keep].astype(str), kind="stable")]
+
+        self.terms = terms[keep]
+        self.idf = np.log((1 + n_docs) / (1 + doc_freq[keep])) + 1
+
+    # TF-IDF (l2) judul terhadap kosakata beku; term yang tidak lagi ada
+    # di KeywordModel (mis. setelah restart) menjadi kolom nol
+    def _matrix(self, keyword_model, titles):
+        cols = np.fromiter(
+            (keyword_model.vocabulary.get(t, -1) for t in self.terms),
+            dtype=np.int64,
+            count=len(self.terms)
+        )
+        present = np.flatnonzero(cols >= 0)
+        P = sp.csr_matrix(
+            (self.idf[present], (cols[present], present)),
+            shape=(keyword_model.counts.shape[1], len(self.terms))
+        )
+
+        rows = np.fromiter(
+            (keyword_model.title_rows[t] for t in titles),
+            dtype=np.int64,
+            count=len(titles)
+        )
+        X = (keyword_model.counts[rows].astype(np.float64) @ P).tocsr()
+
+        norms = np.sqrt(X.multiply(X).sum(axis=1)).A1
+        norms[norms == 0] = 1
+        return sp.csr_matrix(sp.diags(1 / norms) @ X)
+
+    def update(self, keyword_model):
+        new_titles = [t for t in keyword_model.titles if t not in self.title_rows]
+        if not new_titles:
+            return 0
+
+        if not self.fitted:
+            self._freeze_vocabulary(keyword_model)
+            X = self._matrix(keyword_model, new_titles)
+            n_components = min(self.n_topics, X.shape[0], X.shape[1])
+            if n_components < 1:
+                return 0
+
+            # di data asli (±3.400 judul) berhenti sendiri sekitar epoch
+            # 830 lewat max_no_improvement; tol tidak membantu karena
+            # perubahan H per mini-batch tetap berisik. Bila data lain
+            # belum konvergen di max_iter, topik tetap dipakai tanpa
+            # mengotori log dashboard.
+            self.nmf = MiniBatchNMF(
+                n_components=n_components,
+                init="nndsvda",
+                batch_size=self.batch_size,
+                random_state=self.seed,
+                max_iter=1000
+            )
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                W = self.nmf.fit_transform(X)
+        else:
+            X = self._matrix(keyword_model, new_titles)
+            for start in range(0, X.shape[0], self.batch_size):
+                self.nmf.partial_fit(X[start:start + self.batch_size])
+            W = self.nmf.transform(X)
+
+        for title in new_titles:
+            self.title_rows[title] = len(self.titles)
+            self.titles.append(title)
+        self.doc_topic = np.vstack([
+            self.doc_topic.reshape(-1, W.shape[1]),
+            W.astype(np.float32)
+        ])
+
+        self.save()
+        return len(new_titles)
+
+    def labels(self, top_n=3):
+        if not self.fitted:
+            return []
+        top = np.argsort(-self.nmf.components_, axis=1, kind="stable")[:, :top_n]
+        return [", ".join(self.terms[row]) for row in top]
+
+    # ==============================
+    # PORSI TOPIK PER KELOMPOK
+    # ==============================
+    # Tiap judul dinormalkan jadi distribusi topik (jumlah = 1); porsi
+    # kelompok = rata-rata distribusi judul unik di kelompok tersebut,
+    # lewat satu perkalian indikator kelompok × judul.
+    def shares(self, df, by, title_col="judul"):
+        columns = [by, "topik", "porsi"]
+        if not self.fitted:
+            return pd.DataFrame(columns=columns)
+
+        weights = self.doc_topic.sum(axis=1, keepdims=True)
+        has_topic = weights.ravel() > 0
+        dist = np.divide(self.doc_topic, weights, out=np.zeros_like(self.doc_topic), where=weights > 0)
+
+        pairs = df[[by, title_col]].dropna().drop_duplicates()
+        rows = pairs[title_col].map(self.title_rows).to_numpy(dtype=float)
+        known = ~np.isnan(rows)
+        known[known] = has_topic[rows[known].astype(np.int64)]
+        if not known.any():
+            return pd.DataFrame(columns=columns)
+
+        codes, groups = pd.factorize(pairs.loc[known, by], sort=True)
+        G = group_indicator(codes, rows[known].astype(np.int64), len(groups), len(self.titles))
+        n_titles = np.bincount(codes, minlength=len(groups))
+        share = np.asarray(G @ dist) / n_titles[:, None]
+
+        labels = self.labels()
+        return pd.DataFrame({
+            by: np.repeat(np.asarray(groups), len(labels)),
+            "topik": np.tile(labels, len(groups)),
+            "porsi": share.ravel(),
+        })
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.keyword_extraction import top_k_rows
+
+
+# keyword tren → vektor TF-IDF (l2) di ruang kolom KeywordModel.matrix;
+# keyword yang semua term-nya di luar kosakata menjadi vektor nol;
+# `columns` (term → kolom) bisa diberikan agar tidak dibangun ulang
+def keyword_vectors(keyword_model, keywords, columns=None):
+    if columns is None:
+        columns = {term: i for i, term in enumerate(keyword_model.terms)}
+
+    indptr, indices = [0], []
+    for keyword in keywords:
+        indices.extend(columns[t] for t in keyword_model.analyzer(keyword) if t in columns)
+        indptr.append(len(indices))
+
+    K = sp.csr_matrix(
+        (np.ones(len(indices)), indices, indptr),
+        shape=(len(keywords), len(keyword_model.terms))
+    )
+    K.sum_duplicates()
+    K = K @ sp.diags(keyword_model.idf)
+
+    norms = np.sqrt(K.multiply(K).sum(axis=1)).A1
+    norms[norms == 0] = 1
+    return sp.csr_matrix(sp.diags(1 / norms) @ K)
+
+
+@dataclass
+class AlignmentResult:
+    best: pd.DataFrame
+    by_year: pd.DataFrame
+    by_province: pd.DataFrame
+
+
+# ==============================
+# KESELARASAN JUDUL × KEYWORD TREN
+# ==============================
+# Judul dan keyword Google Trends diletakkan di ruang TF-IDF yang sama;
+# cosine semua pasangan = satu perkalian sparse judul × keyword, lalu
+# top-k per judul diambil per blok (argpartition) sehingga memori
+# terbatas. Hasil top-k disimpan; perubahan filter cukup agregasi ulang.
+class TrendAlignment:
+    def __init__(self, keyword_model, keywords, top_n=3, block_cells=4_000_000):
+        self.keywords = np.asarray(list(dict.fromkeys(keywords)), dtype=object)
+        self.title_rows = keyword_model.title_rows
+        self.titles = keyword_model.titles
+
+        K = keyword_vectors(keyword_model, self.keywords)
+        S = (keyword_model.matrix @ K.T).tocsr()
+        self.title_ids, self.ranks, self.keyword_ids, self.scores = top_k_rows(S, top_n, block_cells)
+
+        # posisi kandidat per judul (hasil top_k_rows terurut per baris)
+        self.ptr = np.searchsorted(self.title_ids, np.arange(keyword_model.n_docs + 1))
+
+    def best_matches(self, titles=None):
+        best = self.ranks == 1
+        table = pd.DataFrame({
+            "judul": np.asarray(self.titles, dtype=object)[self.title_ids[best]],
+            "keyword": self.keywords[self.keyword_ids[best]],
+            "skor": self.scores[best],
+        })
+        if titles is not None:
+            table = table[table["judul"].isin(pd.Series(titles, dtype=object).dropna().unique())]
+        return table.sort_values("skor", ascending=False, kind="stable").reset_index(drop=True)
+
+    # per (judul, tahun): cosine terbaik, dan skor keselarasan = max atas
+    # kandidat keyword dari cosine × bobot tren keyword di tahun judul
+    # (google_mean / 100); tanpa trend_df bobotnya 1 (cosine murni)
+    def title_scores(self, tahun, titles, trend_df=None):
+        rows = pd.Series(titles, dtype=object).map(self.title_rows).to_numpy(dtype=float)
+        known = ~np.isnan(rows)
+        rows = np.where(known, rows, 0).astype(np.int64)
+
+        counts = np.where(known, self.ptr[rows + 1] - self.ptr[rows], 0)
+        owner = np.repeat(np.arange(len(rows)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cand = self.ptr[rows[owner]] + offsets
+
+        weight = np.ones(len(cand))
+        if trend_df is not None:
+            pivot = (
+                trend_df.pivot_table(index="year", columns="keyword", values="google_mean", aggfunc="mean")
+                .reindex(columns=self.keywords)
+                .fillna(0.0)
+            )
+            year_idx = pivot.index.get_indexer(np.asarray(tahun)[owner])
+            values = pivot.to_numpy() / 100
+            weight = np.where(year_idx >= 0, values[np.maximum(year_idx, 0), self.keyword_ids[cand]], 0.0)
+
+        cosine = np.zeros(len(rows))
+        np.maximum.at(cosine, owner, self.scores[cand])
+        scores = np.zeros(len(rows))
+        np.maximum.at(scores, owner, self.scores[cand] * weight)
+        return cosine, scores
+
+    def summarize(self, df, trend_df=None, threshold=0.3, title_col="judul"):
+        pairs = df[["tahun", "provinsi", title_col]].dropna().drop_duplicates()
+        cosine, scores = self.title_scores(pairs["tahun"], pairs[title_col], trend_df)
+        pairs = pairs.assign(cocok=cosine >= threshold, skor=scores)
+
+        def per_group(cols):
+            # satu judul dihitung sekali per kelompok
+            unique = (
+                pairs.groupby(cols + [title_col], observed=True)[["cocok", "skor"]]
+                .max()
+                .reset_index()
+            )
+            return (
+                unique.groupby(cols, observed=True)
+                .agg(
+                    jumlah_judul=("skor", "size"),
+                    skor_selaras=("skor", "mean"),
+                    rasio_cocok=("cocok", "mean"),
+                )
+                .reset_index()
+            )
+
+        return AlignmentResult(
+            best=self.best_matches(pairs[title_col]),
+            by_year=per_group(["tahun"]),
+            by_province=per_group(["provinsi"]).sort_values("skor_selaras", ascending=False, kind="stable"),
+        )
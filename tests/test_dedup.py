@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.dedup import TitleDeduper
+
+BASE = "Pemanfaatan Limbah Kulit Pisang Sebagai Pupuk Organik Cair"
+
+
+def same_id(a, b):
+    ids = TitleDeduper().canonical_ids([a, b])
+    return ids[0] == ids[1]
+
+
+@pytest.mark.parametrize("variant", [
+    "PEMANFAATAN LIMBAH KULIT PISANG SEBAGAI PUPUK ORGANIK CAIR",
+    "Pemanfaatan Limbah Kulit Pisang Sebagai Pupuk Organik Cair.",
+    "Pemanfatan Limbah Kulit Pisang Sebagai Pupuk Organik Cair",
+    "Pemanfaatan Limbah Kulit Pisang Sebagai Pupuk Orgganik Cair",
+])
+def test_typo_variants_share_canonical_id(variant):
+    assert same_id(BASE, variant)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Motivasi Belajar Matematika Siswa Kelas 7 di Sekolah Menengah Pertama",
+     "Motivasi Belajar Matematika Siswa Kelas 8 di Sekolah Menengah Pertama"),
+    ("Pengaruh Media Sosial Terhadap Prestasi Belajar Siswa SMP Negeri 1 Kudus",
+     "Pengaruh Media Sosial Terhadap Prestasi Belajar Siswa SMP Negeri 2 Kudus"),
+    ("Potensi Wisata Pantai Dalam Meningkatkan Ekonomi Masyarakat Desa Kuta",
+     "Potensi Wisata Pantai Dalam Meningkatkan Ekonomi Masyarakat Desa Kota"),
+    ("Dampak Pandemi Covid 19 Terhadap Pendapatan Pedagang Pasar Tradisional",
+     "Dampak Pandemi Covid 20 Terhadap Pendapatan Pedagang Pasar Tradisional"),
+])
+def test_titles_differing_in_numbers_or_short_words_stay_apart(a, b):
+    assert not same_id(a, b)
+
+
+def test_existing_canonical_ids_are_stable():
+    deduper = TitleDeduper()
+    first = deduper.canonical_ids([BASE])
+    ids = deduper.canonical_ids([BASE.replace("Pemanfaatan", "Pemanfatan"), BASE])
+    assert np.all(ids == first[0])
@@ -0,0 +1,127 @@
+import threading
+
+from src.analytics import AnalyticsEngine
+from src.data_loader import load_data
+from src.incremental import IncrementalStore
+from src.preprocessing import explode_peneliti
+from src.synthetic_data import make_raw_frame, write_workbook
+
+TYPO = "Uji Coba Alat Zorblax Untuk Siswa SMA"
+FIXED = "Uji Coba Alat Zorblaxx Untuk Siswa SMA"
+
+
+def test_update_after_title_fix_drops_old_title(tmp_path):
+    raw = make_raw_frame(120, seed=3)
+    raw.loc[0, "judul penelitian"] = TYPO
+    path = str(tmp_path / "data.xlsx")
+    write_workbook(raw, path)
+
+    store = IncrementalStore(path)
+    engine = AnalyticsEngine.from_store(store)
+    assert TYPO in set(engine.df["judul"])
+
+    fixed = raw.copy()
+    fixed.loc[0, "judul penelitian"] = FIXED
+    write_workbook(fixed, path)
+
+    ingest = engine.sync(store)
+    assert ingest.mode == "update"
+
+    titles = set(engine.df["judul"].astype(object))
+    assert FIXED in titles
+    assert TYPO not in titles
+
+    result = engine.search("zorblaxx")
+    assert result.n_titles == 1
+    assert list(result.titles["judul"].astype(object)) == [FIXED]
+
+
+class PausingStore(IncrementalStore):
+    # sync() pertama berhenti sejenak setelah store selesai, sebelum engine
+    # menerapkan hasilnya, agar sesi lain bisa menyela di celah tersebut
+    def __init__(self, path):
+        super().__init__(path)
+        self.synced = threading.Event()
+        self.resume = threading.Event()
+        self.pause_next = False
+
+    def sync(self, df_raw=None):
+        ingest = super().sync(df_raw)
+        if self.pause_next:
+            self.pause_next = False
+            self.synced.set()
+            self.resume.wait(timeout=2)
+        return ingest
+
+
+def test_concurrent_sync_does_not_apply_append_twice(tmp_path):
+    raw = make_raw_frame(150, seed=5)
+    base = raw[raw["tahun"] < raw["tahun"].max()].reset_index(drop=True)
+    path = str(tmp_path / "data.xlsx")
+    write_workbook(base, path)
+
+    store = PausingStore(path)
+    engine = AnalyticsEngine.from_store(store)
+
+    # sesi A: baris baru (append), tertahan sebelum engine diperbarui
+    write_workbook(raw, path)
+    store.pause_next = True
+    first = threading.Thread(target=engine.sync, args=(store,))
+    first.start()
+    assert store.synced.wait(timeout=30)
+
+    # sesi B: satu baris diubah (update) selagi A tertahan
+    edited = raw.copy()
+    edited.loc[0, "judul penelitian"] = "Judul Yang Diubah Saat Sinkronisasi"
+    write_workbook(edited, path)
+    second = threading.Thread(target=engine.sync, args=(store,))
+    second.start()
+    second.join(timeout=1)
+    store.resume.set()
+    first.join()
+    second.join()
+    engine.sync(store)
+
+    expected = AnalyticsEngine(explode_peneliti(load_data(path)))
+    assert engine.n_rows == expected.n_rows
+    assert engine.run().kpi == expected.run().kpi
+
+
+def test_reads_do_not_wait_for_sync(tmp_path):
+    raw = make_raw_frame(150, seed=7)
+    base = raw[raw["tahun"] < raw["tahun"].max()].reset_index(drop=True)
+    path = str(tmp_path / "data.xlsx")
+    write_workbook(base, path)
+
+    store = PausingStore(path)
+    engine = AnalyticsEngine.from_store(store)
+    before = engine.run().kpi
+    n_before = engine.n_rows
+
+    write_workbook(raw, path)
+    store.pause_next = True
+    writer = threading.Thread(target=engine.sync, args=(store,))
+    writer.start()
+    assert store.synced.wait(timeout=30)
+
+    # selama sync tertahan (lock penulis dipegang), pembaca tetap jalan
+    # dan melihat snapshot lama secara utuh
+    seen = {}
+
+    def read():
+        seen["kpi"] = engine.run({"provinsi": None}).kpi
+        seen["n_rows"] = engine.n_rows
+        seen["search"] = engine.search("pembelajaran").n_titles
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    reader.join(timeout=1)
+    finished = not reader.is_alive()
+    store.resume.set()
+    writer.join()
+    reader.join()
+
+    assert finished
+    assert seen["kpi"] == before
+    assert seen["n_rows"] == n_before
+    assert engine.n_rows > n_before
@@ -0,0 +1,36 @@
+from src.analytics import AnalyticsEngine
+from src.preprocessing import explode_peneliti
+from src.result_cache import ResultCache
+from src.synthetic_data import make_raw_frame
+
+
+def make_engine():
+    raw = make_raw_frame(300, seed=11)
+    return AnalyticsEngine(explode_peneliti(raw), cache=ResultCache(maxsize=16))
+
+
+def test_searches_do_not_evict_section_results():
+    engine = make_engine()
+    engine.run()
+    sections = engine.cache.stats()["size"]
+
+    for i in range(200):
+        engine.search(f"pembelajaran {i}")
+
+    stats = engine.cache.stats()
+    assert stats["evictions"] == 0
+    assert stats["size"] == sections
+    assert engine.search_cache.stats()["size"] == engine.search_cache.maxsize
+
+    hits = stats["hits"]
+    engine.run()
+    assert engine.cache.stats()["hits"] == hits + sections
+
+
+def test_search_key_ignores_spacing():
+    engine = make_engine()
+    first = engine.search("pembelajaran siswa")
+    second = engine.search("  pembelajaran   siswa ")
+    assert engine.search_cache.stats()["hits"] == 1
+    assert second.n_titles == first.n_titles
+    assert second.query == "  pembelajaran   siswa "
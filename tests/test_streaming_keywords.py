@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from src.keyword_extraction import KeywordModel
+from src.streaming_keywords import (
+    CountMinSketch,
+    StreamingKeywords,
+    merge_sketches,
+    sketch_partitions,
+    topk_recall,
+)
+from src.synthetic_data import make_raw_frame
+
+TOP_N = 20
+MIN_RECALL = 0.9  # sama dengan --min-recall bench_streaming_keywords
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    raw = make_raw_frame(10_000, seed=0)
+    titles = raw["judul penelitian"].dropna().unique()
+    exact = KeywordModel(titles).top_keywords(top_n=TOP_N)
+    years = raw.drop_duplicates("judul penelitian").groupby("tahun")["judul penelitian"]
+    parts = {year: group.dropna().tolist() for year, group in years}
+    return titles, parts, exact
+
+
+def test_single_sketch_recall(corpus):
+    titles, _, exact = corpus
+    sketch = StreamingKeywords().consume(iter(titles), batch_size=2_000)
+    assert sketch.n_docs == len(titles)
+    assert topk_recall(sketch.top_keywords(TOP_N), exact) >= MIN_RECALL
+
+
+def test_merged_sketches_recall(corpus):
+    titles, parts, exact = corpus
+    assert len(parts) > 1
+    merged = merge_sketches(sketch_partitions(parts).values())
+    assert merged.n_docs == len(titles)
+    assert topk_recall(merged.top_keywords(TOP_N), exact) >= MIN_RECALL
+
+
+def zipf_stream(n, seed):
+    rng = np.random.default_rng(seed)
+    hashes = np.unique(rng.integers(0, 2**63, n, dtype=np.uint64))
+    counts = rng.zipf(1.3, len(hashes)).clip(max=10_000)
+    return hashes, counts
+
+
+def test_count_min_overestimate_bound():
+    width, depth = 2**8, 4
+    hashes, counts = zipf_stream(20_000, seed=1)
+    sketch = CountMinSketch(width, depth, seed=0)
+    sketch.add(hashes, counts)
+
+    # tidak pernah di bawah nilai asli; lewat dari εN (ε = e/width) paling
+    # banyak untuk proporsi δ = e^-depth kunci
+    error = sketch.estimate(hashes) - counts
+    assert (error >= 0).all()
+    assert (error > np.e / width * counts.sum()).mean() <= np.exp(-depth)
+
+
+def test_count_min_merge_equals_single_pass():
+    hashes, counts = zipf_stream(5_000, seed=2)
+    half = len(hashes) // 2
+
+    whole = CountMinSketch(2**10, 4, seed=3)
+    whole.add(hashes, counts)
+    left, right = CountMinSketch(2**10, 4, seed=3), CountMinSketch(2**10, 4, seed=3)
+    left.add(hashes[:half], counts[:half])
+    right.add(hashes[half:], counts[half:])
+
+    np.testing.assert_array_equal(left.merge(right).table, whole.table)
+    with pytest.raises(ValueError):
+        left.merge(CountMinSketch(2**10, 4, seed=4))